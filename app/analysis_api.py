@@ -5,6 +5,9 @@ from datetime import datetime
 
 from app.schemas.analysis import AnalysisRequest
 from app.services import shared_state
+from app.services.structured_logging import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(
     prefix="/analysis",
@@ -17,12 +20,10 @@ async def generate_analysis(request: AnalysisRequest):
     """Generate analysis for a completed interview."""
     try:
         interview_id = str(request.interview_id)
-        print(f"\n=== Generating Analysis for Interview {interview_id} ===")
+        logger.info("Generating analysis", interview_id=interview_id)
         
         # Get interview data from ai_interviews collection
-        interview_data = await shared_state.mongodb.ai_interviews.find_one(
-            {"interview_id": interview_id}
-        )
+        interview_data = await shared_state.repository.get_analysis_view(interview_id)
         
         if not interview_data:
             raise HTTPException(
@@ -52,7 +53,7 @@ async def generate_analysis(request: AnalysisRequest):
             )
             
         # Store analysis in the same document
-        await shared_state.mongodb.store_analysis(
+        await shared_state.repository.store_analysis(
             interview_id=interview_id,
             analysis_data=analysis_data["data"]
         )
@@ -65,9 +66,7 @@ async def generate_analysis(request: AnalysisRequest):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"\nError in generate_analysis: {str(e)}")
-        import traceback
-        print(traceback.format_exc())
+        logger.exception("Error in generate_analysis", error=str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
@@ -78,8 +77,9 @@ async def get_analysis(interview_id: UUID):
     """Get the analysis for a completed interview."""
     try:
         # Get interview data from ai_interviews collection
-        interview_data = await shared_state.mongodb.ai_interviews.find_one(
-            {"interview_id": str(interview_id)}
+        interview_data = await shared_state.repository.get_view(
+            str(interview_id),
+            {"_id": 0, "technical_assessment": 1}
         )
         
         if not interview_data:
@@ -1,12 +1,21 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, AsyncIterator, Tuple
 from uuid import UUID
 from datetime import datetime
+import asyncio
+import json
 
 from app.schemas.interview import StartInterviewRequest, InterviewResponse
 from app.schemas.models import QuestionAnswer
 from app.services import shared_state
+from app.services.repository import InterviewNotActiveError
+from app.services.intro_pregeneration import get_intro_response, get_stored_intro
+from app.services.status_events import KEEPALIVE_SECONDS, STATUS_EVENT_PROJECTION
+from app.services.structured_logging import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(
     tags=["Interview"],
@@ -19,62 +28,67 @@ class InterviewRequest(BaseModel):
     experience_level: str
     conversation_history: List[QuestionAnswer]
 
-@router.post("/start", response_model=InterviewResponse)
-async def start_interview(request: StartInterviewRequest):
-    """Start a new interview session."""
-    try:
-        # Get resume data from ai_interviews collection
-        resume_data = await shared_state.mongodb.ai_interviews.find_one(
-            {"interview_id": str(request.interview_id)}
+async def _prepare_start_context(request: StartInterviewRequest) -> Tuple[Dict, Optional[Dict]]:
+    """Validate the session and build the LLM context for the interview introduction.
+    
+    Returns the context together with any introduction pre-generated for the session.
+    """
+    # Get resume data from ai_interviews collection
+    resume_data = await shared_state.repository.get_start_view(str(request.interview_id))
+    
+    if not resume_data:
+        raise HTTPException(status_code=404, detail="Resume data not found")
+    
+    # Get skill ratings from the same session
+    if not resume_data.get("skills"):
+        raise HTTPException(
+            status_code=400, 
+            detail="Skills must be rated before starting interview"
         )
+    
+    # Ensure we have a valid candidate name
+    candidate_name = resume_data.get("candidate_name", "").strip()
+    if not candidate_name or candidate_name == "Anonymous":
+        # Try to get candidate name from request
+        if request.candidate_name:
+            candidate_name = request.candidate_name.strip()
         
-        if not resume_data:
-            raise HTTPException(status_code=404, detail="Resume data not found")
-        
-        # Get skill ratings from the same session
-        if not resume_data.get("skills"):
+        if not candidate_name or candidate_name == "Anonymous":
             raise HTTPException(
-                status_code=400, 
-                detail="Skills must be rated before starting interview"
+                status_code=400,
+                detail="Candidate name is required. Please provide a name during resume upload."
             )
-        
-        # Ensure we have a valid candidate name
-        candidate_name = resume_data.get("candidate_name", "").strip()
-        if not candidate_name or candidate_name == "Anonymous":
-            # Try to get candidate name from request
-            if request.candidate_name:
-                candidate_name = request.candidate_name.strip()
-            
-            if not candidate_name or candidate_name == "Anonymous":
-                raise HTTPException(
-                    status_code=400,
-                    detail="Candidate name is required. Please provide a name during resume upload."
-                )
-        
-        # Update interview details and set status to 'active'
-        await shared_state.mongodb.update_interview_details(
-            interview_id=str(request.interview_id),
-            data={
-                "role": request.role,
-                "experience_level": request.experience_level,
-                "status": "active",
-                "candidate_name": candidate_name  # Use the validated name
-            }
-        )
-        
-        # Prepare context for LLM
-        context = {
-            "interview_id": str(request.interview_id),
+    
+    # Update interview details and set status to 'active'
+    await shared_state.repository.update_interview_details(
+        interview_id=str(request.interview_id),
+        data={
             "role": request.role,
             "experience_level": request.experience_level,
-            "candidate_name": candidate_name,
-            "technical_skills": resume_data.get("technical_skills", []),
-            "resume_text": resume_data.get("resume_text", ""),
-            "is_start": True  # Flag to indicate this is the interview start
+            "status": "active",
+            "candidate_name": candidate_name  # Use the validated name
         }
+    )
+    
+    # Prepare context for LLM
+    context = {
+        "interview_id": str(request.interview_id),
+        "role": request.role,
+        "experience_level": request.experience_level,
+        "candidate_name": candidate_name,
+        "technical_skills": resume_data.get("technical_skills", []),
+        "is_start": True  # Flag to indicate this is the interview start
+    }
+    return context, resume_data.get("pregenerated_intro")
+
+@router.post("/start", response_model=InterviewResponse)
+async def start_interview(request: StartInterviewRequest):
+    """Start a new interview session."""
+    try:
+        context, stored_intro = await _prepare_start_context(request)
         
-        # Get personalized introduction from LLM
-        response = await shared_state.groq_service.get_interview_response(context)
+        # Use the pre-generated introduction when role and level still match, otherwise ask the LLM
+        response = await get_intro_response(context, stored_intro)
         
         if response["status"] != "success":
             raise HTTPException(
@@ -97,47 +111,72 @@ async def start_interview(request: StartInterviewRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _prepare_continue_state(request: InterviewRequest) -> Dict:
+    """Record the latest answer and build the LLM state for the next question."""
+    interview_id = request.interview_id
+    
+    latest_turn = None
+    if request.conversation_history:
+        latest_qa = request.conversation_history[-1]
+        latest_turn = {
+            "question": latest_qa.question,
+            "answer": latest_qa.answer,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    
+    # Check the status, record the latest Q&A and read back the prompt fields in one round trip
+    try:
+        updated_session = await shared_state.repository.submit_turn(str(interview_id), latest_turn)
+    except InterviewNotActiveError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if not updated_session:
+        raise HTTPException(status_code=404, detail="Interview session not found")
+    
+    # Only the most recent turns are read back; question_count is the full length
+    history = updated_session.get("conversation_history", [])
+    question_count = updated_session.get("question_count", len(history))
+    
+    # Generate next question
+    return {
+        "interview_id": str(interview_id),
+        "role": request.role,
+        "experience_level": request.experience_level,
+        "skills": updated_session.get("skills", {}),
+        "conversation_history": history,
+        "conversation_summary": updated_session.get("conversation_summary"),
+        "question_count": question_count,
+        "history_offset": question_count - len(history)
+    }
+
+async def _refresh_conversation_summary(state: Dict):
+    """Fold turns that left the recent window into the stored conversation summary."""
+    try:
+        groq_service = shared_state.groq_service
+        summary = await groq_service.context_manager.update_summary(
+            groq_service,
+            state["conversation_history"],
+            state.get("conversation_summary"),
+            interview_id=state["interview_id"],
+            offset=state.get("history_offset", 0)
+        )
+        if summary:
+            await shared_state.repository.update_conversation_summary(state["interview_id"], summary)
+    except Exception as e:
+        logger.error("Failed to refresh conversation summary", error=str(e))
+
+def _schedule_summary_refresh(state: Dict, background_tasks: BackgroundTasks):
+    """Update the summary after the response is sent, when turns have aged out."""
+    context_manager = shared_state.groq_service.context_manager
+    if context_manager.needs_update(state["conversation_history"], state.get("conversation_summary"), state.get("history_offset", 0)):
+        background_tasks.add_task(_refresh_conversation_summary, state)
+
 @router.post("/continue", response_model=InterviewResponse)
-async def continue_interview(request: InterviewRequest):
+async def continue_interview(request: InterviewRequest, background_tasks: BackgroundTasks):
     """Continue an ongoing interview session."""
     try:
-        interview_id = request.interview_id
-        
-        # Get interview session
-        session = await shared_state.mongodb.get_interview_session(interview_id)
-        
-        if not session:
-            raise HTTPException(status_code=404, detail="Interview session not found")
-            
-        # Check if interview is active
-        if session["status"] not in ["active", "in_progress"]:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Interview is not active (current status: {session['status']})"
-            )
-        
-        # Add the latest Q&A to history
-        if request.conversation_history:
-            latest_qa = request.conversation_history[-1]
-            new_interaction = {
-                "question": latest_qa.question,
-                "answer": latest_qa.answer,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
-            await shared_state.mongodb.add_to_history(str(interview_id), new_interaction)
-        
-        # Get updated session with skills
-        updated_session = await shared_state.mongodb.get_interview_session(interview_id)
-        
-        # Generate next question
-        state = {
-            "interview_id": str(interview_id),
-            "role": request.role,
-            "experience_level": request.experience_level,
-            "skills": updated_session.get("skills", {}),
-            "conversation_history": updated_session.get("conversation_history", [])
-        }
+        state = await _prepare_continue_state(request)
+        _schedule_summary_refresh(state, background_tasks)
         
         response = await shared_state.groq_service.get_interview_response(state)
         
@@ -152,11 +191,96 @@ async def continue_interview(request: InterviewRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _sse_event(event: str, data: Dict) -> str:
+    """Format a single server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+async def _replay_response(response: Dict) -> AsyncIterator[Dict]:
+    """Emit an already generated response in the same shape as a streamed one."""
+    yield {"type": "token", "content": response["data"]["question"]}
+    yield {"type": "complete", "response": response}
+
+async def _stream_interview_events(state: Dict, error_detail: str, ready_response: Optional[Dict] = None) -> AsyncIterator[str]:
+    """Forward LLM tokens as SSE and persist the final question once generation completes."""
+    if ready_response:
+        events = _replay_response(ready_response)
+    else:
+        events = shared_state.groq_service.stream_interview_response(state)
+    
+    async for event in events:
+        if event["type"] == "token":
+            yield _sse_event("token", {"content": event["content"]})
+            continue
+        
+        response = event["response"]
+        if response["status"] != "success":
+            yield _sse_event("error", {"detail": error_detail})
+            return
+        
+        data = InterviewResponse(**response["data"])
+        try:
+            await shared_state.repository.store_current_question(
+                state["interview_id"],
+                data.question,
+                data.current_skill
+            )
+        except Exception as e:
+            yield _sse_event("error", {"detail": f"Failed to persist question: {str(e)}"})
+            return
+        
+        yield _sse_event("done", data.model_dump(mode="json"))
+
+@router.post("/start/stream")
+async def start_interview_stream(request: StartInterviewRequest):
+    """Start a new interview session, streaming the introduction as server-sent events.
+    
+    Emits `token` events as the introduction is generated, then a single `done` event
+    carrying the full InterviewResponse (or an `error` event). A matching pre-generated
+    introduction is sent as a single `token` event.
+    """
+    try:
+        context, stored_intro = await _prepare_start_context(request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return StreamingResponse(
+        _stream_interview_events(
+            context,
+            "Failed to generate interview introduction",
+            ready_response=get_stored_intro(context, stored_intro)
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/continue/stream")
+async def continue_interview_stream(request: InterviewRequest, background_tasks: BackgroundTasks):
+    """Continue an ongoing interview session, streaming the next question as server-sent events.
+    
+    Emits `token` events as the question is generated, then a single `done` event
+    carrying the full InterviewResponse (or an `error` event).
+    """
+    try:
+        state = await _prepare_continue_state(request)
+        _schedule_summary_refresh(state, background_tasks)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return StreamingResponse(
+        _stream_interview_events(state, "Failed to generate interview question"),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/{interview_id}/status")
 async def get_interview_status(interview_id: UUID):
     """Get the current status of an interview session."""
     try:
-        session = await shared_state.mongodb.ai_interviews.find_one({"interview_id": str(interview_id)})
+        session = await shared_state.repository.get_status_view(str(interview_id))
         if not session:
             raise HTTPException(status_code=404, detail="Interview session not found")
             
@@ -167,8 +291,46 @@ async def get_interview_status(interview_id: UUID):
             "technical_skills": session.get("technical_skills", []),
             "start_time": session.get("metadata", {}).get("created_at"),
             "last_activity": session.get("metadata", {}).get("last_updated"),
-            "question_count": len(session.get("conversation_history", [])),
+            "question_count": session.get("question_count", 0),
             "status": session.get("status", "unknown")
         }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def _stream_status_events(interview_id: str, current: Dict) -> AsyncIterator[str]:
+    """Send the current status, then every change pushed by the status hub."""
+    hub = shared_state.status_hub
+    queue = hub.subscribe(interview_id, current)
+    try:
+        yield _sse_event("status", current)
+        report_ready = current.get("report_ready", False)
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield _sse_event("status", event)
+            if event.get("report_ready") and not report_ready:
+                yield _sse_event("report_ready", {"interview_id": interview_id, "download_url": f"/report/{interview_id}/pdf"})
+            report_ready = event.get("report_ready", False)
+    finally:
+        hub.unsubscribe(interview_id, queue)
+
+@router.get("/{interview_id}/events")
+async def stream_interview_status(interview_id: UUID):
+    """Follow an interview's status as server-sent events.
+    
+    Emits a `status` event with the current status, question_count, analysis_status
+    and report_ready on connect and whenever one of them changes, and a `report_ready`
+    event once the PDF report can be downloaded. Replaces polling `/status`.
+    """
+    current = await shared_state.repository.get_view(str(interview_id), STATUS_EVENT_PROJECTION)
+    if not current:
+        raise HTTPException(status_code=404, detail="Interview session not found")
+    
+    return StreamingResponse(
+        _stream_status_events(str(interview_id), current),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
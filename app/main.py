@@ -9,7 +9,10 @@ from app.parserapifinal import router as resume_router
 from app.skillrating import router as skills_router
 from app.interview_api import router as interview_router
 from app.report_api import router as report_router
+from app.pdf_report_generator import report_flight
 from app.services import shared_state
+from app.services.json_parser import parser_stats
+from app.services.structured_logging import get_logger, logging_stats, setup_logging, shutdown_logging
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -31,33 +34,42 @@ app.add_middleware(
 app.include_router(resume_router, prefix="/resume")  # For resume upload and parsing
 app.include_router(skills_router, prefix="/skills")  # For rating skills
 app.include_router(interview_router, prefix="/interview")  # For interview management
-app.include_router(report_router, prefix="/report")  # For report generation
+app.include_router(report_router)  # For report generation; the router carries the /report prefix
 
 # Load environment variables at startup
 load_dotenv()
 
+logger = get_logger(__name__)
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup"""
+    setup_logging()
     try:
         # Verify environment variables
-        required_vars = ["MONGO_URI", "GROQ_API_KEY"]
+        required_vars = ["GROQ_API_KEY"] if shared_state.storage_backend() == "memory" else ["MONGO_URI", "GROQ_API_KEY"]
         missing_vars = [var for var in required_vars if not os.getenv(var)]
         if missing_vars:
             raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
             
         await shared_state.init_services(os.getenv("MONGO_URI"))
-        print("Services initialized successfully")
+        logger.info("Services initialized successfully")
     except Exception as e:
-        print(f"Failed to initialize services: {e}")
+        logger.error("Failed to initialize services", error=str(e))
         raise
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close pooled connections on shutdown"""
+    await shared_state.cleanup_services()
+    shutdown_logging()
+
 @app.get("/health")
 async def health_check():
     """API health check endpoint."""
     try:
         # Check MongoDB connection
-        db_status = "active" if await shared_state.mongodb.check_connection() else "error"
+        db_status = "active" if await shared_state.repository.check_connection() else "error"
         
         return {
             "status": "healthy" if db_status == "active" else "unhealthy",
@@ -86,6 +98,27 @@ async def health_check():
             "timestamp": datetime.utcnow().isoformat()
         }
 
+@app.get("/metrics")
+async def metrics():
+    """In-process performance metrics."""
+    return {
+        "llm_cache": shared_state.llm_cache.stats() if shared_state.llm_cache else None,
+        "rate_limiter": shared_state.rate_limiter.stats() if shared_state.rate_limiter else None,
+        "llm_in_flight": shared_state.groq_service.in_flight.stats() if shared_state.groq_service else None,
+        "llm_hedging": shared_state.groq_service.hedge_policy.stats() if shared_state.groq_service else None,
+        "llm_circuit_breaker": shared_state.groq_service.breaker.stats() if shared_state.groq_service else None,
+        "report_in_flight": report_flight.stats(),
+        "llm_json_parsing": parser_stats(),
+        "llm_calls": shared_state.llm_metrics.stats() if shared_state.llm_metrics else None,
+        "logging": logging_stats(),
+        "session_cache": shared_state.repository.session_cache.stats() if shared_state.repository and shared_state.repository.session_cache else None,
+        "mongodb_indexes": shared_state.repository.index_report if shared_state.repository else None,
+        "mongodb_pool": shared_state.repository.pool_stats() if shared_state.repository else None,
+        "status_events": shared_state.status_hub.stats() if shared_state.status_hub else None,
+        "interview_archive": shared_state.archiver.stats() if shared_state.archiver else None,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
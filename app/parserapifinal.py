@@ -1,10 +1,15 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File, APIRouter
+from fastapi import FastAPI, HTTPException, UploadFile, File, APIRouter, BackgroundTasks
 from typing import Dict, Any
 from uuid import uuid4
 from datetime import datetime
 import os
+import time
 from PyPDF2 import PdfReader
 from app.services import shared_state
+from app.services.intro_pregeneration import pregenerate_intro
+from app.services.rate_limiter import Priority
+from app.services.json_parser import JSON_OBJECT_FORMAT, parse_json_object
+from app.schemas.llm_outputs import ExtractedSkills
 from langchain_groq import ChatGroq
 from langchain_core.messages import SystemMessage, HumanMessage
 
@@ -28,15 +33,23 @@ class PDFTextExtractor:
             raise HTTPException(status_code=400, detail=f"Failed to extract text from PDF: {str(e)}")
 
 class ResumeExtractor:
+    model = "llama-3.3-70b-versatile"
+    temperature = 0
+
     def __init__(self, groq_api_key: str):
         self.llm = ChatGroq(
-            temperature=0,
+            temperature=self.temperature,
             groq_api_key=groq_api_key,
-            model="llama-3.3-70b-versatile"
+            model=self.model,
+            base_url=os.getenv("GROQ_BASE_URL"),
+            model_kwargs={"response_format": JSON_OBJECT_FORMAT}
         )
 
-    def extract_skills(self, resume_text: str) -> Dict[str, Any]:
-        """Extract technical skills from resume text."""
+    async def extract_skills(self, resume_text: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Extract technical skills from resume text.
+
+        Re-uploaded resumes are answered from the LLM response cache unless use_cache is False.
+        """
         skills_prompt = """
         Extract ALL technical skills from the following resume text. Include:
         1. Programming Languages
@@ -53,33 +66,93 @@ class ResumeExtractor:
         {{"technical_skills": ["skill1", "skill2", "skill3", ...]}}
         """
         
+        metrics = shared_state.llm_metrics
+        call = metrics.start("resume_skills", self.model) if metrics is not None else None
         try:
             messages = [
                 SystemMessage(content="Extract technical skills from resumes."),
                 HumanMessage(content=skills_prompt.format(text=resume_text))
             ]
             
-            response = self.llm.invoke(messages)
+            cache = shared_state.llm_cache
+            cache_key = None
+            if cache is not None and use_cache:
+                cache_key = cache.make_key(
+                    self.model,
+                    [{"role": m.type, "content": m.content} for m in messages],
+                    self.temperature,
+                    None,
+                    response_format=JSON_OBJECT_FORMAT
+                )
+                response_text = await cache.get(cache_key)
+            elif cache is not None:
+                cache.record_bypass()
             
-            # Clean and parse response
-            response_text = response.content.strip()
-            if response_text.startswith('```'):
-                response_text = response_text.split('```')[1]
-                if response_text.startswith('json'):
-                    response_text = response_text[4:]
+            cached = cache_key is not None and response_text is not None
+            if not cached:
+                if shared_state.rate_limiter is not None:
+                    queued_at = time.monotonic()
+                    await shared_state.rate_limiter.acquire(Priority.RESUME)
+                    if call is not None:
+                        call.queue_seconds += time.monotonic() - queued_at
+                # Share the interview flow's circuit breaker: fail fast while Groq is down
+                breaker = shared_state.groq_service.breaker if shared_state.groq_service else None
+                if breaker is not None:
+                    breaker.before_call()
+                sent_at = time.monotonic()
+                try:
+                    response = await self.llm.ainvoke(messages)
+                except Exception:
+                    if breaker is not None:
+                        breaker.record_failure()
+                    raise
+                except BaseException:
+                    if breaker is not None:
+                        breaker.record_ignored()
+                    raise
+                if breaker is not None:
+                    breaker.record_success(time.monotonic() - sent_at)
+                response_text = response.content
+                if call is not None:
+                    call.status_code = 200
+                    call.add_usage(
+                        getattr(response, "usage_metadata", None)
+                        or response.response_metadata.get("token_usage")
+                    )
+            elif call is not None:
+                call.outcome = "cache_hit"
+            raw_response = response_text
             
-            import json
-            skills = json.loads(response_text.strip())
-            skills["technical_skills"] = sorted(list(set(str(skill).strip() 
+            # Parse response, tolerating fences, surrounding prose and common syntax slips
+            skills = parse_json_object(response_text, ExtractedSkills)
+            skills["technical_skills"] = sorted(list(set(skill.strip() 
                                                       for skill in skills["technical_skills"])))
+            
+            # Only cache responses that parsed successfully
+            if cache_key is not None and not cached:
+                await cache.set(cache_key, raw_response)
             return skills
             
         except Exception as e:
+            if call is not None:
+                call.fail(e)
             return {"technical_skills": []}
+        finally:
+            if call is not None:
+                metrics.record(call)
 
 @router.post("/")
-async def parse_resume(file: UploadFile = File(...), candidate_name: str = None):
-    """Upload and parse a resume PDF."""
+async def parse_resume(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    candidate_name: str = None,
+    role: str = None,
+    experience_level: str = None
+):
+    """Upload and parse a resume PDF.
+    
+    The interview introduction is generated in the background once the resume is stored.
+    """
     if not file.filename.endswith('.pdf'):
         raise HTTPException(status_code=400, detail="File must be a PDF")
     
@@ -97,11 +170,11 @@ async def parse_resume(file: UploadFile = File(...), candidate_name: str = None)
         
         # Extract skills
         extractor = ResumeExtractor(os.getenv("GROQ_API_KEY"))
-        skills = extractor.extract_skills(resume_text)
+        skills = await extractor.extract_skills(resume_text)
         
         # Generate interview ID and store data
         interview_id = str(uuid4())
-        await shared_state.mongodb.store_resume_data(
+        await shared_state.repository.store_resume_data(
             interview_id=interview_id,
             data={
                 "resume_text": resume_text,
@@ -111,6 +184,8 @@ async def parse_resume(file: UploadFile = File(...), candidate_name: str = None)
             }
         )
         
+        background_tasks.add_task(pregenerate_intro, interview_id, role, experience_level)
+        
         return {
             "interview_id": interview_id,
             "technical_skills": skills.get("technical_skills", []),
@@ -1,15 +1,23 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
 from datetime import datetime
-import os
+import io
 from app.services import shared_state
+from app.services.repository import PDF_REPORT, iter_artifact_chunks
 from app.analysis_utils import analyze_performance_from_json, generate_performance_charts
+from app.services.single_flight import SingleFlight
+from app.services.structured_logging import get_logger
 
 app = FastAPI()
+logger = get_logger(__name__)
+
+# Concurrent report requests for the same interview share one generation run
+report_flight = SingleFlight()
 
 def create_header(story, interview_data):
     """Create the header section of the report."""
@@ -192,12 +200,21 @@ def create_performance_analysis_section(story, analysis_data):
     story.append(Spacer(1, 20))
 
 async def generate_pdf_report(interview_id: str):
-    """Generate a PDF report for the interview."""
+    """Generate a PDF report for the interview.
+
+    Concurrent calls for the same interview (double clicks, client retries) join the
+    generation already in flight and receive its result.
+    """
+    return await report_flight.do(
+        f"generate_pdf_report:{interview_id}",
+        lambda: _generate_pdf_report(interview_id)
+    )
+
+async def _generate_pdf_report(interview_id: str):
+    """Run the analysis, chart and PDF pipeline for one interview."""
     try:
         # Get interview data
-        interview_data = await shared_state.mongodb.ai_interviews.find_one(
-            {"interview_id": interview_id}
-        )
+        interview_data = await shared_state.repository.get_analysis_view(interview_id)
         
         if not interview_data:
             raise HTTPException(status_code=404, detail="Interview not found")
@@ -232,17 +249,14 @@ async def generate_pdf_report(interview_id: str):
             "technical_assessment": interview_data.get("technical_assessment", {})  # Include any technical assessment
         })
         
-        # Create output directory
-        output_dir = 'generated_reports'
-        os.makedirs(output_dir, exist_ok=True)
-        
         # Generate filename
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"{output_dir}/report_{interview_id}_{timestamp}.pdf"
+        filename = f"report_{interview_id}_{timestamp}.pdf"
         
-        # Create PDF with adjusted margins
+        # Build the PDF in memory; it is stored in GridFS, not on local disk
+        buffer = io.BytesIO()
         doc = SimpleDocTemplate(
-            filename,
+            buffer,
             pagesize=letter,
             rightMargin=36,
             leftMargin=36,
@@ -280,45 +294,41 @@ async def generate_pdf_report(interview_id: str):
         # Generate PDF
         doc.build(story)
         
-        # Update MongoDB with PDF path and analysis
-        await shared_state.mongodb.ai_interviews.update_one(
-            {"interview_id": interview_id},
-            {"$set": {
-                "pdf_report": filename,
-                "status": "report_generated",
-                "analysis_data": analysis_data
-            }}
+        # Store the PDF in GridFS and the analysis on the interview
+        buffer.seek(0)
+        file_id = await shared_state.repository.store_pdf_report(
+            interview_id, buffer, filename=filename, analysis_data=analysis_data
         )
         
         return {
             "status": "success",
             "message": "PDF report generated successfully",
-            "file_path": filename
+            "file_id": file_id,
+            "download_url": f"/report/{interview_id}/pdf"
         }
         
     except Exception as e:
-        print(f"Error generating PDF report: {str(e)}")
+        logger.error("Error generating PDF report", interview_id=interview_id, error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/{interview_id}")
 async def get_pdf_report(interview_id: str):
-    """Get the path to a generated PDF report."""
+    """Stream a generated PDF report from GridFS."""
     try:
-        interview_data = await shared_state.mongodb.ai_interviews.find_one(
-            {"interview_id": interview_id}
-        )
-        
-        if not interview_data:
-            raise HTTPException(status_code=404, detail="Interview not found")
-            
-        pdf_path = interview_data.get("pdf_report")
-        if not pdf_path or not os.path.exists(pdf_path):
+        grid_out = await shared_state.repository.open_artifact(interview_id, PDF_REPORT)
+        if grid_out is None:
             raise HTTPException(status_code=404, detail="PDF report not found")
             
-        return {
-            "status": "success",
-            "file_path": pdf_path
-        }
+        return StreamingResponse(
+            iter_artifact_chunks(grid_out),
+            media_type="application/pdf",
+            headers={
+                "Content-Disposition": f'attachment; filename="{grid_out.filename}"',
+                "Content-Length": str(grid_out.length)
+            }
+        )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
@@ -1,10 +1,12 @@
 from fastapi import FastAPI, HTTPException, UploadFile, File, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, AsyncIterator, Awaitable, Callable
 from uuid import UUID
+import asyncio
 import json
 import os
+import time
 from datetime import datetime
 import matplotlib
 matplotlib.use('Agg')
@@ -13,11 +15,16 @@ import numpy as np
 from matplotlib.gridspec import GridSpec
 from app.schemas.models import InterviewTranscript, PerformanceReport, QuestionAnswer
 from app.services import shared_state
-import requests
 import base64
 from fastapi import APIRouter, Request
-from app.pdf_report_generator import generate_pdf_report
+from app.pdf_report_generator import generate_pdf_report, get_pdf_report
 from app.analysis_utils import analyze_performance_from_json
+from app.services.rate_limiter import Priority
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.json_parser import JSON_OBJECT_FORMAT, LLMJSONError, parse_json_object
+from app.schemas.llm_outputs import PerformanceAnalysis
+from app.services.single_flight import SingleFlight
+from app.services.structured_logging import get_logger, payload
 
 app = FastAPI(
     title="Interview Analysis API",
@@ -25,6 +32,45 @@ app = FastAPI(
     version="1.0.0"
 )
 
+logger = get_logger(__name__)
+
+# Concurrent analysis requests for the same interview share one run
+analysis_flight = SingleFlight()
+
+# Worker pool size for cohort analysis; actual Groq throughput is still governed by the rate limiter
+COHORT_CONCURRENCY = int(os.getenv("REPORT_COHORT_CONCURRENCY", "4"))
+COHORT_MAX_CONCURRENCY = int(os.getenv("REPORT_COHORT_MAX_CONCURRENCY", "16"))
+
+# Query operators that execute server-side code are not accepted in cohort filters
+FORBIDDEN_FILTER_OPERATORS = {"$where", "$function", "$accumulator"}
+
+# Analyses postponed while the LLM circuit is open, one pending retry per key
+_deferred_analyses: Dict[str, asyncio.Task] = {}
+
+async def _run_deferred(key: str, run: Callable[[], Awaitable[Any]], delay: float):
+    await asyncio.sleep(delay)
+    # Leave the slot free so a run that hits the open circuit again can reschedule itself
+    _deferred_analyses.pop(key, None)
+    try:
+        await run()
+    except Exception as e:
+        logger.error("Deferred analysis failed", key=key, error=str(e))
+
+async def _defer_analysis(interview_id: str, key: str, run: Callable[[], Awaitable[Any]], error: CircuitOpenError) -> float:
+    """Queue an analysis to run once the LLM circuit may have closed.
+
+    Returns:
+        Seconds until the retry
+    """
+    delay = max(error.retry_after, 1.0)
+    if key not in _deferred_analyses:
+        _deferred_analyses[key] = asyncio.ensure_future(_run_deferred(key, run, delay))
+    try:
+        await shared_state.repository.mark_analysis_queued(interview_id, str(error))
+    except Exception as e:
+        logger.error("Failed to mark analysis as queued", error=str(e))
+    return delay
+
 ANALYSIS_PROMPT = """Analyze the following interview transcript and provide a performance evaluation. 
 Your response must be a valid JSON object with no trailing commas and properly quoted strings.
 
@@ -122,7 +168,12 @@ Remember:
 4. Maintain the exact JSON structure shown above
 """
 
-async def analyze_performance_from_json(json_data: dict, extra_prompt: str = "") -> dict:
+async def analyze_performance_from_json(json_data: dict, extra_prompt: str = "", use_cache: bool = True, interview_id: Optional[str] = None) -> dict:
+    """Analyze an interview transcript with the LLM.
+
+    Identical transcripts are answered from the LLM response cache unless use_cache is False.
+    LLM usage is attributed to interview_id when given.
+    """
     try:
         # Validate and extract data
         if "question_answer" not in json_data:
@@ -155,37 +206,32 @@ async def analyze_performance_from_json(json_data: dict, extra_prompt: str = "")
             }
         ]
 
-        # Call Groq API directly
-        response = requests.post(
-            "https://api.groq.com/openai/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {os.getenv('GROQ_API_KEY')}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "llama-3.3-70b-versatile",
-                "messages": messages,
-                "temperature": 0,
-                "max_tokens": 2000
-            }
-        )
-        response.raise_for_status()
-        
-        # Get response content
-        response_text = response.json()["choices"][0]["message"]["content"].strip()
-        
-        # Debug print
-        print("\nRaw response:", response_text)
-        
-        # Remove any markdown formatting
-        if response_text.startswith('```'):
-            response_text = response_text.split('```')[1]
-        if response_text.startswith('json'):
-            response_text = response_text[4:]
-        response_text = response_text.strip()
-        
+        # Only responses that parse are cached; the parsed result is kept so it is not parsed twice
+        parsed: Dict[str, Any] = {}
+
+        def validate(text: str):
+            parsed["analysis"] = parse_json_object(text, PerformanceAnalysis)
+
+        response_text = None
         try:
-            analysis = json.loads(response_text)
+            # Call Groq API through the shared service (pooled connections + response cache)
+            response_text = await shared_state.groq_service.chat_completion(
+                messages,
+                model="llama-3.3-70b-versatile",
+                temperature=0,
+                max_tokens=2000,
+                use_cache=use_cache,
+                priority=Priority.REPORT,
+                response_format=JSON_OBJECT_FORMAT,
+                call_site="report_analysis",
+                interview_id=interview_id,
+                validate=validate
+            )
+            
+            logger.debug("Analysis response", interview_id=interview_id, response=payload(response_text))
+            
+            # Cache hits and coalesced calls were validated by the call that produced them
+            analysis = parsed.get("analysis") or parse_json_object(response_text, PerformanceAnalysis)
             
             # Simple validation based on overall rating
             if analysis["overall_rating"] < 7.0:
@@ -195,16 +241,17 @@ async def analyze_performance_from_json(json_data: dict, extra_prompt: str = "")
             
             return analysis
             
-        except json.JSONDecodeError as e:
-            print(f"\nJSON Decode Error: {str(e)}")
-            print(f"Problematic content: {response_text}")
+        except LLMJSONError as e:
+            logger.error("Failed to parse analysis response", interview_id=interview_id, error=str(e), response=payload(e.raw if response_text is None else response_text))
             raise HTTPException(
                 status_code=500,
                 detail=f"Failed to parse model response: {str(e)}"
             )
 
+    except CircuitOpenError:
+        raise
     except Exception as e:
-        print(f"\nError in analysis: {str(e)}")
+        logger.error("Error in analysis", interview_id=interview_id, error=str(e))
         raise HTTPException(
             status_code=500,
             detail=f"Error in analysis: {str(e)}"
@@ -235,7 +282,7 @@ async def generate_performance_charts(analysis_data, candidate_info):
             ratings.append(float(overall_rating))
         
         if not categories or not ratings:  # If no valid ratings found
-            print("No valid ratings found for radar chart")
+            logger.warning("No valid ratings found for radar chart")
             return None, None
         
         # Create radar chart
@@ -284,7 +331,7 @@ async def generate_performance_charts(analysis_data, candidate_info):
                     sub_ratings.append(float(rating))
         
         if not sub_categories or not sub_ratings:  # If no valid ratings found
-            print("No valid ratings found for bar chart")
+            logger.warning("No valid ratings found for bar chart")
             return radar_filename, None
         
         # Create bar chart
@@ -321,9 +368,7 @@ async def generate_performance_charts(analysis_data, candidate_info):
         return radar_filename, bar_filename
         
     except Exception as e:
-        print(f"Error generating charts: {str(e)}")
-        import traceback
-        print(traceback.format_exc())
+        logger.exception("Error generating charts", error=str(e))
         return None, None
 
 class QuestionAnswer(BaseModel):
@@ -337,26 +382,185 @@ class AnalysisRequest(BaseModel):
     interview_date: str = Field(default_factory=lambda: datetime.now().strftime("%Y-%m-%d"))
     interviewer_name: str = "AI Interviewer"
 
+class CohortAnalysisRequest(BaseModel):
+    interview_ids: Optional[List[str]] = Field(None, description="Interviews to analyze")
+    filter: Optional[Dict[str, Any]] = Field(None, description="MongoDB filter selecting the interviews to analyze")
+    extra_prompt: str = ""
+    concurrency: Optional[int] = Field(None, ge=1, description="Analyses run at the same time")
+    limit: Optional[int] = Field(None, ge=1, description="Maximum number of interviews matched by the filter")
+    use_cache: bool = True
+
+def _build_analysis_request(interview_session: Dict[str, Any]) -> Dict[str, Any]:
+    """Format a stored interview session as input for analyze_performance_from_json."""
+    return {
+        "candidate_name": interview_session.get("candidate_name", "Unknown"),
+        "position_applied": interview_session.get("role", "Unknown"),
+        "interview_date": interview_session.get("start_time", datetime.utcnow()).strftime("%Y-%m-%d"),
+        "interviewer_name": "AI Interviewer",
+        "question_answer": interview_session.get("conversation_history", [])
+    }
+
+def _validate_cohort_filter(value: Any):
+    """Reject filters that use server-side JavaScript operators."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key in FORBIDDEN_FILTER_OPERATORS:
+                raise ValueError(f"Operator not allowed in cohort filter: {key}")
+            _validate_cohort_filter(item)
+    elif isinstance(value, list):
+        for item in value:
+            _validate_cohort_filter(item)
+
+async def _iter_cohort_ids(interview_ids: Optional[List[str]], filter: Optional[Dict[str, Any]], limit: Optional[int]) -> AsyncIterator[str]:
+    """Yield the interview IDs of a cohort, streaming them from MongoDB for filters."""
+    if interview_ids is not None:
+        for interview_id in dict.fromkeys(str(i) for i in interview_ids):
+            yield interview_id
+        return
+
+    async for interview_id in shared_state.repository.iter_interview_ids(filter, limit):
+        yield interview_id
+
+async def _analyze_cohort_member(interview_id: str, extra_prompt: str, use_cache: bool) -> Dict[str, Any]:
+    """Analyze and store one interview, returning its progress record."""
+    started = time.perf_counter()
+    record = {"type": "progress", "interview_id": interview_id}
+    try:
+        interview_session = await shared_state.repository.get_analysis_view(interview_id)
+        if not interview_session:
+            record.update(status="not_found", error="Interview not found")
+        else:
+            analysis = await analyze_performance_from_json(
+                _build_analysis_request(interview_session),
+                extra_prompt,
+                use_cache=use_cache,
+                interview_id=interview_id
+            )
+            await shared_state.repository.store_analysis(interview_id, analysis)
+            record.update(
+                status="success",
+                overall_rating=analysis.get("overall_rating"),
+                result=analysis.get("result")
+            )
+    except CircuitOpenError as e:
+        retry_in = await _defer_analysis(
+            interview_id,
+            f"cohort:{interview_id}:{extra_prompt}",
+            lambda: _analyze_cohort_member(interview_id, extra_prompt, use_cache),
+            e
+        )
+        record.update(status="queued", retry_after_seconds=round(retry_in, 1))
+    except Exception as e:
+        record.update(status="error", error=getattr(e, "detail", str(e)))
+
+    record["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+    return record
+
+async def analyze_cohort(
+    interview_ids: Optional[List[str]] = None,
+    filter: Optional[Dict[str, Any]] = None,
+    extra_prompt: str = "",
+    concurrency: Optional[int] = None,
+    limit: Optional[int] = None,
+    use_cache: bool = True
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Analyze many interviews with a bounded pool of concurrent workers.
+
+    Each analysis is stored with MongoDBService.store_analysis. Progress records are
+    yielded in completion order, followed by a single summary record.
+
+    Args:
+        interview_ids: Explicit cohort; takes precedence over filter
+        filter: MongoDB filter selecting the cohort
+        extra_prompt: Additional notes passed to every analysis
+        concurrency: Number of workers (defaults to REPORT_COHORT_CONCURRENCY)
+        limit: Maximum number of interviews matched by filter
+        use_cache: Serve identical transcripts from the LLM response cache
+
+    Yields:
+        {"type": "progress", "interview_id", "status", ...} per interview, then
+        {"type": "summary", "total", "succeeded", "queued", "failed", "elapsed_seconds"}
+
+        Interviews reached while the LLM circuit is open are reported as "queued" and
+        analyzed in the background once the circuit may have closed.
+    """
+    if interview_ids is None and filter is None:
+        raise ValueError("Either interview_ids or filter is required")
+    if filter is not None:
+        _validate_cohort_filter(filter)
+
+    workers_count = max(1, min(concurrency or COHORT_CONCURRENCY, COHORT_MAX_CONCURRENCY))
+    pending: asyncio.Queue = asyncio.Queue(maxsize=workers_count * 2)
+    results: asyncio.Queue = asyncio.Queue()
+    started = time.perf_counter()
+
+    async def produce():
+        try:
+            async for interview_id in _iter_cohort_ids(interview_ids, filter, limit):
+                await pending.put(interview_id)
+        finally:
+            for _ in range(workers_count):
+                await pending.put(None)
+
+    async def work():
+        while True:
+            interview_id = await pending.get()
+            if interview_id is None:
+                await results.put(None)
+                return
+            await results.put(await _analyze_cohort_member(interview_id, extra_prompt, use_cache))
+
+    tasks = [asyncio.ensure_future(produce())]
+    tasks += [asyncio.ensure_future(work()) for _ in range(workers_count)]
+    totals = {"total": 0, "succeeded": 0, "queued": 0, "failed": 0}
+    try:
+        finished_workers = 0
+        while finished_workers < workers_count:
+            record = await results.get()
+            if record is None:
+                finished_workers += 1
+                continue
+            totals["total"] += 1
+            if record["status"] == "success":
+                totals["succeeded"] += 1
+            elif record["status"] == "queued":
+                totals["queued"] += 1
+            else:
+                totals["failed"] += 1
+            yield record
+
+        error = (await asyncio.gather(tasks[0], return_exceptions=True))[0]
+        summary = {"type": "summary", **totals, "elapsed_seconds": round(time.perf_counter() - started, 3)}
+        if error:
+            summary["error"] = f"Failed to list cohort: {str(error)}"
+        yield summary
+    finally:
+        # Stop outstanding work if the client goes away mid-stream
+        for task in tasks:
+            task.cancel()
+
 @app.post("/{interview_id}")
 async def analyze_interview(interview_id: UUID, extra_prompt: Optional[str] = ""):
     """Generate analysis and charts for an interview using its ID."""
+    return await analysis_flight.do(
+        f"analyze_interview:{interview_id}:{extra_prompt}",
+        lambda: _analyze_interview(interview_id, extra_prompt)
+    )
+
+async def _analyze_interview(interview_id: UUID, extra_prompt: Optional[str] = ""):
+    """Run the analysis and chart pipeline for one interview."""
     try:
         # Get interview data from MongoDB
-        interview_session = await shared_state.mongodb.get_interview_session(interview_id)
+        interview_session = await shared_state.repository.get_analysis_view(interview_id)
         if not interview_session:
             raise HTTPException(status_code=404, detail="Interview not found")
 
         # Format data for analysis
-        analysis_request = {
-            "candidate_name": interview_session.get("candidate_name", "Unknown"),
-            "position_applied": interview_session.get("role", "Unknown"),
-            "interview_date": interview_session.get("start_time", datetime.utcnow()).strftime("%Y-%m-%d"),
-            "interviewer_name": "AI Interviewer",
-            "question_answer": interview_session.get("conversation_history", [])
-        }
+        analysis_request = _build_analysis_request(interview_session)
 
         # Get analysis
-        analysis = await analyze_performance_from_json(analysis_request, extra_prompt)
+        analysis = await analyze_performance_from_json(analysis_request, extra_prompt, interview_id=str(interview_id))
         
         # Generate charts
         radar_chart_path, bar_chart_path = await generate_performance_charts(
@@ -373,7 +577,7 @@ async def analyze_interview(interview_id: UUID, extra_prompt: Optional[str] = ""
                 with open(file_path, "rb") as f:
                     return base64.b64encode(f.read()).decode('utf-8')
             except Exception as e:
-                print(f"Error reading file {file_path}: {str(e)}")
+                logger.error("Error reading chart file", file_path=file_path, error=str(e))
                 return None
 
         # Save analysis JSON
@@ -404,11 +608,7 @@ async def analyze_interview(interview_id: UUID, extra_prompt: Optional[str] = ""
             json.dump(analysis_data, f, indent=4, default=str)
 
         # Update interview document with analysis data
-        await shared_state.mongodb.ai_interviews.update_one(
-            {"interview_id": str(interview_id)},
-            {"$set": analysis_data},
-            upsert=True
-        )
+        await shared_state.repository.store_analysis_report(interview_id, analysis_data)
 
         # Prepare response
         response = {
@@ -426,10 +626,25 @@ async def analyze_interview(interview_id: UUID, extra_prompt: Optional[str] = ""
 
         return JSONResponse(content=response)
 
+    except CircuitOpenError as e:
+        # The LLM provider is failing: accept the work and run it when the circuit may have closed
+        retry_in = await _defer_analysis(
+            str(interview_id),
+            f"analyze_interview:{interview_id}:{extra_prompt}",
+            lambda: analyze_interview(interview_id, extra_prompt),
+            e
+        )
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={
+                "status": "queued",
+                "interview_id": str(interview_id),
+                "retry_after_seconds": round(retry_in, 1)
+            }
+        )
+
     except Exception as e:
-        print(f"\nError in analyze_interview: {str(e)}")
-        import traceback
-        print(traceback.format_exc())
+        logger.exception("Error in analyze_interview", interview_id=str(interview_id), error=str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
@@ -440,8 +655,9 @@ async def get_interview_report(interview_id: UUID):
     """Get the analysis report for an interview."""
     try:
         # Get analysis from MongoDB
-        analysis = await shared_state.mongodb.ai_interviews.find_one(
-            {"interview_id": str(interview_id)}
+        analysis = await shared_state.repository.get_view(
+            str(interview_id),
+            {"_id": 0, "analysis": 1, "file_paths": 1}
         )
         
         if not analysis:
@@ -492,8 +708,9 @@ async def generate_report(interview_id: str):
     """Generate a PDF report for the interview."""
     try:
         # Get interview data first to check if it exists
-        interview_data = await shared_state.mongodb.ai_interviews.find_one(
-            {"interview_id": interview_id}
+        interview_data = await shared_state.repository.get_view(
+            interview_id,
+            {"_id": 0, "candidate_name": 1}
         )
         
         if not interview_data:
@@ -516,6 +733,39 @@ async def generate_report(interview_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/{interview_id}/pdf")
+async def download_report(interview_id: str):
+    """Download the generated PDF report, streamed from GridFS."""
+    return await get_pdf_report(interview_id)
+
+@router.post("/cohort/analyze")
+async def analyze_cohort_endpoint(request: CohortAnalysisRequest):
+    """Analyze a cohort of interviews, streaming per-interview progress as NDJSON.
+    
+    Every line is a JSON object: one `progress` record per interview in completion
+    order, then a final `summary` record.
+    """
+    if (request.interview_ids is None) == (request.filter is None):
+        raise HTTPException(status_code=400, detail="Provide exactly one of interview_ids or filter")
+    if request.filter is not None:
+        try:
+            _validate_cohort_filter(request.filter)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    async def ndjson():
+        async for record in analyze_cohort(
+            interview_ids=request.interview_ids,
+            filter=request.filter,
+            extra_prompt=request.extra_prompt,
+            concurrency=request.concurrency,
+            limit=request.limit,
+            use_cache=request.use_cache
+        ):
+            yield json.dumps(record, default=str) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
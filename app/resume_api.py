@@ -38,7 +38,7 @@ async def upload_resume(
         interview_id = uuid4()
         
         # Store in MongoDB with candidate name
-        await shared_state.mongodb.store_resume_data(
+        await shared_state.repository.store_resume_data(
             interview_id=interview_id,
             data={
                 "resume_text": resume_text,
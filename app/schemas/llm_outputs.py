@@ -0,0 +1,32 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Dict, Any
+
+# Shapes the LLM must return; validated by app.services.json_parser.parse_json_object
+
+class ExtractedSkills(BaseModel):
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    technical_skills: List[str]
+
+class SubcategoryRating(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    rating: float = Field(..., ge=0, le=10)
+    evidence: str = ""
+
+class SkillCategoryRating(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    rating: float = Field(..., ge=0, le=10)
+    evidence: str = ""
+    subcategories: Dict[str, SubcategoryRating] = Field(default_factory=dict)
+
+class PerformanceAnalysis(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    personal_details: Dict[str, Any] = Field(default_factory=dict)
+    skill_categories: Dict[str, SkillCategoryRating]
+    overall_performance: str = ""
+    overall_rating: float = Field(..., ge=0, le=10)
+    result: str = ""
+    evidence: List[str] = Field(default_factory=list)
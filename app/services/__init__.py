@@ -1,6 +1,6 @@
 """
 Services package initialization.
 """
-from app.services.shared_state import init_services, mongodb, groq_service
+from app.services.shared_state import init_services, repository, groq_service
 
-__all__ = ['init_services', 'mongodb', 'groq_service'] 
\ No newline at end of file
+__all__ = ['init_services', 'repository', 'groq_service'] 
\ No newline at end of file
@@ -0,0 +1,197 @@
+"""
+Circuit breaker for calls to the LLM provider.
+"""
+from collections import deque
+from typing import Any, Dict
+import os
+import time
+
+from app.services.structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the provider while the circuit is open."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"LLM provider circuit is open; retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to a failing or very slow provider.
+
+    Outcomes of recent calls are kept in a rolling window. A call counts against the
+    provider when it fails (connection errors, timeouts, 5xx) or succeeds slower than
+    `slow_call_seconds`; rate limiting and client errors are not counted. Once at least
+    `min_calls` outcomes are recorded and the bad ratio reaches `failure_ratio`, the
+    circuit opens and calls fail fast with CircuitOpenError for `open_seconds`. It then
+    goes half-open and lets `half_open_probes` calls through: if they all succeed the
+    circuit closes, otherwise it opens again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_ratio: float = 0.5,
+        min_calls: int = 10,
+        window: int = 20,
+        slow_call_seconds: float = 15.0,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 1,
+        enabled: bool = True
+    ):
+        """
+        Args:
+            failure_ratio: Share of bad outcomes in the window that opens the circuit
+            min_calls: Outcomes required before the ratio is evaluated
+            window: Number of recent outcomes kept
+            slow_call_seconds: Successful calls slower than this count as bad
+            open_seconds: How long the circuit stays open before probing
+            half_open_probes: Successful probes required to close the circuit
+            enabled: When False every call is allowed
+        """
+        self.failure_ratio = failure_ratio
+        self.min_calls = min_calls
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.half_open_probes = max(1, half_open_probes)
+        self.enabled = enabled
+        self._outcomes = deque(maxlen=window)  # True for a bad outcome
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._stats = {"opened": 0, "rejected": 0, "failures": 0, "slow_calls": 0}
+
+    @classmethod
+    def from_env(cls) -> "CircuitBreaker":
+        """Build a breaker configured from GROQ_BREAKER_* environment variables."""
+        return cls(
+            failure_ratio=float(os.getenv("GROQ_BREAKER_FAILURE_RATIO", "0.5")),
+            min_calls=int(os.getenv("GROQ_BREAKER_MIN_CALLS", "10")),
+            window=int(os.getenv("GROQ_BREAKER_WINDOW", "20")),
+            slow_call_seconds=float(os.getenv("GROQ_BREAKER_SLOW_CALL_SECONDS", "15")),
+            open_seconds=float(os.getenv("GROQ_BREAKER_OPEN_SECONDS", "30")),
+            half_open_probes=int(os.getenv("GROQ_BREAKER_HALF_OPEN_PROBES", "1")),
+            enabled=os.getenv("GROQ_BREAKER_ENABLED", "true").lower() == "true"
+        )
+
+    @property
+    def state(self) -> str:
+        """Current state; an open circuit turns half-open once open_seconds have passed."""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = self.HALF_OPEN
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+        return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until calls may be attempted again."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+
+    def check(self):
+        """
+        Fail fast if a call would be rejected, without reserving a probe.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or all half-open probes are taken
+        """
+        if not self.enabled:
+            return
+        state = self.state
+        if state == self.OPEN:
+            self._stats["rejected"] += 1
+            raise CircuitOpenError(self.retry_after())
+        if state == self.HALF_OPEN and self._probes_in_flight >= self.half_open_probes:
+            self._stats["rejected"] += 1
+            raise CircuitOpenError(1.0)
+
+    def before_call(self):
+        """
+        Admit a call, reserving a probe slot when half-open.
+
+        Every admitted call must be followed by exactly one of record_success,
+        record_failure or record_ignored.
+
+        Raises:
+            CircuitOpenError: If the call is not admitted
+        """
+        self.check()
+        if self.enabled and self._state == self.HALF_OPEN:
+            self._probes_in_flight += 1
+
+    def record_success(self, latency: float):
+        """Record a completed call and its latency in seconds."""
+        if not self.enabled:
+            return
+        slow = latency > self.slow_call_seconds
+        if slow:
+            self._stats["slow_calls"] += 1
+
+        if self._state == self.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            if slow:
+                self._open()
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_probes:
+                self._close()
+            return
+        self._record(slow)
+
+    def record_failure(self):
+        """Record a call that failed because of the provider."""
+        if not self.enabled:
+            return
+        self._stats["failures"] += 1
+        if self._state == self.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            self._open()
+            return
+        self._record(True)
+
+    def record_ignored(self):
+        """Release an admitted call whose outcome says nothing about provider health."""
+        if self.enabled and self._state == self.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return state, recent bad-outcome ratio and counters."""
+        bad = sum(self._outcomes)
+        return {
+            **self._stats,
+            "state": self.state,
+            "enabled": self.enabled,
+            "window_calls": len(self._outcomes),
+            "window_bad_ratio": round(bad / len(self._outcomes), 3) if self._outcomes else None,
+            "retry_after_seconds": round(self.retry_after(), 1)
+        }
+
+    def _record(self, bad: bool):
+        if self._state != self.CLOSED:
+            return
+        self._outcomes.append(bad)
+        if len(self._outcomes) >= self.min_calls and sum(self._outcomes) / len(self._outcomes) >= self.failure_ratio:
+            self._open()
+
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._outcomes.clear()
+        self._stats["opened"] += 1
+        logger.error("LLM circuit opened", open_seconds=self.open_seconds)
+
+    def _close(self):
+        self._state = self.CLOSED
+        self._outcomes.clear()
+        logger.info("LLM circuit closed")
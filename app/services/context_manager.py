@@ -0,0 +1,161 @@
+"""
+Bounded-size conversation context for interview prompts.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import os
+
+from app.services.rate_limiter import Priority
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You maintain running notes for a technical interview. Merge the new turns into the "
+    "existing notes. Keep every skill discussed, the depth the candidate showed, notable "
+    "strengths, weak areas and topics already asked about so they are not repeated. "
+    "Respond with plain text notes only."
+)
+
+
+class ConversationContextManager:
+    """
+    Keeps the interview prompt a bounded size regardless of interview length.
+
+    The last `recent_turns` question/answer pairs are sent verbatim. Older turns are
+    folded into a compact summary stored on the interview document as
+    `conversation_summary` ({"text", "turns_summarized", "updated_at"}). Turns that have
+    aged out of the recent window but are not yet summarized are sent verbatim until
+    the summary catches up. The whole rendered context is trimmed, oldest first, to
+    `token_budget` estimated tokens.
+
+    The history passed in may be only the tail of the stored history (the prompt view
+    reads a `$slice` window); `offset` is then the index of its first turn in the full
+    history. Turns that fell out of the window before being summarized are skipped.
+    """
+
+    def __init__(self, recent_turns: int = 4, token_budget: int = 1500, max_answer_chars: int = 1200, summary_max_tokens: int = 400):
+        """
+        Args:
+            recent_turns: Number of most recent turns always kept verbatim
+            token_budget: Upper bound on estimated tokens for the rendered conversation
+            max_answer_chars: Longer answers are truncated when rendered
+            summary_max_tokens: Completion budget for each summary update
+        """
+        self.recent_turns = recent_turns
+        self.token_budget = token_budget
+        self.max_answer_chars = max_answer_chars
+        self.summary_max_tokens = summary_max_tokens
+
+    @classmethod
+    def from_env(cls) -> "ConversationContextManager":
+        """Build a context manager configured from INTERVIEW_CONTEXT_* environment variables."""
+        return cls(
+            recent_turns=int(os.getenv("INTERVIEW_CONTEXT_RECENT_TURNS", "4")),
+            token_budget=int(os.getenv("INTERVIEW_CONTEXT_TOKEN_BUDGET", "1500")),
+            max_answer_chars=int(os.getenv("INTERVIEW_CONTEXT_MAX_ANSWER_CHARS", "1200")),
+            summary_max_tokens=int(os.getenv("INTERVIEW_CONTEXT_SUMMARY_MAX_TOKENS", "400"))
+        )
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """Cheap token estimate (about four characters per token)."""
+        return len(text) // 4 + 1
+
+    def build_context(self, history: List[Any], summary: Optional[Dict[str, Any]] = None, offset: int = 0) -> str:
+        """Render the conversation for the prompt within the token budget."""
+        summary = summary or {}
+        summarized = min(summary.get("turns_summarized", 0), self._summarizable_count(history, offset))
+        turns = [self._format_turn(qa) for qa in history[max(0, summarized - offset):]]
+        turns = [turn for turn in turns if turn]
+
+        summary_text = summary.get("text", "").strip()
+        header = f"Summary of earlier discussion:\n{summary_text}\n\n" if summary_text else ""
+        budget = self.token_budget - self.estimate_tokens(header)
+
+        # Keep the newest turns that fit the budget
+        kept = []
+        for turn in reversed(turns):
+            cost = self.estimate_tokens(turn)
+            if kept and cost > budget:
+                break
+            kept.append(turn)
+            budget -= cost
+        kept.reverse()
+
+        if not kept:
+            return header.strip() or "No previous questions."
+        return header + "Recent turns:\n" + "\n\n".join(kept)
+
+    def pending_turns(self, history: List[Any], summary: Optional[Dict[str, Any]] = None, offset: int = 0) -> Tuple[int, List[Any]]:
+        """Return the summarized turn count and the aged-out turns not yet in the summary."""
+        summarized = (summary or {}).get("turns_summarized", 0)
+        target = self._summarizable_count(history, offset)
+        if target <= summarized:
+            return summarized, []
+        return summarized, history[max(0, summarized - offset):target - offset]
+
+    def needs_update(self, history: List[Any], summary: Optional[Dict[str, Any]] = None, offset: int = 0) -> bool:
+        """True when turns have aged out of the recent window without being summarized."""
+        return bool(self.pending_turns(history, summary, offset)[1])
+
+    async def update_summary(
+        self,
+        groq_service,
+        history: List[Any],
+        summary: Optional[Dict[str, Any]] = None,
+        interview_id: Optional[str] = None,
+        offset: int = 0
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fold aged-out turns into the running summary.
+
+        Args:
+            groq_service: Service used for the summary completion
+            history: Conversation history, or its most recent window
+            summary: Currently stored summary, if any
+            interview_id: Interview the LLM usage is attributed to
+            offset: Index of history[0] in the full conversation history
+
+        Returns:
+            The new summary document, or None if nothing needed summarizing
+        """
+        summarized, pending = self.pending_turns(history, summary, offset)
+        if not pending:
+            return None
+
+        previous = (summary or {}).get("text", "").strip() or "No notes yet."
+        new_turns = "\n\n".join(turn for turn in (self._format_turn(qa) for qa in pending) if turn)
+        messages = [
+            {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+            {"role": "user", "content": f"Existing notes:\n{previous}\n\nNew turns:\n{new_turns}"}
+        ]
+
+        text = await groq_service.chat_completion(
+            messages,
+            max_tokens=self.summary_max_tokens,
+            priority=Priority.REPORT,
+            call_site="conversation_summary",
+            interview_id=interview_id
+        )
+        return {
+            "text": text.strip(),
+            "turns_summarized": self._summarizable_count(history, offset),
+            "updated_at": datetime.utcnow()
+        }
+
+    def _summarizable_count(self, history: List[Any], offset: int = 0) -> int:
+        return max(0, offset + len(history) - self.recent_turns)
+
+    def _format_turn(self, qa: Any) -> str:
+        if isinstance(qa, dict):
+            question = qa.get("question", "")
+            answer = qa.get("answer", "")
+        else:
+            question = getattr(qa, "question", "")
+            answer = getattr(qa, "answer", "")
+
+        question = (question or "").strip()
+        answer = (answer or "").strip()
+        if not question:
+            return ""
+        if len(answer) > self.max_answer_chars:
+            answer = answer[:self.max_answer_chars] + "..."
+        return f"Q: {question}\nA: {answer or '(no answer yet)'}"
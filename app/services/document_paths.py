@@ -0,0 +1,168 @@
+"""
+Evaluation of MongoDB document paths, projections and query filters in Python.
+
+Covers the operators the application's own queries and projections use. The in-memory
+backend stores interviews with these, and MongoDBService applies projections to
+archived interviews after decompressing them.
+"""
+from datetime import datetime
+from typing import Any, Dict, Optional, Union
+import copy
+
+# Value of a path that does not exist, distinct from an explicit None
+MISSING = object()
+
+
+def get_path(document: Any, path: str) -> Any:
+    """Value at a dotted path, or MISSING"""
+    value = document
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return MISSING
+        value = value[key]
+    return value
+
+
+def set_path(document: Dict[str, Any], path: str, value: Any):
+    """$set a dotted path, creating intermediate documents"""
+    *parents, last = path.split(".")
+    for key in parents:
+        document = document.setdefault(key, {})
+    document[last] = value
+
+
+def unset_path(document: Dict[str, Any], path: str):
+    """$unset a dotted path"""
+    *parents, last = path.split(".")
+    for key in parents:
+        document = document.get(key)
+        if not isinstance(document, dict):
+            return
+    document.pop(last, None)
+
+
+def inc_path(document: Dict[str, Any], path: str, amount: Union[int, float]):
+    """$inc a dotted path, starting from 0"""
+    current = get_path(document, path)
+    set_path(document, path, (0 if current is MISSING else current) + amount)
+
+
+_BSON_TYPES = [(bool, "bool"), (int, "int"), (float, "double"), (str, "string"), (dict, "object"), (list, "array"), (datetime, "date")]
+
+
+def evaluate(expression: Any, document: Dict[str, Any]) -> Any:
+    """Evaluate an aggregation expression ($field paths, $ifNull, $size, $ne, $type) on a document"""
+    if isinstance(expression, str) and expression.startswith("$"):
+        return get_path(document, expression[1:])
+    if isinstance(expression, list):
+        return [evaluate(item, document) for item in expression]
+    if not isinstance(expression, dict):
+        return expression
+
+    (operator, args), = expression.items()
+    if operator == "$ifNull":
+        for arg in args:
+            value = evaluate(arg, document)
+            if value is not None and value is not MISSING:
+                return value
+        return None
+    if operator == "$size":
+        value = evaluate(args, document)
+        if not isinstance(value, list):
+            raise ValueError("The argument to $size must be an array")
+        return len(value)
+    if operator == "$ne":
+        left, right = (evaluate(arg, document) for arg in args)
+        return (None if left is MISSING else left) != (None if right is MISSING else right)
+    if operator == "$type":
+        value = evaluate(args, document)
+        if value is MISSING:
+            return "missing"
+        if value is None:
+            return "null"
+        return next((name for kind, name in _BSON_TYPES if isinstance(value, kind)), "object")
+    raise ValueError(f"Unsupported expression operator: {operator}")
+
+
+def project(document: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Apply a find() projection: inclusion, exclusion, $slice and computed fields"""
+    if not projection:
+        return copy.deepcopy(document)
+
+    specs = {key: value for key, value in projection.items() if key != "_id"}
+    if specs and all(value in (0, False) for value in specs.values()):
+        result = copy.deepcopy(document)
+        for path in projection:
+            if projection[path] in (0, False):
+                unset_path(result, path)
+        return result
+
+    result: Dict[str, Any] = {}
+    if projection.get("_id", 1) and "_id" in document:
+        result["_id"] = document["_id"]
+    for path, spec in specs.items():
+        if isinstance(spec, dict) and "$slice" in spec:
+            value = get_path(document, path)
+            if isinstance(value, list):
+                count = spec["$slice"]
+                set_path(result, path, copy.deepcopy(value[count:] if count < 0 else value[:count]))
+        elif spec in (1, True):
+            value = get_path(document, path)
+            if value is not MISSING:
+                set_path(result, path, copy.deepcopy(value))
+        else:
+            value = evaluate(spec, document)
+            if value is not MISSING:
+                set_path(result, path, value)
+    return result
+
+
+def _compare(operator: str, value: Any, operand: Any) -> bool:
+    if operator == "$eq":
+        return value == operand or (isinstance(value, list) and operand in value)
+    if operator == "$ne":
+        return not _compare("$eq", value, operand)
+    if operator == "$in":
+        return any(_compare("$eq", value, item) for item in operand)
+    if operator == "$nin":
+        return not _compare("$in", value, operand)
+    if value is None:
+        return False
+    try:
+        return {
+            "$gt": lambda: value > operand,
+            "$gte": lambda: value >= operand,
+            "$lt": lambda: value < operand,
+            "$lte": lambda: value <= operand,
+        }[operator]()
+    except KeyError:
+        raise ValueError(f"Unsupported query operator: {operator}")
+    except TypeError:
+        # MongoDB only compares values of the same type
+        return False
+
+
+def matches(document: Dict[str, Any], filter: Dict[str, Any]) -> bool:
+    """Evaluate a query filter on a document"""
+    for key, condition in filter.items():
+        if key == "$and":
+            if not all(matches(document, item) for item in condition):
+                return False
+        elif key == "$or":
+            if not any(matches(document, item) for item in condition):
+                return False
+        elif key == "$nor":
+            if any(matches(document, item) for item in condition):
+                return False
+        elif key.startswith("$"):
+            raise ValueError(f"Unsupported query operator: {key}")
+        else:
+            value = get_path(document, key)
+            operators = condition if isinstance(condition, dict) and condition and all(op.startswith("$") for op in condition) else {"$eq": condition}
+            for operator, operand in operators.items():
+                if operator == "$exists":
+                    if (value is not MISSING) != bool(operand):
+                        return False
+                elif not _compare(operator, None if value is MISSING else value, operand):
+                    return False
+    return True
@@ -1,33 +1,63 @@
 import os
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional, AsyncIterator
 from dotenv import load_dotenv
 import json
-import requests
-from time import sleep
 from app.schemas.models import QuestionAnswer
+from app.services.llm_cache import LLMCache
+from app.services.rate_limiter import GroqRateLimiter, Priority, RateLimitedError, jittered_backoff, parse_retry_after
+from app.services.hedging import HedgePolicy
+from app.services.single_flight import SingleFlight
+from app.services.context_manager import ConversationContextManager
+from app.services.prompt_templates import PROMPTS
+from app.services.json_parser import JSON_OBJECT_FORMAT, LLMJSONError, parse_json_object
+from app.services.llm_metrics import LLMCallMetrics, LLMMetricsRegistry
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.services.structured_logging import get_logger, payload
 import re
 import aiohttp
 import asyncio
+import time
+from contextlib import asynccontextmanager
 
 load_dotenv()
 
+logger = get_logger(__name__)
+
 class GroqService:
     """
     Service class for handling interactions with the Groq LLM API.
     Manages technical interviews by generating context-aware questions and analyzing responses.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        http_session: Optional[aiohttp.ClientSession] = None,
+        cache: Optional[LLMCache] = None,
+        rate_limiter: Optional[GroqRateLimiter] = None,
+        metrics: Optional[LLMMetricsRegistry] = None
+    ):
         """
         Initialize the GroqService with API configuration and settings.
         Sets up API key, endpoints, and retry parameters.
         Raises ValueError if GROQ_API_KEY is not set.
+
+        Args:
+            http_session: Shared pooled session used for API calls. When not provided,
+                a short-lived session is opened per call.
+            cache: Response cache for deterministic completions. Caching is disabled when not provided.
+            rate_limiter: Process-wide limiter shared with other Groq callers. Calls are
+                not throttled when not provided.
+            metrics: Registry receiving per-call latency, token and retry metrics. A private
+                registry is used when not provided.
         """
         self.api_key = os.getenv("GROQ_API_KEY")
         if not self.api_key:
             raise ValueError("GROQ_API_KEY environment variable is not set")
         
-        self.api_url = "https://api.groq.com/openai/v1/chat/completions"
+        # GROQ_BASE_URL is the same variable the Groq SDK reads; point it at a local
+        # OpenAI-compatible server (see benchmarks/fake_groq_server.py) for offline runs
+        self.base_url = os.getenv("GROQ_BASE_URL", "https://api.groq.com").rstrip("/")
+        self.api_url = f"{self.base_url}/openai/v1/chat/completions"
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
@@ -35,6 +65,16 @@ class GroqService:
         self.model = "mixtral-8x7b-32768"
         self.max_retries = 3
         self.retry_delay = 1  # seconds
+        self.request_timeout = float(os.getenv("GROQ_REQUEST_TIMEOUT", "30"))  # seconds per call
+        self.turn_deadline = float(os.getenv("GROQ_TURN_DEADLINE", "20"))  # seconds per interview turn, retries included
+        self.hedge_policy = HedgePolicy.from_env()
+        self.breaker = CircuitBreaker.from_env()
+        self.http_session = http_session
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.metrics = metrics or LLMMetricsRegistry()
+        self.in_flight = SingleFlight()
+        self.context_manager = ConversationContextManager.from_env()
         self.interview_state = None  # Add this to track interview state
 
     async def initialize_interview(self, role: str, experience_level: str = "mid", skills: Dict[str, int] = None) -> Dict[str, Any]:
@@ -75,51 +115,448 @@ class GroqService:
         
      
 
-    async def _call_api(self, messages: List[Dict[str, str]], temperature: float = 0, max_tokens: int = 1000) -> str:
+    async def chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0,
+        max_tokens: int = 1000,
+        use_cache: bool = True,
+        priority: Priority = Priority.REPORT,
+        response_format: Optional[Dict[str, str]] = None,
+        call_site: str = "chat_completion",
+        interview_id: Optional[str] = None,
+        validate: Optional[Callable[[str], Any]] = None
+    ) -> str:
+        """
+        Public entry point for one-off completions outside the interview flow.
+        
+        Args:
+            messages: List of message dictionaries for the conversation
+            model: Model to use instead of the service default
+            temperature: Controls randomness in response (0-1)
+            max_tokens: Maximum length of generated response
+            use_cache: Set to False to always call the API
+            priority: Rate limiter scheduling class for this call
+            response_format: Provider output mode, e.g. JSON_OBJECT_FORMAT
+            call_site: Metrics tag naming the caller
+            interview_id: Metrics tag attributing the call to an interview
+            validate: Called with a fresh response before it is cached; whatever it
+                raises is raised to the caller and the response is not cached
+            
+        Returns:
+            Generated response text from the API
+        """
+        return await self._call_api(
+            messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            model=model,
+            use_cache=use_cache,
+            priority=priority,
+            response_format=response_format,
+            call_site=call_site,
+            interview_id=interview_id,
+            validate=validate
+        )
+
+    async def _call_api(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0,
+        max_tokens: int = 1000,
+        model: Optional[str] = None,
+        use_cache: bool = True,
+        priority: Priority = Priority.INTERVIEW,
+        deadline: Optional[float] = None,
+        hedge: bool = False,
+        response_format: Optional[Dict[str, str]] = None,
+        call_site: str = "interview_turn",
+        interview_id: Optional[str] = None,
+        validate: Optional[Callable[[str], Any]] = None
+    ) -> str:
         """
         Makes async API calls to Groq with built-in retry logic.
         
+        Deterministic (temperature 0) responses are served from and stored in the
+        response cache unless use_cache is False, and identical deterministic requests
+        already in flight are coalesced into one API call. Each attempt waits for the
+        shared rate limiter, and retries use jittered exponential backoff that honours Retry-After.
+        
         Args:
             messages: List of message dictionaries for the conversation
             temperature: Controls randomness in response (0-1)
             max_tokens: Maximum length of generated response
+            model: Model to use instead of the service default
+            use_cache: Set to False to bypass the response cache for this call
+            priority: Rate limiter scheduling class for this call
+            deadline: Total time budget in seconds; retries never exceed what is left
+            hedge: Issue a duplicate request when an attempt exceeds the usual latency
+            response_format: Provider output mode, e.g. JSON_OBJECT_FORMAT for JSON mode
+            call_site: Metrics tag naming the caller
+            interview_id: Metrics tag attributing the call to an interview
+            validate: Called with a fresh response before it is cached; whatever it
+                raises is raised to the caller and the response is not cached
             
         Returns:
             Generated response text from the API
             
         Raises:
-            ValueError: If API calls fail after max retries
+            ValueError: If API calls fail after max retries or the deadline passes
+        """
+        model = model or self.model
+        data = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        extra = {}
+        if response_format:
+            data["response_format"] = response_format
+            extra["response_format"] = response_format
+        
+        call = self.metrics.start(call_site, model, interview_id)
+        try:
+            deterministic = LLMCache.is_cacheable(temperature)
+            if not deterministic:
+                return await self._send_completion(data, priority, deadline=deadline, hedge=hedge, call=call, validate=validate)
+            
+            request_key = LLMCache.make_key(model, messages, temperature, max_tokens, **extra)
+            cache_key = None
+            if self.cache is not None:
+                if use_cache:
+                    cache_key = request_key
+                    cached = await self.cache.get(cache_key)
+                    if cached is not None:
+                        call.outcome = "cache_hit"
+                        return cached
+                else:
+                    self.cache.record_bypass()
+            
+            # Identical deterministic requests already in flight share one API call
+            if self.in_flight.in_flight(request_key):
+                call.outcome = "coalesced"
+            return await self.in_flight.do(
+                request_key,
+                lambda: self._send_completion(data, priority, cache_key, deadline=deadline, hedge=hedge, call=call, validate=validate)
+            )
+        except BaseException as e:
+            call.fail(e)
+            raise
+        finally:
+            self.metrics.record(call)
+
+    async def _send_completion(
+        self,
+        data: Dict[str, Any],
+        priority: Priority,
+        cache_key: Optional[str] = None,
+        deadline: Optional[float] = None,
+        hedge: bool = False,
+        call: Optional[LLMCallMetrics] = None,
+        validate: Optional[Callable[[str], Any]] = None
+    ) -> str:
+        """
+        Send a completion request with rate limiting and retries, caching the result under cache_key.
+        
+        The result is cached only once `validate`, if given, accepted it, so a response
+        the caller cannot use is not replayed from the cache.
+        
+        Args:
+            data: Request body
+            priority: Rate limiter scheduling class
+            cache_key: Cache key to store the result under, if any
+            deadline: Total time budget in seconds across all attempts and backoff
+            hedge: Issue a duplicate request when an attempt is slower than usual
+            call: Metrics for this call, updated with retries, queue time, status and tokens
+            validate: Check of the response text; its exceptions are raised unchanged
+            
+        Raises:
+            CircuitOpenError: If the provider circuit is open; no further attempts are made
+            ValueError: If every attempt fails or the deadline passes
         """
+        expires_at = time.monotonic() + deadline if deadline is not None else None
+        last_error = None
+        
         for attempt in range(self.max_retries):
+            remaining = expires_at - time.monotonic() if expires_at is not None else None
+            if remaining is not None and remaining <= 0:
+                break
+            timeout = min(self.request_timeout, remaining) if remaining is not None else self.request_timeout
+            if call is not None:
+                call.retries = attempt
+            
             try:
-                data = {
-                    "model": self.model,
-                    "messages": messages,
-                    "temperature": temperature,
-                    "max_tokens": max_tokens
-                }
+                # Fail fast during a provider incident instead of queueing and retrying
+                self.breaker.check()
+                if hedge:
+                    content = await self._hedged_completion(data, priority, timeout, call)
+                else:
+                    content = await self._post_completion(data, priority, timeout, call)
                 
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        self.api_url,
-                        headers=self.headers,
-                        json=data,
-                        timeout=30
-                    ) as response:
-                        if response.status == 200:
-                            response_json = await response.json()
-                            return response_json["choices"][0]["message"]["content"]
-                        
-                        if response.status == 429 and attempt < self.max_retries - 1:
-                            await asyncio.sleep(self.retry_delay * (attempt + 1))
-                            continue
-                            
-                        response.raise_for_status()
-                        
+            except CircuitOpenError:
+                raise
             except Exception as e:
+                last_error = e
                 if attempt == self.max_retries - 1:
-                    raise ValueError(f"Failed to get response from Groq: {str(e)}")
-                await asyncio.sleep(self.retry_delay * (attempt + 1))
+                    break
+                
+                # Never sleep past the remaining budget
+                delay = jittered_backoff(attempt, self.retry_delay, retry_after=getattr(e, "retry_after", None))
+                if expires_at is not None and time.monotonic() + delay >= expires_at:
+                    break
+                await asyncio.sleep(delay)
+                continue
+            
+            if validate is not None:
+                validate(content)
+            if cache_key is not None:
+                await self.cache.set(cache_key, content)
+            return content
+        
+        reason = str(last_error) if last_error is not None and str(last_error) else "deadline exceeded"
+        raise ValueError(f"Failed to get response from Groq: {reason}")
+
+    async def _hedged_completion(
+        self,
+        data: Dict[str, Any],
+        priority: Priority,
+        timeout: float,
+        call: Optional[LLMCallMetrics] = None
+    ) -> str:
+        """
+        Send a completion request under the hedge policy.
+        
+        The primary and the hedged attempt each fill their own metrics. Only the winner's
+        queue time, status and tokens are merged into `call`, or the primary's if every
+        attempt fails.
+        """
+        attempts: List[Optional[LLMCallMetrics]] = []
+        
+        async def attempt(budget: float):
+            metrics = call.attempt() if call is not None else None
+            attempts.append(metrics)
+            return await self._post_completion(data, priority, budget, metrics), metrics
+        
+        try:
+            content, winner = await self.hedge_policy.run(attempt, timeout)
+        except BaseException:
+            if call is not None and attempts:
+                call.merge(attempts[0])
+            raise
+        if call is not None:
+            call.merge(winner)
+        return content
+
+    async def _post_completion(
+        self,
+        data: Dict[str, Any],
+        priority: Priority,
+        timeout: float,
+        call: Optional[LLMCallMetrics] = None
+    ) -> str:
+        """
+        Send a single completion request within the given time budget.
+        
+        Raises:
+            CircuitOpenError: If the circuit breaker does not admit the request
+            RateLimitedError: If Groq answers 429
+            asyncio.TimeoutError: If the budget runs out while queued or waiting for the response
+        """
+        started = time.monotonic()
+        if self.rate_limiter is not None:
+            try:
+                await asyncio.wait_for(self.rate_limiter.acquire(priority), timeout=timeout)
+            finally:
+                if call is not None:
+                    call.queue_seconds += time.monotonic() - started
+        
+        remaining = timeout - (time.monotonic() - started)
+        if remaining <= 0:
+            raise asyncio.TimeoutError("Time budget used up waiting for the rate limiter")
+        
+        self.breaker.before_call()
+        sent_at = time.monotonic()
+        try:
+            async with self._get_session() as session:
+                async with session.post(
+                    self.api_url,
+                    headers=self.headers,
+                    json=data,
+                    timeout=aiohttp.ClientTimeout(total=remaining)
+                ) as response:
+                    if self.rate_limiter is not None:
+                        self.rate_limiter.update_from_headers(response.headers)
+                    if call is not None:
+                        call.status_code = response.status
+                    
+                    if response.status == 429:
+                        raise RateLimitedError(parse_retry_after(response.headers))
+                    
+                    response.raise_for_status()
+                    response_json = await response.json()
+                    content = response_json["choices"][0]["message"]["content"]
+        except BaseException as e:
+            self._record_breaker_error(e)
+            raise
+        
+        latency = time.monotonic() - sent_at
+        self.hedge_policy.record(latency)
+        self.breaker.record_success(latency)
+        if call is not None:
+            call.add_usage(response_json.get("usage"))
+        return content
+
+    def _record_breaker_error(self, error: BaseException):
+        """Count an admitted request's failure against the provider unless it was not the provider's fault"""
+        if isinstance(error, (RateLimitedError, asyncio.CancelledError, GeneratorExit)):
+            self.breaker.record_ignored()
+        elif isinstance(error, aiohttp.ClientResponseError) and error.status < 500:
+            self.breaker.record_ignored()
+        else:
+            self.breaker.record_failure()
+
+    async def _stream_api(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0,
+        max_tokens: int = 1000,
+        call_site: str = "interview_turn_stream",
+        interview_id: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Streams a completion from Groq as server-sent events.
+        
+        Connection failures and rate limits are retried until the first token arrives;
+        once tokens have been yielded the stream is not restarted. A cached completion
+        is yielded as a single token.
+        
+        Args:
+            messages: List of message dictionaries for the conversation
+            temperature: Controls randomness in response (0-1)
+            max_tokens: Maximum length of generated response
+            call_site: Metrics tag naming the caller
+            interview_id: Metrics tag attributing the call to an interview
+            
+        Yields:
+            Content tokens in generation order
+            
+        Raises:
+            CircuitOpenError: If the provider circuit is open
+            ValueError: If the stream cannot be opened after max retries
+        """
+        call = self.metrics.start(call_site, self.model, interview_id)
+        admitted = False
+        try:
+            cache_key = None
+            if self.cache is not None and self.cache.is_cacheable(temperature):
+                cache_key = self.cache.make_key(self.model, messages, temperature, max_tokens)
+                cached = await self.cache.get(cache_key)
+                if cached is not None:
+                    call.outcome = "cache_hit"
+                    yield cached
+                    return
+            
+            data = {
+                "model": self.model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "stream": True
+            }
+            
+            for attempt in range(self.max_retries):
+                call.retries = attempt
+                started = False
+                chunks = []
+                try:
+                    self.breaker.check()
+                    if self.rate_limiter is not None:
+                        queued_at = time.monotonic()
+                        await self.rate_limiter.acquire(Priority.INTERVIEW)
+                        call.queue_seconds += time.monotonic() - queued_at
+                    
+                    # The breaker judges the request by its time to first token
+                    self.breaker.before_call()
+                    admitted = True
+                    sent_at = time.monotonic()
+                    async with self._get_session() as session:
+                        async with session.post(
+                            self.api_url,
+                            headers=self.headers,
+                            json=data,
+                            timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+                        ) as response:
+                            if self.rate_limiter is not None:
+                                self.rate_limiter.update_from_headers(response.headers)
+                            call.status_code = response.status
+                            
+                            if response.status == 429 and attempt < self.max_retries - 1:
+                                self.breaker.record_ignored()
+                                admitted = False
+                                await asyncio.sleep(jittered_backoff(
+                                    attempt, self.retry_delay, retry_after=parse_retry_after(response.headers)
+                                ))
+                                continue
+                            
+                            response.raise_for_status()
+                            
+                            async for raw_line in response.content:
+                                line = raw_line.decode("utf-8").strip()
+                                if not line.startswith("data:"):
+                                    continue
+                                
+                                data_line = line[len("data:"):].strip()
+                                if data_line == "[DONE]":
+                                    if admitted:
+                                        self.breaker.record_success(time.monotonic() - sent_at)
+                                        admitted = False
+                                    if cache_key is not None:
+                                        await self.cache.set(cache_key, "".join(chunks))
+                                    return
+                                
+                                chunk = json.loads(data_line)
+                                # Groq reports usage on the final chunk under x_groq
+                                call.add_usage(chunk.get("usage") or (chunk.get("x_groq") or {}).get("usage"))
+                                choices = chunk.get("choices") or [{}]
+                                token = choices[0].get("delta", {}).get("content")
+                                if token:
+                                    if admitted:
+                                        self.breaker.record_success(time.monotonic() - sent_at)
+                                        admitted = False
+                                    started = True
+                                    chunks.append(token)
+                                    yield token
+                            return
+                            
+                except Exception as e:
+                    if admitted:
+                        self._record_breaker_error(e)
+                        admitted = False
+                    if isinstance(e, CircuitOpenError):
+                        raise
+                    if started or attempt == self.max_retries - 1:
+                        raise ValueError(f"Failed to stream response from Groq: {str(e)}")
+                    await asyncio.sleep(jittered_backoff(attempt, self.retry_delay))
+        except BaseException as e:
+            call.fail(e)
+            raise
+        finally:
+            if admitted:
+                # The consumer went away before the first token
+                self.breaker.record_ignored()
+            self.metrics.record(call)
+
+    @asynccontextmanager
+    async def _get_session(self):
+        """Yield the shared pooled session, or a temporary one when none is configured"""
+        if self.http_session is not None and not self.http_session.closed:
+            yield self.http_session
+            return
+        
+        async with aiohttp.ClientSession() as session:
+            yield session
 
     def _format_history(self, history: List[QuestionAnswer]) -> str:
         """
@@ -212,138 +649,30 @@ class GroqService:
             status = 'Covered' if covered else 'Not yet covered'
             skills_context.append(f"- {skill}: Rating {rating}/10 (Focus: {depth}) - {status}")
         
-        skills_summary = "\n".join(skills_context)
-
-        # Analyze current interview progress
-        conversation_history = interview_state.get('conversation_history', [])
-        current_skill = interview_state.get('current_skill', 'Not specified')
         covered_skills = interview_state.get('covered_skills', set())
-        experience_level = interview_state.get('experience_level', 'mid')
-        
-        # Create progress summary
-        progress_summary = f"""
-INTERVIEW FOCUS:
-- Role: {interview_state['role']}
-- Experience Level: {experience_level}
-- Skills covered so far: {', '.join(covered_skills) if covered_skills else 'None yet'}
-- Current focus area: {current_skill}
-- Questions asked: {len(conversation_history)}
-- Interview phase: {'Starting' if is_start else 'In progress'}"""
-
-        # Add introduction section for the start of the interview
-        introduction = """
-INTRODUCTION (Only for first interaction):
-- Start with a warm, professional greeting
-- Briefly introduce yourself as the technical interviewer
-- Explain the interview format and expectations
-- Example: "Hi! I'm your technical interviewer today. We'll be discussing your experience as a [role], focusing on the skills you've listed. I'll ask technical questions and may dive deeper into specific areas. Feel free to ask clarifying questions at any point. Shall we begin?"
-"""
-
-        # Create prioritized skills list
-        uncovered_skills = [
-            (skill, rating) for skill, rating in interview_state.get('skills', {}).items()
-            if skill not in interview_state.get('covered_skills', set())
-        ]
-        uncovered_skills.sort(key=lambda x: x[1], reverse=True)
-        prioritized_skills = "\n".join([
-            f"- {skill}: Priority {rating}/10"
-            for skill, rating in uncovered_skills
-        ])
-
-        return f"""You are an experienced engineer having an in-depth technical discussion with a peer about their experience in {interview_state['role']}. 
-
-INTERVIEW DYNAMICS:
-1. Question Strategy
-   - Start broad to identify areas of strength
-   - Follow interesting technical threads naturally
-   - Avoid repeating similar questions about the same concept
-   - Let their answers guide the technical depth
-
-2. Response Analysis
-   - Listen for unique insights or approaches
-   - Note when they bring up interesting trade-offs
-   - Pick up on technical details they emphasize
-   - Follow their technical reasoning
-
-3. Natural Transitions
-   When switching topics:
-   - Reference something from their previous answers
-   - Connect it to the new topic naturally
-   - Acknowledge their request to switch smoothly
-   Example flow: "You mentioned [previous point] earlier. That's interesting because it relates to [new topic]..."
-
-4. Technical Deep Dives
-   - When they show expertise:
-     * Explore their decision-making process
-     * Discuss trade-offs they considered
-     * Challenge their assumptions professionally
-   - When they struggle:
-     * Note it and move on naturally
-     * Switch to their areas of strength
-     * Don't repeat similar questions
-
-5. Conversation Balance
-   - Mix technical depth with natural flow
-   - Show interest in their unique approaches
-   - Challenge them while keeping it collaborative
-   - Let them expand on interesting points they raise
-
-Remember:
-- Each question should feel like a natural progression
-- Don't get stuck in repetitive patterns or phrases 
-- Follow interesting technical threads
-- Keep it challenging but conversational
-- Let their expertise guide the discussion
-- do not repeat the same structure of responses 
-
-SKILL CONTEXT:
-{skills_summary}
-
-{progress_summary}
-
-Remember: 
-- Be direct but professional when answers lack depth
-- Don't praise superficial or vague responses
-- Match follow-up difficulty to their claimed expertise level
-- Show appropriate concern when core skills are weak
-
-You must respond with a valid JSON object containing: 
-{{
-    "acknowledgment": "Your brief acknowledgment of their previous response",
-    "question": "Your next interview question here",
-    "current_skill": "One of the candidate's listed skills being assessed",
-    "thought_process": {{
-        "response_analysis": "Honest assessment of answer quality",
-        "knowledge_assessment": "Clear evaluation of demonstrated expertise",
-        "topic_decision": "Why continue or switch topics based on answer quality",
-        "approach": "How to address any concerns while maintaining professionalism"
-    }},
-    "skill_coverage": {{
-        "current_skill": "Skill being assessed",
-        "covered_skills": ["List of skills covered so far"],
-        "weak_areas": ["Skills where candidate showed weakness"],
-        "next_priorities": ["Skills to prioritize next"]
-    }},
-    "difficulty": "basic|intermediate|advanced (matching their level)",
-    "context": "Optional context for the question",
-    "follow_ups": ["Potential follow-up points within their skills"]
-}}"""
+        
+        # Only the per-turn segment is rendered; the static instructions are precompiled
+        return PROMPTS.render(
+            "interview_system",
+            skills_summary="\n".join(skills_context),
+            role=interview_state['role'],
+            experience_level=interview_state.get('experience_level', 'mid'),
+            covered_skills=', '.join(covered_skills) if covered_skills else 'None yet',
+            current_skill=interview_state.get('current_skill', 'Not specified'),
+            question_count=interview_state.get('question_count', len(interview_state.get('conversation_history', []))),
+            phase='Starting' if is_start else 'In progress'
+        )
 
     def _validate_llm_response(self, response_text: str) -> Dict[str, Any]:
         """Validate and structure the LLM response"""
         try:
-            # Parse JSON response
+            # Parse JSON response, tolerating fences, surrounding prose and common syntax slips
             try:
-                response_data = json.loads(response_text)
-            except json.JSONDecodeError as e:
-                print(f"JSON Parse Error: {str(e)}\nResponse text: {response_text}")
+                response_data = parse_json_object(response_text)
+            except LLMJSONError as e:
+                logger.error("Failed to parse LLM response", error=str(e), response=payload(response_text))
                 return self._create_fallback_response("Failed to parse LLM response as JSON")
 
-            # Ensure response_data is a dictionary
-            if not isinstance(response_data, dict):
-                print(f"Invalid response type: {type(response_data)}")
-                return self._create_fallback_response("LLM response is not a dictionary")
-
             # Required fields with default values
             default_thought_process = {
                 "response_analysis": "Analyzing response",
@@ -404,7 +733,7 @@ You must respond with a valid JSON object containing:
             return response_data
 
         except Exception as e:
-            print(f"Validation Error: {str(e)}\nResponse text: {response_text}")
+            logger.error("Invalid LLM response", error=str(e), response=payload(response_text))
             return self._create_fallback_response(f"Error validating response: {str(e)}")
 
     def _create_fallback_response(self, error_msg: str) -> Dict[str, Any]:
@@ -425,75 +754,146 @@ You must respond with a valid JSON object containing:
             "introduction": ""
         }
 
+    def _build_interview_messages(self, state: dict) -> List[Dict[str, str]]:
+        """Build the chat messages for the next interviewer turn"""
+        if state.get("is_start"):
+            # Generate personalized introduction
+            system_prompt = PROMPTS.render("interview_intro_system")
+            user_prompt = PROMPTS.render(
+                "interview_intro_user",
+                candidate_name=state['candidate_name'],
+                role=state['role'],
+                experience_level=state['experience_level']
+            )
+            
+        else:
+            # Regular interview question generation
+            system_prompt = PROMPTS.render("interview_question_system")
+            
+            # Last few turns verbatim plus a rolling summary keeps the prompt bounded
+            conversation = self.context_manager.build_context(
+                state.get('conversation_history', []),
+                state.get('conversation_summary'),
+                state.get('history_offset', 0)
+            )
+            
+            user_prompt = PROMPTS.render(
+                "interview_question_user",
+                role=state['role'],
+                experience_level=state['experience_level'],
+                skills=state.get('skills', {}),
+                conversation=conversation
+            )
+
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+
+    def _format_interview_response(self, state: dict, response: str) -> dict:
+        """Format a completed LLM response to match the InterviewResponse model"""
+        return {
+            "status": "success",
+            "data": {
+                "interview_id": state.get("interview_id"),  # Will be converted to UUID by Pydantic
+                "question": response.strip(),
+                "conversation_context": "Technical Interview",
+                "current_skill": "general",
+                "interviewer_intro": response.strip() if state.get("is_start") else None,
+                "interview_progress": "Starting interview" if state.get("is_start") else "In progress"
+            }
+        }
+
+    def _format_interview_error(self, state: dict, error: Exception) -> dict:
+        """Create an error response that matches the InterviewResponse model"""
+        return {
+            "status": "error",
+            "message": str(error),
+            "data": {
+                "interview_id": state.get("interview_id"),  # Will be converted to UUID by Pydantic
+                "question": "I apologize, but I encountered an issue. Could you please try again?",
+                "conversation_context": "Technical Interview",
+                "current_skill": "general",
+                "interviewer_intro": None,
+                "interview_progress": "Error encountered"
+            }
+        }
+
+    def _format_degraded_response(self, state: dict) -> dict:
+        """
+        Serve a canned interviewer turn while the LLM circuit is open.
+        
+        Alternates between the fallback questions so consecutive degraded turns differ.
+        """
+        is_start = bool(state.get("is_start"))
+        fallback = self._get_fallback_response(state, is_start)["data"]
+        question = fallback["question"]
+        if not is_start and state.get("question_count", len(state.get("conversation_history", []))) % 2:
+            question = self._create_fallback_response("LLM circuit open")["question"]
+        
+        return {
+            "status": "success",
+            "degraded": True,
+            "data": {
+                "interview_id": state.get("interview_id"),
+                "question": question,
+                "conversation_context": "Technical Interview",
+                "current_skill": fallback["current_skill"],
+                "interviewer_intro": fallback.get("interviewer_intro") if is_start else None,
+                "interview_progress": "Starting interview" if is_start else "In progress"
+            }
+        }
+
     async def get_interview_response(self, state: dict) -> dict:
         """Generate interview responses with proper error handling"""
         try:
-            if state.get("is_start"):
-                # Generate personalized introduction
-                system_prompt = """You are an AI technical interviewer. Keep the introduction brief and professional.
-                NO pleasantries or excessive politeness. Be direct and clear.
-                The introduction should ONLY:
-                1. State candidate's name
-                2. State the role
-                3. Ask them about themselves and interest in the role
-                Keep it concise and straightforward."""
-                
-                user_prompt = f"""Create a brief introduction for:
-                Candidate Name: {state['candidate_name']}
-                Role: {state['role']}
-                Experience Level: {state['experience_level']}"""
-                
-            else:
-                # Regular interview question generation
-                system_prompt = """You are an AI technical interviewer. Based on the conversation history and candidate's skills,
-                generate the next relevant technical question. Questions should:
-                1. Be clear and specific
-                2. Focus on practical applications
-                3. Allow candidates to demonstrate their knowledge
-                4. Follow a logical progression from previous questions
-                Keep the tone professional but conversational."""
-                
-                user_prompt = f"""Generate the next interview question based on:
-                Role: {state['role']}
-                Experience Level: {state['experience_level']}
-                Skills: {state.get('skills', {})}
-                Conversation History: {state.get('conversation_history', [])}"""
-
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ]
+            messages = self._build_interview_messages(state)
+            response = await self._call_api(
+                messages,
+                deadline=self.turn_deadline,
+                hedge=True,
+                call_site="interview_intro" if state.get("is_start") else "interview_turn",
+                interview_id=state.get("interview_id")
+            )
+            return self._format_interview_response(state, response)
+            
+        except CircuitOpenError as e:
+            logger.warning("Serving fallback interview response", interview_id=state.get("interview_id"), error=str(e))
+            return self._format_degraded_response(state)
+            
+        except Exception as e:
+            logger.error("Error in get_interview_response", interview_id=state.get("interview_id"), error=str(e))
+            return self._format_interview_error(state, e)
 
-            response = await self._call_api(messages)
+    async def stream_interview_response(self, state: dict) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the next interviewer turn token by token.
+        
+        Yields:
+            {"type": "token", "content": str} for every generated token, followed by a single
+            {"type": "complete", "response": dict} event carrying the same payload that
+            get_interview_response would have returned.
+        """
+        chunks = []
+        try:
+            messages = self._build_interview_messages(state)
+            async for token in self._stream_api(
+                messages,
+                call_site="interview_intro_stream" if state.get("is_start") else "interview_turn_stream",
+                interview_id=state.get("interview_id")
+            ):
+                chunks.append(token)
+                yield {"type": "token", "content": token}
             
-            # Format response to match InterviewResponse model
-            return {
-                "status": "success",
-                "data": {
-                    "interview_id": state.get("interview_id"),  # Will be converted to UUID by Pydantic
-                    "question": response.strip(),
-                    "conversation_context": "Technical Interview",
-                    "current_skill": "general",
-                    "interviewer_intro": response.strip() if state.get("is_start") else None,
-                    "interview_progress": "Starting interview" if state.get("is_start") else "In progress"
-                }
-            }
+            yield {"type": "complete", "response": self._format_interview_response(state, "".join(chunks))}
+            
+        except CircuitOpenError as e:
+            logger.warning("Serving fallback interview response", interview_id=state.get("interview_id"), error=str(e))
+            yield {"type": "complete", "response": self._format_degraded_response(state)}
             
         except Exception as e:
-            print(f"Error in get_interview_response: {str(e)}")
-            # Return error response that matches InterviewResponse model
-            return {
-                "status": "error",
-                "message": str(e),
-                "data": {
-                    "interview_id": state.get("interview_id"),  # Will be converted to UUID by Pydantic
-                    "question": "I apologize, but I encountered an issue. Could you please try again?",
-                    "conversation_context": "Technical Interview",
-                    "current_skill": "general",
-                    "interviewer_intro": None,
-                    "interview_progress": "Error encountered"
-                }
-            }
+            logger.error("Error in stream_interview_response", interview_id=state.get("interview_id"), error=str(e))
+            yield {"type": "complete", "response": self._format_interview_error(state, e)}
 
     def _format_progress_message(self, thought_process: Dict[str, Any], current_skill: str, transition_notes: Optional[str] = None) -> str:
         """Create a more informative progress message"""
@@ -567,8 +967,13 @@ You must respond with a valid JSON object containing:
         ]
         
         try:
-            response_text = await self._call_api(messages, temperature=temperature)
-            response_data = json.loads(response_text)
+            response_text = await self._call_api(
+                messages,
+                temperature=temperature,
+                response_format=JSON_OBJECT_FORMAT,
+                call_site="interview_json"
+            )
+            response_data = parse_json_object(response_text)
             
             # Validate required fields
             required_fields = ["question", "current_skill"]
@@ -579,13 +984,12 @@ You must respond with a valid JSON object containing:
                 
             return response_data
             
-        except json.JSONDecodeError as e:
-            print(f"Failed to parse LLM response as JSON: {str(e)}")
-            print(f"Raw response: {response_text}")
+        except LLMJSONError as e:
+            logger.error("Failed to parse LLM response as JSON", error=str(e), response=payload(response_text))
             raise ValueError("Invalid JSON response from LLM")
             
         except Exception as e:
-            print(f"Error in LLM response: {str(e)}")
+            logger.error("Error in LLM response", error=str(e))
             raise
 
     def _parse_llm_response(self, response_text: str) -> Dict[str, Any]:
@@ -603,11 +1007,7 @@ You must respond with a valid JSON object containing:
         """
         try:
             # Parse JSON response
-            response_data = json.loads(response_text)
-            
-            # Ensure we have a valid dictionary
-            if not isinstance(response_data, dict):
-                raise ValueError("LLM response is not a valid dictionary")
+            response_data = parse_json_object(response_text)
             
             # Check for required fields
             required_fields = ["question", "current_skill", "thought_process"]
@@ -635,12 +1035,11 @@ You must respond with a valid JSON object containing:
                 "expected_response_aspects": response_data["expected_response_aspects"]
             }
             
-        except json.JSONDecodeError as e:
-            print(f"Failed to parse LLM response as JSON: {str(e)}")
-            print(f"Raw response: {response_text}")
+        except LLMJSONError as e:
+            logger.error("Failed to parse LLM response as JSON", error=str(e), response=payload(response_text))
             raise ValueError("Invalid JSON response from LLM")
             
         except Exception as e:
-            print(f"Error parsing LLM response: {str(e)}")
+            logger.error("Error parsing LLM response", error=str(e))
             raise ValueError(f"Failed to parse LLM response: {str(e)}")
 
@@ -0,0 +1,118 @@
+"""
+Hedged execution of latency-sensitive LLM calls.
+"""
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+import asyncio
+import os
+
+T = TypeVar("T")
+
+
+class HedgePolicy:
+    """
+    Issues a duplicate request when the first one is slower than usual.
+
+    Latencies of successful calls are kept in a rolling window. Once enough samples
+    exist, a call that has not finished after the configured percentile of that window
+    gets a hedged duplicate; whichever finishes first wins and the other is cancelled.
+    """
+
+    def __init__(self, percentile: float = 95, window: int = 200, min_samples: int = 20, min_delay: float = 0.5, enabled: bool = True):
+        """
+        Args:
+            percentile: Latency percentile after which a hedge is issued
+            window: Number of recent latencies kept
+            min_samples: Samples required before hedging starts
+            min_delay: Never hedge earlier than this many seconds
+            enabled: When False calls always run once
+        """
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.enabled = enabled
+        self._latencies = deque(maxlen=window)
+        self._stats = {"calls": 0, "hedged": 0, "hedge_wins": 0}
+
+    @classmethod
+    def from_env(cls) -> "HedgePolicy":
+        """Build a policy configured from GROQ_HEDGE_* environment variables."""
+        return cls(
+            percentile=float(os.getenv("GROQ_HEDGE_PERCENTILE", "95")),
+            window=int(os.getenv("GROQ_HEDGE_WINDOW", "200")),
+            min_samples=int(os.getenv("GROQ_HEDGE_MIN_SAMPLES", "20")),
+            min_delay=float(os.getenv("GROQ_HEDGE_MIN_DELAY", "0.5")),
+            enabled=os.getenv("GROQ_HEDGE_ENABLED", "true").lower() == "true"
+        )
+
+    def record(self, latency: float):
+        """Record the latency of a successful call in seconds."""
+        self._latencies.append(latency)
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """Return a percentile of recent latencies, or None without samples."""
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(round(percentile / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None if hedging should not happen."""
+        if not self.enabled or len(self._latencies) < self.min_samples:
+            return None
+        return max(self.min_delay, self.latency_percentile(self.percentile))
+
+    async def run(self, attempt: Callable[[float], Awaitable[T]], timeout: float) -> T:
+        """
+        Run attempt(timeout), hedging with a second attempt if the first is slow.
+
+        Args:
+            attempt: Factory taking the time budget in seconds and returning the call
+            timeout: Total time budget for this execution
+
+        Returns:
+            The result of whichever attempt succeeds first
+
+        Raises:
+            The last attempt's exception if every attempt fails
+        """
+        self._stats["calls"] += 1
+        delay = self.hedge_delay()
+        primary = asyncio.ensure_future(attempt(timeout))
+        pending = {primary}
+
+        try:
+            if delay is None or delay >= timeout:
+                return await primary
+
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                self._stats["hedged"] += 1
+                pending.add(asyncio.ensure_future(attempt(timeout - delay)))
+
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self._stats["hedge_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hedge counters and current latency percentiles."""
+        p50 = self.latency_percentile(50)
+        target = self.latency_percentile(self.percentile)
+        return {
+            **self._stats,
+            "samples": len(self._latencies),
+            "p50_seconds": round(p50, 3) if p50 is not None else None,
+            "hedge_percentile": self.percentile,
+            "hedge_after_seconds": round(target, 3) if target is not None else None
+        }
@@ -0,0 +1,31 @@
+"""
+Pooled HTTP client used for all outbound LLM traffic.
+"""
+import os
+import aiohttp
+
+
+def create_http_session() -> aiohttp.ClientSession:
+    """
+    Create a long-lived aiohttp session with a bounded keep-alive connection pool.
+
+    Pool behaviour is configured through environment variables:
+        GROQ_MAX_CONNECTIONS: Total connections kept in the pool (default 100)
+        GROQ_MAX_CONNECTIONS_PER_HOST: Connections per host, 0 for no limit (default 0)
+        GROQ_KEEPALIVE_TIMEOUT: Seconds an idle connection is kept open (default 30)
+        GROQ_DNS_CACHE_TTL: Seconds resolved addresses are cached (default 300)
+        GROQ_CONNECT_TIMEOUT: Seconds allowed to open a new connection (default 10)
+
+    The session must be created inside a running event loop and closed on shutdown.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=int(os.getenv("GROQ_MAX_CONNECTIONS", "100")),
+        limit_per_host=int(os.getenv("GROQ_MAX_CONNECTIONS_PER_HOST", "0")),
+        keepalive_timeout=float(os.getenv("GROQ_KEEPALIVE_TIMEOUT", "30")),
+        ttl_dns_cache=int(os.getenv("GROQ_DNS_CACHE_TTL", "300")),
+        use_dns_cache=True
+    )
+    timeout = aiohttp.ClientTimeout(
+        sock_connect=float(os.getenv("GROQ_CONNECT_TIMEOUT", "10"))
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
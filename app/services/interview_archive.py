@@ -0,0 +1,171 @@
+"""
+Archival of finished interviews to a compressed cold collection.
+
+Interviews whose report is done and that have not changed for ARCHIVE_AFTER_DAYS are
+moved out of ai_interviews into interview_archive, so the collection and indexes that
+every live turn uses only hold recent interviews. An archive record keeps a few summary
+fields in the clear and the whole interview document, turns included, as one
+zlib-compressed BSON payload. GridFS artifacts (resume text, PDF report) are not moved;
+the archived document keeps its references to them.
+
+Reads are transparent: the repository falls back to the archive when an interview is
+not in the active collection and applies the projection to the decompressed document.
+Analysis and report writes move an archived interview back before writing to it.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+import asyncio
+import os
+import time
+import zlib
+
+import bson
+
+from app.services.structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Statuses of interviews whose report is done and whose document no longer changes
+ARCHIVABLE_STATUSES = ("report_generated", "analyzed")
+
+# Fields kept uncompressed on archive records, for inspection and ad hoc queries
+SUMMARY_FIELDS = ("interview_id", "candidate_name", "role", "experience_level", "status", "analysis_status", "metadata")
+
+# zlib level of archived payloads: 1 is fastest, 9 smallest
+COMPRESSION_LEVEL = int(os.getenv("ARCHIVE_COMPRESSION_LEVEL", "6"))
+
+
+def archive_record(document: Dict[str, Any], level: int = COMPRESSION_LEVEL) -> Dict[str, Any]:
+    """
+    Build the archive record of an interview document.
+
+    Args:
+        document: Complete interview document, with its turns in conversation_history
+        level: zlib compression level
+
+    Returns:
+        Summary fields, `archived_at`, the uncompressed size in `raw_bytes` and the
+        compressed document in `payload`
+    """
+    encoded = bson.encode(document)
+    return {
+        **{field: document[field] for field in SUMMARY_FIELDS if field in document},
+        "archived_at": datetime.utcnow(),
+        "raw_bytes": len(encoded),
+        "payload": zlib.compress(encoded, level)
+    }
+
+
+def archived_document(record: Dict[str, Any]) -> Dict[str, Any]:
+    """The interview document stored in an archive record"""
+    return bson.decode(zlib.decompress(record["payload"]))
+
+
+class InterviewArchiver:
+    """Background task that periodically moves finished interviews to the archive."""
+
+    def __init__(
+        self,
+        repository,
+        enabled: bool = True,
+        archive_after: timedelta = timedelta(days=30),
+        interval: float = 3600.0,
+        batch_size: int = 100,
+        statuses: Tuple[str, ...] = ARCHIVABLE_STATUSES
+    ):
+        """
+        Args:
+            repository: InterviewRepository providing archive_interviews
+            enabled: Run the background task; run_once still works when False
+            archive_after: Idle time after which a finished interview is archived
+            interval: Seconds between archival passes
+            batch_size: Interviews moved per repository call
+            statuses: Statuses eligible for archival
+        """
+        self.repository = repository
+        self.enabled = enabled
+        self.archive_after = archive_after
+        self.interval = interval
+        self.batch_size = batch_size
+        self.statuses = tuple(statuses)
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"runs": 0, "errors": 0, "archived": 0, "skipped": 0, "raw_bytes": 0, "stored_bytes": 0}
+        self._last_run: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_env(cls, repository) -> "InterviewArchiver":
+        """Build an archiver configured from ARCHIVE_* environment variables."""
+        return cls(
+            repository,
+            enabled=os.getenv("ARCHIVE_ENABLED", "true").lower() == "true",
+            archive_after=timedelta(days=float(os.getenv("ARCHIVE_AFTER_DAYS", "30"))),
+            interval=float(os.getenv("ARCHIVE_INTERVAL_SECONDS", "3600")),
+            batch_size=int(os.getenv("ARCHIVE_BATCH_SIZE", "100"))
+        )
+
+    def start(self):
+        """Start the background task if archival is enabled."""
+        if self.enabled and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background task; a batch being moved is abandoned safely."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self) -> Dict[str, int]:
+        """
+        Archive every interview that is due, one batch at a time.
+
+        Returns:
+            Counts of archived and skipped interviews and their raw and stored bytes
+        """
+        cutoff = datetime.utcnow() - self.archive_after
+        started = time.monotonic()
+        totals = {"archived": 0, "skipped": 0, "raw_bytes": 0, "stored_bytes": 0}
+        while True:
+            batch = await self.repository.archive_interviews(cutoff, self.statuses, self.batch_size)
+            for key in totals:
+                totals[key] += batch[key]
+            # Skipped interviews changed since they were selected and are no longer due
+            if batch["archived"] + batch["skipped"] < self.batch_size:
+                break
+
+        for key, value in totals.items():
+            self._stats[key] += value
+        self._stats["runs"] += 1
+        self._last_run = {
+            **totals,
+            "finished_at": datetime.utcnow().isoformat(),
+            "seconds": round(time.monotonic() - started, 3)
+        }
+        if totals["archived"] or totals["skipped"]:
+            logger.info("Archived finished interviews", cutoff=cutoff.isoformat(), **self._last_run)
+        return totals
+
+    def stats(self) -> Dict[str, Any]:
+        raw, stored = self._stats["raw_bytes"], self._stats["stored_bytes"]
+        return {
+            **self._stats,
+            "enabled": self.enabled,
+            "running": self._task is not None and not self._task.done(),
+            "archive_after_days": self.archive_after.total_seconds() / 86400,
+            "compression_ratio": round(raw / stored, 2) if stored else None,
+            "last_run": self._last_run
+        }
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.error("Interview archival failed", error=str(e))
+            await asyncio.sleep(self.interval)
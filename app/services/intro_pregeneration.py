@@ -0,0 +1,126 @@
+"""
+Ahead-of-time generation of interview introductions.
+
+The introduction only depends on the candidate name, role and experience level, all of
+which are known well before the candidate clicks start. It is generated in the
+background after resume upload and skill rating, and stored on the interview document
+as `pregenerated_intro` ({"candidate_name", "role", "experience_level", "response",
+"created_at"}). A stored introduction is only used when all three inputs still match,
+so changing the role or experience level invalidates it.
+"""
+from typing import Any, Dict, Optional
+
+from app.services import shared_state
+from app.services.repository import infer_role
+from app.services.single_flight import SingleFlight
+from app.services.structured_logging import get_logger
+
+DEFAULT_EXPERIENCE_LEVEL = "junior"
+
+logger = get_logger(__name__)
+
+intro_flight = SingleFlight()
+
+
+def _normalize(value: Optional[str]) -> str:
+    return (value or "").strip().lower()
+
+
+def intro_key(context: Dict[str, Any]) -> str:
+    """Single-flight key shared by background pre-generation and /interview/start."""
+    return ":".join([
+        "intro",
+        str(context["interview_id"]),
+        _normalize(context.get("candidate_name")),
+        _normalize(context.get("role")),
+        _normalize(context.get("experience_level"))
+    ])
+
+
+def get_stored_intro(context: Dict[str, Any], stored: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Return the stored introduction as an interview response if it matches the context.
+
+    Args:
+        context: Start context with candidate_name, role and experience_level
+        stored: The interview document's `pregenerated_intro` field
+
+    Returns:
+        A response shaped like GroqService.get_interview_response, or None if stale
+    """
+    if not stored or not stored.get("response"):
+        return None
+    for field in ("candidate_name", "role", "experience_level"):
+        if _normalize(stored.get(field)) != _normalize(context.get(field)):
+            return None
+    return {
+        "status": "success",
+        "data": {**stored["response"], "interview_id": str(context["interview_id"])}
+    }
+
+
+async def _generate_intro(context: Dict[str, Any]) -> Dict[str, Any]:
+    response = await shared_state.groq_service.get_interview_response(context)
+    if response["status"] != "success" or response.get("degraded"):
+        return response
+
+    try:
+        await shared_state.repository.store_pregenerated_intro(context["interview_id"], {
+            "candidate_name": context.get("candidate_name"),
+            "role": context.get("role"),
+            "experience_level": context.get("experience_level"),
+            "response": response["data"]
+        })
+    except Exception as e:
+        logger.error("Failed to store interview introduction", error=str(e))
+    return response
+
+
+async def get_intro_response(context: Dict[str, Any], stored: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Return the interview introduction for a start context.
+
+    Uses the stored introduction when it still matches, joins a pre-generation that is
+    already running for the same inputs, and otherwise generates (and stores) a new one.
+    """
+    response = get_stored_intro(context, stored)
+    if response:
+        return response
+    return await intro_flight.do(intro_key(context), lambda: _generate_intro(context))
+
+
+async def pregenerate_intro(interview_id: str, role: Optional[str] = None, experience_level: Optional[str] = None):
+    """
+    Generate and store the introduction for an interview in the background.
+
+    Role and experience level fall back to the values stored on the interview, then to
+    a role inferred from the candidate's skills and DEFAULT_EXPERIENCE_LEVEL. Nothing is
+    generated without a real candidate name, since the introduction addresses them.
+    """
+    try:
+        interview = await shared_state.repository.get_view(
+            interview_id,
+            {"_id": 0, "candidate_name": 1, "technical_skills": 1, "role": 1, "experience_level": 1, "pregenerated_intro": 1}
+        )
+        if not interview:
+            return
+
+        candidate_name = (interview.get("candidate_name") or "").strip()
+        if not candidate_name or candidate_name == "Anonymous":
+            return
+
+        technical_skills = interview.get("technical_skills", [])
+        context = {
+            "interview_id": str(interview_id),
+            "role": role or interview.get("role") or infer_role(technical_skills),
+            "experience_level": experience_level or interview.get("experience_level") or DEFAULT_EXPERIENCE_LEVEL,
+            "candidate_name": candidate_name,
+            "technical_skills": technical_skills,
+            "is_start": True
+        }
+        if get_stored_intro(context, interview.get("pregenerated_intro")):
+            return
+
+        await intro_flight.do(intro_key(context), lambda: _generate_intro(context))
+    except Exception as e:
+        logger.error("Failed to pregenerate interview introduction", error=str(e))
@@ -0,0 +1,199 @@
+"""
+Tolerant parsing of JSON objects returned by LLMs.
+
+Models asked for JSON still wrap it in markdown fences, add a sentence before or after
+it, leave trailing commas, write Python literals or stop mid-object when they hit the
+token limit. `parse_json_object` tries a plain `json.loads` first and only falls back to
+extracting and repairing the first JSON object when that fails, so well-formed output
+pays no extra cost. Results can be validated against a pydantic model, whose validator
+is compiled once per model class.
+"""
+from typing import Any, Dict, List, Optional, Type
+import json
+import re
+
+from pydantic import BaseModel, ValidationError
+
+# Ask Groq for JSON mode on calls that must return a JSON object
+JSON_OBJECT_FORMAT = {"type": "json_object"}
+
+_FENCE = re.compile(r"```(?:json|JSON)?\s*(.*?)(?:```|$)", re.DOTALL)
+_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+_stats = {"parsed": 0, "extracted": 0, "repaired": 0, "invalid": 0, "failed": 0}
+
+
+class LLMJSONError(ValueError):
+    """Raised when an LLM response cannot be turned into the expected JSON object."""
+
+    def __init__(self, message: str, raw: str = ""):
+        super().__init__(message)
+        self.raw = raw
+
+
+def strip_fences(text: str) -> str:
+    """Return the contents of the first markdown code fence, or the text unchanged."""
+    match = _FENCE.search(text)
+    return match.group(1).strip() if match else text.strip()
+
+
+def extract_json_object(text: str) -> Optional[str]:
+    """
+    Return the first top-level {...} object in text.
+
+    Braces inside strings are ignored. If the object is never closed (a truncated
+    response), everything from the opening brace on is returned for repair.
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for index in range(start, len(text)):
+        ch = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:index + 1]
+    return text[start:]
+
+
+def _drop_trailing_comma(out: List[str]):
+    index = len(out) - 1
+    while index >= 0 and out[index].isspace():
+        index -= 1
+    if index >= 0 and out[index] == ",":
+        del out[index]
+
+
+def repair_json(text: str) -> str:
+    """
+    Fix common LLM JSON defects in a single pass.
+
+    Handles trailing commas, // comments, Python True/False/None, raw newlines inside
+    strings and unterminated strings, arrays or objects.
+    """
+    out: List[str] = []
+    closers: List[str] = []
+    in_string = False
+    escaped = False
+    index = 0
+    length = len(text)
+
+    while index < length:
+        ch = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            elif ch == "\n":
+                ch = "\\n"
+            out.append(ch)
+            index += 1
+            continue
+
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            closers.append("}" if ch == "{" else "]")
+        elif ch in "}]":
+            _drop_trailing_comma(out)
+            if closers:
+                closers.pop()
+        elif ch == "/" and text.startswith("//", index):
+            newline = text.find("\n", index)
+            index = length if newline < 0 else newline
+            continue
+        elif ch.isalpha():
+            end = index
+            while end < length and (text[end].isalnum() or text[end] == "_"):
+                end += 1
+            word = text[index:end]
+            out.append(_LITERALS.get(word, word))
+            index = end
+            continue
+        out.append(ch)
+        index += 1
+
+    if in_string:
+        out.append('"')
+    _drop_trailing_comma(out)
+    out.extend(reversed(closers))
+    return "".join(out)
+
+
+def parse_json_object(text: str, model: Optional[Type[BaseModel]] = None) -> Dict[str, Any]:
+    """
+    Parse the JSON object in an LLM response.
+
+    Args:
+        text: Raw response text
+        model: Optional pydantic model the object must satisfy
+
+    Returns:
+        The parsed object; when a model is given, its validated and coerced dump
+
+    Raises:
+        LLMJSONError: If no JSON object can be recovered or validation fails
+    """
+    data = _load_object(text or "")
+    if model is None:
+        return data
+
+    try:
+        return model.model_validate(data).model_dump()
+    except ValidationError as e:
+        _stats["invalid"] += 1
+        raise LLMJSONError(f"LLM response does not match {model.__name__}: {e.error_count()} errors: {e.errors()[0]['msg']}", text)
+
+
+def parser_stats() -> Dict[str, int]:
+    """Return counts of how responses were parsed."""
+    return dict(_stats)
+
+
+def _load_object(text: str) -> Dict[str, Any]:
+    # Fast path: the response is exactly one JSON object
+    try:
+        data = json.loads(text)
+        if isinstance(data, dict):
+            _stats["parsed"] += 1
+            return data
+    except json.JSONDecodeError:
+        pass
+
+    candidate = extract_json_object(strip_fences(text))
+    if candidate is None:
+        _stats["failed"] += 1
+        raise LLMJSONError("No JSON object found in LLM response", text)
+
+    try:
+        data = json.loads(candidate)
+        _stats["extracted"] += 1
+        return data
+    except json.JSONDecodeError:
+        pass
+
+    try:
+        data = json.loads(repair_json(candidate))
+        _stats["repaired"] += 1
+        return data
+    except json.JSONDecodeError as e:
+        _stats["failed"] += 1
+        raise LLMJSONError(f"Invalid JSON in LLM response: {str(e)}", text)
@@ -0,0 +1,188 @@
+"""
+Two-tier cache for deterministic LLM completions.
+"""
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import os
+import time
+
+from app.services.structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class LLMCache:
+    """
+    Caches completion text keyed on a hash of model, messages and sampling parameters.
+
+    The first tier is an in-process LRU bounded by entry count and total bytes, with a
+    per-entry TTL. The optional second tier is a MongoDB collection shared by all
+    workers; entries there expire through a TTL index. Hits in the second tier are
+    promoted into the first.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 16 * 1024 * 1024,
+        ttl_seconds: int = 3600,
+        collection=None,
+        enabled: bool = True
+    ):
+        """
+        Args:
+            max_entries: Maximum number of completions kept in memory
+            max_bytes: Maximum total size of cached completion text in memory
+            ttl_seconds: Lifetime of an entry in both tiers
+            collection: Motor collection for the shared tier, or None to disable it
+            enabled: When False every lookup is a miss and nothing is stored
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.collection = collection
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, value, size)
+        self._bytes = 0
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "memory_hits": 0,
+            "mongo_hits": 0,
+            "stores": 0,
+            "evictions": 0,
+            "bypassed": 0
+        }
+
+    @classmethod
+    def from_env(cls, collection=None) -> "LLMCache":
+        """Build a cache configured from LLM_CACHE_* environment variables."""
+        use_mongo = os.getenv("LLM_CACHE_MONGO", "false").lower() == "true"
+        return cls(
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024")),
+            max_bytes=int(os.getenv("LLM_CACHE_MAX_BYTES", str(16 * 1024 * 1024))),
+            ttl_seconds=int(os.getenv("LLM_CACHE_TTL_SECONDS", "3600")),
+            collection=collection if use_mongo else None,
+            enabled=os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+        )
+
+    async def initialize(self):
+        """Create the TTL index for the shared tier."""
+        if self.collection is not None:
+            await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: Optional[int], **extra: Any) -> str:
+        """Hash the request fields that determine a completion."""
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            **extra
+        }
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def is_cacheable(temperature: float) -> bool:
+        """Only deterministic (temperature 0) completions are safe to reuse."""
+        return temperature == 0
+
+    def record_bypass(self):
+        """Count a lookup skipped by the caller."""
+        self._stats["bypassed"] += 1
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return a cached completion, checking memory first and then MongoDB."""
+        if not self.enabled:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value, size = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                self._stats["memory_hits"] += 1
+                return value
+            self._remove(key)
+
+        if self.collection is not None:
+            try:
+                doc = await self.collection.find_one(
+                    {"_id": key, "expires_at": {"$gt": datetime.utcnow()}},
+                    {"value": 1}
+                )
+            except Exception as e:
+                logger.error("LLM cache lookup failed", error=str(e))
+                doc = None
+            if doc is not None:
+                self._store_memory(key, doc["value"])
+                self._stats["hits"] += 1
+                self._stats["mongo_hits"] += 1
+                return doc["value"]
+
+        self._stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: str):
+        """Store a completion in both tiers."""
+        if not self.enabled or value is None:
+            return
+
+        self._store_memory(key, value)
+        self._stats["stores"] += 1
+
+        if self.collection is not None:
+            try:
+                await self.collection.update_one(
+                    {"_id": key},
+                    {"$set": {
+                        "value": value,
+                        "created_at": datetime.utcnow(),
+                        "expires_at": datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+                    }},
+                    upsert=True
+                )
+            except Exception as e:
+                logger.error("LLM cache store failed", error=str(e))
+
+    def clear(self):
+        """Drop all in-memory entries."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current memory usage."""
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "mongo_tier": self.collection is not None
+        }
+
+    def _store_memory(self, key: str, value: str):
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value, size)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._stats["evictions"] += 1
+
+    def _remove(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
@@ -0,0 +1,212 @@
+"""
+Per-call instrumentation of LLM requests.
+"""
+from collections import defaultdict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set
+import asyncio
+import os
+import time
+
+from app.services.structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class LLMCallMetrics:
+    """
+    Measurements for one logical LLM call, filled in as the call progresses.
+
+    A logical call covers every attempt and hedge made for it; `retries` counts the
+    attempts after the first. Calls answered from the response cache or by joining an
+    identical in-flight request are recorded with outcome "cache_hit" / "coalesced"
+    and no tokens, so token totals count each API call exactly once.
+    """
+
+    def __init__(self, call_site: str, model: str, interview_id: Optional[str] = None):
+        self.call_site = call_site
+        self.model = model
+        self.interview_id = str(interview_id) if interview_id else None
+        self.started = time.monotonic()
+        self.wall_seconds = 0.0
+        self.queue_seconds = 0.0
+        self.retries = 0
+        self.status_code: Optional[int] = None
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.outcome = "success"
+        self.error: Optional[str] = None
+
+    def add_usage(self, usage: Optional[Dict[str, Any]]):
+        """Take token counts from an OpenAI-style `usage` object."""
+        if not usage:
+            return
+        self.prompt_tokens += int(usage.get("prompt_tokens") or usage.get("input_tokens") or 0)
+        self.completion_tokens += int(usage.get("completion_tokens") or usage.get("output_tokens") or 0)
+
+    def attempt(self) -> "LLMCallMetrics":
+        """Separate metrics for one of several concurrent attempts; see `merge`."""
+        return LLMCallMetrics(self.call_site, self.model, self.interview_id)
+
+    def merge(self, attempt: "LLMCallMetrics"):
+        """Take the queue time, status and tokens of the attempt that counts for this call."""
+        self.queue_seconds += attempt.queue_seconds
+        if attempt.status_code is not None:
+            self.status_code = attempt.status_code
+        self.prompt_tokens += attempt.prompt_tokens
+        self.completion_tokens += attempt.completion_tokens
+
+    def fail(self, error: BaseException):
+        """Mark the call as failed, or as cancelled when the caller went away."""
+        self.outcome = "cancelled" if isinstance(error, (asyncio.CancelledError, GeneratorExit)) else "error"
+        self.error = type(error).__name__
+
+    def finish(self):
+        """Freeze the wall time."""
+        self.wall_seconds = time.monotonic() - self.started
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "call_site": self.call_site,
+            "model": self.model,
+            "interview_id": self.interview_id,
+            "outcome": self.outcome,
+            "error": self.error,
+            "status_code": self.status_code,
+            "retries": self.retries,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "queue_seconds": round(self.queue_seconds, 4),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens
+        }
+
+
+class _CallSiteStats:
+    def __init__(self, window: int):
+        self.calls = 0
+        self.outcomes: Dict[str, int] = defaultdict(int)
+        self.status_codes: Dict[str, int] = defaultdict(int)
+        self.models: Dict[str, int] = defaultdict(int)
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.wall_seconds = 0.0
+        self.queue_seconds = 0.0
+        self.latencies: Deque[float] = deque(maxlen=window)
+
+
+class LLMMetricsRegistry:
+    """
+    In-process aggregates of LLM call metrics by call site.
+
+    When a persist callback is configured, calls tagged with an interview_id are also
+    handed to it (in the background) so per-interview totals can be stored.
+    """
+
+    def __init__(
+        self,
+        window: int = 500,
+        prompt_cost_per_million: float = 0.0,
+        completion_cost_per_million: float = 0.0,
+        persist: Optional[Callable[[LLMCallMetrics], Awaitable[None]]] = None
+    ):
+        """
+        Args:
+            window: Recent latencies kept per call site for percentiles
+            prompt_cost_per_million: USD per million prompt tokens, for cost estimates
+            completion_cost_per_million: USD per million completion tokens
+            persist: Coroutine function storing per-interview totals
+        """
+        self.window = window
+        self.prompt_cost_per_million = prompt_cost_per_million
+        self.completion_cost_per_million = completion_cost_per_million
+        self.persist = persist
+        self._sites: Dict[str, _CallSiteStats] = {}
+        self._pending: Set[asyncio.Task] = set()
+        self._persist_errors = 0
+
+    @classmethod
+    def from_env(cls, persist: Optional[Callable[[LLMCallMetrics], Awaitable[None]]] = None) -> "LLMMetricsRegistry":
+        """Build a registry configured from LLM_METRICS_* environment variables."""
+        persist_enabled = os.getenv("LLM_METRICS_PERSIST", "true").lower() == "true"
+        return cls(
+            window=int(os.getenv("LLM_METRICS_WINDOW", "500")),
+            prompt_cost_per_million=float(os.getenv("LLM_METRICS_PROMPT_COST_PER_MILLION", "0")),
+            completion_cost_per_million=float(os.getenv("LLM_METRICS_COMPLETION_COST_PER_MILLION", "0")),
+            persist=persist if persist_enabled else None
+        )
+
+    def start(self, call_site: str, model: str, interview_id: Optional[str] = None) -> LLMCallMetrics:
+        """Begin measuring a call."""
+        return LLMCallMetrics(call_site, model, interview_id)
+
+    def record(self, call: LLMCallMetrics):
+        """Add a finished call to the aggregates."""
+        call.finish()
+        site = self._sites.get(call.call_site)
+        if site is None:
+            site = self._sites[call.call_site] = _CallSiteStats(self.window)
+
+        site.calls += 1
+        site.outcomes[call.outcome] += 1
+        site.models[call.model] += 1
+        if call.status_code is not None:
+            site.status_codes[str(call.status_code)] += 1
+        site.retries += call.retries
+        site.prompt_tokens += call.prompt_tokens
+        site.completion_tokens += call.completion_tokens
+        site.wall_seconds += call.wall_seconds
+        site.queue_seconds += call.queue_seconds
+        site.latencies.append(call.wall_seconds)
+
+        if self.persist is not None and call.interview_id:
+            task = asyncio.ensure_future(self._persist(call))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    def estimate_cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        """Estimated USD cost of the given token counts."""
+        return (
+            prompt_tokens * self.prompt_cost_per_million
+            + completion_tokens * self.completion_cost_per_million
+        ) / 1_000_000
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per call site aggregates and overall totals."""
+        call_sites = {name: self._site_stats(site) for name, site in sorted(self._sites.items())}
+        totals = {
+            key: sum(site[key] for site in call_sites.values())
+            for key in ("calls", "retries", "prompt_tokens", "completion_tokens")
+        }
+        totals["estimated_cost_usd"] = round(self.estimate_cost(totals["prompt_tokens"], totals["completion_tokens"]), 6)
+        totals["persist_errors"] = self._persist_errors
+        return {"call_sites": call_sites, "totals": totals}
+
+    def _site_stats(self, site: _CallSiteStats) -> Dict[str, Any]:
+        ordered = sorted(site.latencies)
+
+        def percentile(p: float) -> Optional[float]:
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))], 4)
+
+        return {
+            "calls": site.calls,
+            "outcomes": dict(site.outcomes),
+            "status_codes": dict(site.status_codes),
+            "models": dict(site.models),
+            "retries": site.retries,
+            "prompt_tokens": site.prompt_tokens,
+            "completion_tokens": site.completion_tokens,
+            "estimated_cost_usd": round(self.estimate_cost(site.prompt_tokens, site.completion_tokens), 6),
+            "mean_wall_seconds": round(site.wall_seconds / site.calls, 4) if site.calls else None,
+            "mean_queue_seconds": round(site.queue_seconds / site.calls, 4) if site.calls else None,
+            "p50_wall_seconds": percentile(50),
+            "p95_wall_seconds": percentile(95)
+        }
+
+    async def _persist(self, call: LLMCallMetrics):
+        try:
+            await self.persist(call)
+        except Exception as e:
+            self._persist_errors += 1
+            logger.error("Failed to persist LLM usage", error=str(e))
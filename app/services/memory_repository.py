@@ -0,0 +1,482 @@
+"""
+In-process interview storage with the semantics of MongoDBService.
+
+Documents live in a dict keyed by interview_id and are deep-copied on every read and
+write, as a round trip through MongoDB would. Projections and filters are evaluated
+with the MongoDB operators the application uses. Selected with STORAGE_BACKEND=memory
+to run the app, or benchmarks of the full request path, without a database; nothing is
+persisted and each process has its own data. Archived interviews are kept compressed
+in a second dict, as in the interview_archive collection.
+"""
+from datetime import datetime
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
+from uuid import UUID, uuid4
+import copy
+
+from app.services.document_paths import MISSING, get_path, inc_path, matches, project, set_path
+from app.services.interview_archive import ARCHIVABLE_STATUSES, archive_record, archived_document
+from app.services.repository import (
+    ANALYSIS_VIEW_PROJECTION,
+    PDF_REPORT,
+    PROMPT_WINDOW,
+    RESUME_TEXT,
+    STATUS_VIEW_PROJECTION,
+    SUMMARY_EXCLUDE_PROJECTION,
+    InterviewNotActiveError,
+    InterviewRepository,
+    prompt_projection,
+)
+from app.services.status_events import STATUS_EVENT_PROJECTION
+from app.services.structured_logging import get_logger, payload
+
+logger = get_logger(__name__)
+
+# Chunk size of artifact reads, matching the GridFS default
+ARTIFACT_CHUNK_SIZE = 255 * 1024
+
+
+class _ArtifactStream:
+    """Download stream with the attributes callers use on a GridFS GridOut"""
+
+    def __init__(self, file_id: str, filename: str, data: bytes, metadata: Dict[str, Any]):
+        self._id = file_id
+        self.filename = filename
+        self.length = len(data)
+        self.metadata = metadata
+        self._data = data
+        self._position = 0
+
+    async def read(self) -> bytes:
+        data = self._data[self._position:]
+        self._position = self.length
+        return data
+
+    async def readchunk(self) -> bytes:
+        chunk = self._data[self._position:self._position + ARTIFACT_CHUNK_SIZE]
+        self._position += len(chunk)
+        return chunk
+
+
+class InMemoryInterviewRepository(InterviewRepository):
+    """InterviewRepository backed by process memory"""
+
+    def __init__(self):
+        self._interviews: Dict[str, Dict[str, Any]] = {}
+        self._artifacts: Dict[str, Dict[str, Any]] = {}
+        self._archive: Dict[str, Dict[str, Any]] = {}
+
+    async def initialize(self, mongo_uri: Optional[str] = None):
+        logger.info("Using in-memory interview storage; data is not persisted")
+
+    async def check_connection(self) -> bool:
+        return True
+
+    async def close(self):
+        pass
+
+    def _update(self, interview_id: str, apply: Callable[[Dict[str, Any]], None], restore: bool = False) -> bool:
+        """
+        Apply a change to one interview, like update_one; False if it does not exist.
+        With `restore`, an archived interview is moved back first, as the analysis and
+        report writes of MongoDBService do.
+        """
+        document = self._interviews.get(str(interview_id))
+        if document is None and restore and self._restore(str(interview_id)):
+            document = self._interviews[str(interview_id)]
+        if document is None:
+            return False
+        apply(document)
+        return True
+
+    def _restore(self, interview_id: str) -> bool:
+        record = self._archive.pop(interview_id, None)
+        if record is None:
+            return False
+        self._interviews.setdefault(interview_id, archived_document(record))
+        return True
+
+    def _insert(self, document: Dict[str, Any]):
+        document = copy.deepcopy(document)
+        document.setdefault("_id", uuid4().hex)
+        self._interviews[document["interview_id"]] = document
+
+    # Interview documents
+
+    async def create_interview(self, interview_data: Dict[str, Any]) -> str:
+        interview_id = str(uuid4())
+        logger.debug("Creating new interview", data=payload(interview_data))
+        self._insert({
+            "interview_id": interview_id,
+            "timestamp": datetime.utcnow(),
+            "role": interview_data["role"],
+            "experience_level": interview_data["experience_level"],
+            "candidate_name": interview_data.get("candidate_name", "Anonymous"),
+            "skills": interview_data.get("skills", {}),
+            "status": "in_progress",
+            "conversation_history": [],
+            "technical_assessment": {},
+            "interview_type": "ai_technical",
+            "metadata": {
+                "created_at": datetime.utcnow(),
+                "last_updated": datetime.utcnow()
+            }
+        })
+        return interview_id
+
+    async def store_resume_data(self, interview_id: UUID, data: Dict[str, Any]):
+        candidate_name = data.get("candidate_name", "").strip()
+        if not candidate_name:
+            raise ValueError("Candidate name is required")
+
+        interview_data = {
+            "interview_id": str(interview_id),
+            "technical_skills": data.get("technical_skills", []),
+            "candidate_name": candidate_name,
+            "timestamp": datetime.utcnow(),
+            "status": "initialized",
+            "skills": {},
+            "conversation_history": [],
+            "technical_assessment": {},
+            "metadata": {
+                "created_at": datetime.utcnow(),
+                "last_updated": datetime.utcnow()
+            }
+        }
+
+        existing = self._interviews.get(str(interview_id))
+        if existing is not None:
+            existing.update(copy.deepcopy(interview_data))
+        else:
+            self._insert(interview_data)
+
+        resume_text = data.get("resume_text", "")
+        if resume_text:
+            await self.store_artifact(
+                interview_id, RESUME_TEXT, resume_text.encode("utf-8"),
+                filename=f"resume_{interview_id}.txt", content_type="text/plain; charset=utf-8"
+            )
+        return str(interview_id)
+
+    async def update_interview_details(self, interview_id: str, data: Dict[str, Any]):
+        status = data.pop("status", "active") if isinstance(data, dict) else "active"
+        existing = self._interviews.get(str(interview_id))
+        if existing and existing.get("candidate_name"):
+            data["candidate_name"] = existing["candidate_name"]
+
+        def apply(document):
+            for path, value in copy.deepcopy(data).items():
+                set_path(document, path, value)
+            document["status"] = status
+            set_path(document, "metadata.last_updated", datetime.utcnow())
+        self._update(interview_id, apply)
+
+    async def update_interview_session_skills(self, interview_id: str, skills: Dict[str, float], status: Optional[str] = None):
+        def apply(document):
+            document["skills"] = copy.deepcopy(skills)
+            set_path(document, "metadata.last_updated", datetime.utcnow())
+            if status:
+                document["status"] = status
+        self._update(interview_id, apply)
+        return True
+
+    async def update_technical_assessment(self, interview_id: str, assessment: Dict[str, Any]):
+        def apply(document):
+            document["technical_assessment"] = copy.deepcopy(assessment)
+            set_path(document, "metadata.last_updated", datetime.utcnow())
+        self._update(interview_id, apply, restore=True)
+
+    async def store_analysis(self, interview_id: str, analysis_data: Dict[str, Any]):
+        def apply(document):
+            document["technical_assessment"] = copy.deepcopy(analysis_data)
+            document["status"] = "analyzed"
+            document["analysis_status"] = "completed"
+            set_path(document, "metadata.last_updated", datetime.utcnow())
+        self._update(interview_id, apply, restore=True)
+
+    async def store_analysis_report(self, interview_id: str, report: Dict[str, Any]):
+        def apply(document):
+            for path, value in copy.deepcopy(report).items():
+                set_path(document, path, value)
+            document["analysis_status"] = "completed"
+        if not self._update(interview_id, apply, restore=True):
+            # Upsert, as in MongoDB
+            document = {"interview_id": str(interview_id)}
+            apply(document)
+            self._insert(document)
+
+    async def mark_analysis_queued(self, interview_id: str, reason: str):
+        def apply(document):
+            document["analysis_status"] = "queued"
+            document["analysis_queued"] = {"reason": reason, "queued_at": datetime.utcnow()}
+            set_path(document, "metadata.last_updated", datetime.utcnow())
+        self._update(interview_id, apply, restore=True)
+
+    async def store_current_question(self, interview_id: str, question: str, skill_assessed: str = "general"):
+        def apply(document):
+            document["current_question"] = {
+                "question": question,
+                "skill_assessed": skill_assessed,
+                "timestamp": datetime.utcnow()
+            }
+            set_path(document, "metadata.last_updated", datetime.utcnow())
+        self._update(interview_id, apply)
+
+    async def store_pregenerated_intro(self, interview_id: str, intro: Dict[str, Any]):
+        def apply(document):
+            document["pregenerated_intro"] = {**copy.deepcopy(intro), "created_at": datetime.utcnow()}
+        self._update(interview_id, apply)
+
+    async def record_llm_usage(self, interview_id: str, usage: Dict[str, Any]):
+        site = f"llm_usage.by_call_site.{usage['call_site']}"
+        increments = {
+            "llm_usage.calls": 1,
+            "llm_usage.errors": 1 if usage["outcome"] == "error" else 0,
+            "llm_usage.retries": usage["retries"],
+            "llm_usage.prompt_tokens": usage["prompt_tokens"],
+            "llm_usage.completion_tokens": usage["completion_tokens"],
+            "llm_usage.wall_seconds": usage["wall_seconds"],
+            "llm_usage.queue_seconds": usage["queue_seconds"],
+            f"{site}.calls": 1,
+            f"{site}.prompt_tokens": usage["prompt_tokens"],
+            f"{site}.completion_tokens": usage["completion_tokens"],
+            f"{site}.wall_seconds": usage["wall_seconds"]
+        }
+
+        def apply(document):
+            for path, amount in increments.items():
+                inc_path(document, path, amount)
+        # Like MongoDBService, archived interviews are not moved back for usage totals
+        self._update(interview_id, apply)
+
+    async def update_conversation_summary(self, interview_id: str, summary: Dict[str, Any]) -> bool:
+        document = self._interviews.get(str(interview_id))
+        if document is None:
+            return False
+        stored = document.get("conversation_summary")
+        if stored is not None and not stored.get("turns_summarized", 0) < summary["turns_summarized"]:
+            return False
+        document["conversation_summary"] = copy.deepcopy(summary)
+        set_path(document, "metadata.last_updated", datetime.utcnow())
+        return True
+
+    # Reads
+
+    async def get_view(self, interview_id: str, projection: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        document = self._interviews.get(str(interview_id))
+        if document is None:
+            record = self._archive.get(str(interview_id))
+            document = None if record is None else archived_document(record)
+        return None if document is None else project(document, projection)
+
+    async def get_interview_session(self, interview_id: str, projection: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return await self.get_view(interview_id, projection or SUMMARY_EXCLUDE_PROJECTION)
+
+    async def get_analysis_view(self, interview_id: str) -> Optional[Dict[str, Any]]:
+        return await self.get_view(interview_id, ANALYSIS_VIEW_PROJECTION)
+
+    async def get_prompt_view(self, interview_id: str, last_n: int = PROMPT_WINDOW) -> Optional[Dict[str, Any]]:
+        return await self.get_view(interview_id, prompt_projection(last_n))
+
+    async def iter_interview_ids(self, filter: Dict[str, Any], limit: Optional[int] = None) -> AsyncIterator[str]:
+        matched = [doc["interview_id"] for doc in self._interviews.values() if matches(doc, filter)]
+        for interview_id in matched[:limit] if limit else matched:
+            yield interview_id
+
+    async def list_interviews(self, limit: int = 10) -> List[Dict]:
+        def created_at(document):
+            value = get_path(document, "metadata.created_at")
+            return datetime.min if value is MISSING or value is None else value
+
+        newest = sorted(self._interviews.values(), key=created_at, reverse=True)
+        return [project(doc, STATUS_VIEW_PROJECTION) for doc in newest[:limit]]
+
+    # Conversation turns
+
+    @staticmethod
+    def _push(document: Dict[str, Any], turn: Dict[str, Any]):
+        document.setdefault("conversation_history", []).append(copy.deepcopy(turn))
+        set_path(document, "metadata.last_updated", datetime.utcnow())
+
+    async def submit_turn(
+        self,
+        interview_id: str,
+        interaction: Optional[Dict[str, Any]] = None,
+        active_statuses: Tuple[str, ...] = ("active", "in_progress"),
+        last_n: int = PROMPT_WINDOW
+    ) -> Optional[Dict[str, Any]]:
+        if interaction is not None and "question" not in interaction:
+            raise ValueError("Interaction must include a question")
+
+        document = self._interviews.get(str(interview_id))
+        if document is None:
+            archived = await self.get_view(interview_id, {"_id": 0, "status": 1})
+            if archived is None:
+                return None
+            raise InterviewNotActiveError(str(interview_id), archived.get("status"))
+        if document.get("status") not in active_statuses:
+            raise InterviewNotActiveError(str(interview_id), document.get("status"))
+
+        if interaction is not None:
+            interaction.setdefault("timestamp", datetime.utcnow())
+            self._push(document, interaction)
+        return project(document, prompt_projection(last_n))
+
+    async def initialize_conversation(self, interview_id: str, first_question: Dict[str, Any]):
+        def apply(document):
+            document["conversation_history"] = [{
+                "question": first_question["question"],
+                "answer": "",
+                "skill_assessed": first_question.get("skill_assessed", "general"),
+                "technical_depth": first_question.get("technical_depth", "basic"),
+                "timestamp": datetime.utcnow()
+            }]
+            set_path(document, "metadata.last_updated", datetime.utcnow())
+        self._update(interview_id, apply)
+
+    async def update_interview(self, interview_id: str, interaction: Dict[str, Any]):
+        turn = {
+            "question": interaction["question"],
+            "answer": interaction.get("answer", ""),
+            "skill_assessed": interaction.get("skill_assessed", "general"),
+            "technical_depth": interaction.get("technical_depth", "basic"),
+            "timestamp": datetime.utcnow()
+        }
+        self._update(interview_id, lambda document: self._push(document, turn))
+
+    async def add_to_history(self, interview_id: str, interaction: Dict[str, Any]):
+        if "question" not in interaction:
+            raise ValueError("Interaction must include a question")
+        if "timestamp" not in interaction:
+            interaction["timestamp"] = datetime.utcnow()
+        self._update(interview_id, lambda document: self._push(document, interaction))
+
+    async def update_last_answer(self, interview_id: str, answer: str):
+        document = self._interviews.get(str(interview_id))
+        if not document or "conversation_history" not in document:
+            raise ValueError("No conversation history found")
+        if not document["conversation_history"]:
+            raise ValueError("Empty conversation history")
+
+        # conversation_history.$[last].answer with array_filters [{"last.answer": ""}]
+        # sets every turn whose answer is empty, not only the last one
+        for turn in document["conversation_history"]:
+            if turn.get("answer") == "":
+                turn["answer"] = answer
+        set_path(document, "metadata.last_updated", datetime.utcnow())
+
+    async def update_interview_session(self, interview_id: str, conversation_history: List[Dict[str, Any]] = None) -> bool:
+        def apply(document):
+            if conversation_history is not None:
+                document["conversation_history"] = copy.deepcopy(conversation_history)
+            set_path(document, "metadata.last_updated", datetime.utcnow())
+        return self._update(interview_id, apply)
+
+    async def get_last_turns(self, interview_id: str, last_n: int = PROMPT_WINDOW) -> List[Dict[str, Any]]:
+        interview = await self.get_view(interview_id, {"_id": 0, "conversation_history": {"$slice": -max(1, last_n)}})
+        return (interview or {}).get("conversation_history", [])
+
+    async def iter_turns(self, interview_id: str) -> AsyncIterator[Dict[str, Any]]:
+        interview = await self.get_view(interview_id, {"_id": 0, "conversation_history": 1})
+        for turn in (interview or {}).get("conversation_history", []):
+            yield turn
+
+    # Artifacts
+
+    async def store_artifact(
+        self,
+        interview_id: str,
+        kind: str,
+        data: Union[bytes, BinaryIO],
+        filename: str,
+        content_type: str
+    ) -> str:
+        document = self._interviews.get(str(interview_id))
+        if document is None and self._restore(str(interview_id)):
+            document = self._interviews[str(interview_id)]
+        if document is None:
+            raise ValueError(f"Interview not found: {interview_id}")
+
+        file_id = uuid4().hex
+        self._artifacts[file_id] = {
+            "filename": filename,
+            "data": bytes(data) if isinstance(data, (bytes, bytearray)) else data.read(),
+            "metadata": {"interview_id": str(interview_id), "kind": kind, "content_type": content_type}
+        }
+        old_ref = (document.get("artifacts") or {}).get(kind)
+        set_path(document, f"artifacts.{kind}", {
+            "file_id": file_id,
+            "filename": filename,
+            "content_type": content_type,
+            "created_at": datetime.utcnow()
+        })
+        set_path(document, "metadata.last_updated", datetime.utcnow())
+        document.pop(kind, None)
+        if old_ref:
+            self._artifacts.pop(old_ref["file_id"], None)
+        return file_id
+
+    async def open_artifact(self, interview_id: str, kind: str):
+        document = await self.get_view(interview_id, {"_id": 0, f"artifacts.{kind}": 1}) or {}
+        ref = (document.get("artifacts") or {}).get(kind)
+        artifact = self._artifacts.get(ref["file_id"]) if ref else None
+        if artifact is None:
+            return None
+        return _ArtifactStream(ref["file_id"], artifact["filename"], artifact["data"], dict(artifact["metadata"]))
+
+    async def get_resume_text(self, interview_id: str) -> str:
+        grid_out = await self.open_artifact(interview_id, RESUME_TEXT)
+        if grid_out is not None:
+            return (await grid_out.read()).decode("utf-8")
+        interview = await self.get_view(interview_id, {"_id": 0, RESUME_TEXT: 1})
+        return (interview or {}).get(RESUME_TEXT, "")
+
+    async def store_pdf_report(
+        self,
+        interview_id: str,
+        pdf_data: Union[bytes, BinaryIO],
+        filename: Optional[str] = None,
+        analysis_data: Optional[Dict[str, Any]] = None
+    ) -> str:
+        file_id = await self.store_artifact(
+            interview_id, PDF_REPORT, pdf_data,
+            filename=filename or f"report_{interview_id}.pdf", content_type="application/pdf"
+        )
+
+        def apply(document):
+            document["status"] = "report_generated"
+            if analysis_data is not None:
+                document["analysis_data"] = copy.deepcopy(analysis_data)
+        self._update(interview_id, apply, restore=True)
+        return file_id
+
+    # Archive
+
+    async def archive_interviews(
+        self,
+        older_than: datetime,
+        statuses: Tuple[str, ...] = ARCHIVABLE_STATUSES,
+        limit: int = 100
+    ) -> Dict[str, int]:
+        counts = {"archived": 0, "skipped": 0, "raw_bytes": 0, "stored_bytes": 0}
+        due = [
+            interview_id for interview_id, document in self._interviews.items()
+            if matches(document, {"status": {"$in": list(statuses)}, "metadata.last_updated": {"$lt": older_than}})
+        ]
+        for interview_id in due[:limit]:
+            record = archive_record(self._interviews.pop(interview_id))
+            self._archive[interview_id] = record
+            counts["archived"] += 1
+            counts["raw_bytes"] += record["raw_bytes"]
+            counts["stored_bytes"] += len(record["payload"])
+        return counts
+
+    async def restore_interview(self, interview_id: str) -> bool:
+        return self._restore(str(interview_id))
+
+    # Status events
+
+    async def iter_status_events(self, interview_ids: List[str]) -> AsyncIterator[Dict[str, Any]]:
+        for interview_id in interview_ids:
+            document = self._interviews.get(interview_id)
+            if document is not None:
+                yield project(document, STATUS_EVENT_PROJECTION)
@@ -0,0 +1,131 @@
+"""
+Declarative index registry for the ai_interviews, interview_turns and interview_archive collections.
+
+Every query shape MongoDBService issues is listed in QUERY_SHAPES next to the index
+that serves it in INTERVIEW_INDEXES, TURN_INDEXES or ARCHIVE_INDEXES. `ensure_indexes` applies the registry at startup:
+missing indexes are created, matching ones are left alone and indexes whose options
+changed are reported rather than silently rebuilt. `python -m benchmarks.explain_plans`
+runs explain() on every query shape and fails if any of them scans the collection.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from app.services.structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class IndexSpec:
+    """One index: its key pattern, a stable name and creation options."""
+
+    def __init__(self, name: str, keys: List[Tuple[str, int]], **options: Any):
+        """
+        Args:
+            name: Index name, used to detect existing indexes
+            keys: Key pattern as (field, direction) pairs
+            **options: create_index options such as unique or partialFilterExpression
+        """
+        self.name = name
+        self.keys = keys
+        self.options = options
+
+    def model(self) -> IndexModel:
+        return IndexModel(self.keys, name=self.name, **self.options)
+
+    def matches(self, info: Dict[str, Any]) -> bool:
+        """True if an entry of index_information() has the same keys and options."""
+        if [(field, int(direction)) for field, direction in info.get("key", [])] != list(self.keys):
+            return False
+        return all(info.get(option) == value for option, value in self.options.items())
+
+
+INTERVIEW_INDEXES = [
+    # Every per-interview read and write filters on interview_id
+    IndexSpec("interview_id_unique", [("interview_id", ASCENDING)], unique=True),
+    # list_interviews sorts newest first
+    IndexSpec("created_at", [("metadata.created_at", DESCENDING)]),
+    # Cohort filters and maintenance jobs select by status, oldest activity first
+    IndexSpec("status_last_updated", [("status", ASCENDING), ("metadata.last_updated", DESCENDING)]),
+]
+
+TURN_INDEXES = [
+    # One bucket per (interview, bucket number); tail and full reads walk it in either direction
+    IndexSpec("interview_bucket_unique", [("interview_id", ASCENDING), ("bucket", ASCENDING)], unique=True),
+]
+
+ARCHIVE_INDEXES = [
+    # Read-through and restore look archived interviews up by id
+    IndexSpec("interview_id_unique", [("interview_id", ASCENDING)], unique=True),
+]
+
+# Indexes created by earlier releases and superseded by the registry
+OBSOLETE_INDEXES = ["interview_id_1_timestamp_-1"]
+
+# Query shapes used by MongoDBService and the routers, checked by the explain harness.
+# Shapes without a "collection" run against ai_interviews.
+QUERY_SHAPES: List[Dict[str, Any]] = [
+    {"name": "interview_by_id", "filter": {"interview_id": "sample"}},
+    {"name": "active_turn", "filter": {"interview_id": "sample", "status": {"$in": ["active", "in_progress"]}}},
+    {"name": "list_interviews", "filter": {}, "sort": [("metadata.created_at", DESCENDING)], "limit": 10},
+    {"name": "cohort_by_status", "filter": {"status": "completed"}},
+    {"name": "stale_by_status", "filter": {"status": "completed", "metadata.last_updated": {"$lt": "sample"}}},
+    {"name": "archive_due", "filter": {"status": {"$in": ["report_generated", "analyzed"]}, "metadata.last_updated": {"$lt": "sample"}}},
+    {"name": "turn_buckets", "collection": "interview_turns", "filter": {"interview_id": "sample"}, "sort": [("bucket", ASCENDING)]},
+    {"name": "turn_tail", "collection": "interview_turns", "filter": {"interview_id": "sample"}, "sort": [("bucket", DESCENDING)]},
+    {"name": "archived_by_id", "collection": "interview_archive", "filter": {"interview_id": "sample"}},
+]
+
+
+async def ensure_indexes(collection, specs: Optional[List[IndexSpec]] = None, obsolete: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Apply an index registry to a collection. Safe to run on every startup.
+
+    Args:
+        collection: Motor collection
+        specs: Indexes to ensure, INTERVIEW_INDEXES by default
+        obsolete: Index names to drop if present, OBSOLETE_INDEXES by default
+
+    Returns:
+        Report with the names of created, existing, dropped and conflicting indexes
+        and any creation errors
+    """
+    specs = INTERVIEW_INDEXES if specs is None else specs
+    obsolete = OBSOLETE_INDEXES if obsolete is None else obsolete
+    report = {"created": [], "existing": [], "dropped": [], "conflicts": [], "errors": {}}
+
+    existing = await collection.index_information()
+    for spec in specs:
+        info = existing.get(spec.name)
+        if info is None:
+            try:
+                await collection.create_indexes([spec.model()])
+                report["created"].append(spec.name)
+            except OperationFailure as e:
+                # E.g. duplicate interview_ids block the unique index; keep serving
+                report["errors"][spec.name] = str(e)
+                logger.error("Failed to create index", index=spec.name, error=str(e))
+        elif spec.matches(info):
+            report["existing"].append(spec.name)
+        else:
+            report["conflicts"].append(spec.name)
+            logger.error("Index exists with different keys or options; drop it to apply the registry", index=spec.name)
+
+    # Keep the old indexes serving queries until the registry applied cleanly
+    for name in obsolete if not report["errors"] and not report["conflicts"] else []:
+        if name in existing:
+            await collection.drop_index(name)
+            report["dropped"].append(name)
+
+    logger.info("Indexes ensured", **report)
+    return report
+
+
+def has_collection_scan(plan: Any) -> bool:
+    """True if an explain() plan tree contains a COLLSCAN stage."""
+    if isinstance(plan, dict):
+        return plan.get("stage") == "COLLSCAN" or any(has_collection_scan(value) for value in plan.values())
+    if isinstance(plan, list):
+        return any(has_collection_scan(item) for item in plan)
+    return False
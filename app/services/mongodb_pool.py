@@ -0,0 +1,243 @@
+"""
+MongoDB connection pool settings, warmup and pool/command metrics.
+
+When MongoDB latency rises, `MongoPoolMetrics.stats()` (published under /metrics)
+separates time spent waiting for a pooled connection (`checkout_wait_ms`, `waiting`)
+from time the server took to answer (`commands`).
+"""
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional
+import asyncio
+import os
+import threading
+import time
+
+from pymongo import monitoring
+
+from app.services.structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def _percentiles(values, scale: float = 1.0) -> Dict[str, Optional[float]]:
+    ordered = sorted(values)
+
+    def percentile(p: float) -> Optional[float]:
+        if not ordered:
+            return None
+        return round(ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))] * scale, 3)
+
+    return {"p50": percentile(50), "p95": percentile(95), "max": percentile(100)}
+
+
+class MongoPoolSettings:
+    """Client options for pool sizing, timeouts and wire compression."""
+
+    def __init__(
+        self,
+        max_pool_size: int = 100,
+        min_pool_size: int = 0,
+        max_idle_time_ms: Optional[int] = None,
+        wait_queue_timeout_ms: Optional[int] = None,
+        server_selection_timeout_ms: int = 30000,
+        connect_timeout_ms: int = 20000,
+        socket_timeout_ms: Optional[int] = None,
+        compressors: Optional[List[str]] = None,
+        warmup: bool = True
+    ):
+        """
+        Args:
+            max_pool_size: Connections per server before checkouts have to wait
+            min_pool_size: Connections kept open, and opened at startup when warmup is on
+            max_idle_time_ms: Idle connections are closed after this long
+            wait_queue_timeout_ms: Checkouts waiting longer fail instead of queuing forever
+            server_selection_timeout_ms: How long to look for a suitable server
+            connect_timeout_ms: Timeout to open a connection
+            socket_timeout_ms: Timeout of a single network round trip
+            compressors: Wire compression in order of preference, e.g. ["zstd", "snappy"];
+                zstd and snappy need the zstandard / python-snappy packages
+            warmup: Open min_pool_size connections during initialize
+        """
+        self.max_pool_size = max_pool_size
+        self.min_pool_size = min_pool_size
+        self.max_idle_time_ms = max_idle_time_ms
+        self.wait_queue_timeout_ms = wait_queue_timeout_ms
+        self.server_selection_timeout_ms = server_selection_timeout_ms
+        self.connect_timeout_ms = connect_timeout_ms
+        self.socket_timeout_ms = socket_timeout_ms
+        self.compressors = compressors or []
+        self.warmup = warmup
+
+    @classmethod
+    def from_env(cls) -> "MongoPoolSettings":
+        """Build settings from MONGO_* environment variables."""
+        def optional_int(name: str) -> Optional[int]:
+            value = os.getenv(name)
+            return int(value) if value else None
+
+        return cls(
+            max_pool_size=int(os.getenv("MONGO_MAX_POOL_SIZE", "100")),
+            min_pool_size=int(os.getenv("MONGO_MIN_POOL_SIZE", "0")),
+            max_idle_time_ms=optional_int("MONGO_MAX_IDLE_TIME_MS"),
+            wait_queue_timeout_ms=optional_int("MONGO_WAIT_QUEUE_TIMEOUT_MS"),
+            server_selection_timeout_ms=int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "30000")),
+            connect_timeout_ms=int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "20000")),
+            socket_timeout_ms=optional_int("MONGO_SOCKET_TIMEOUT_MS"),
+            compressors=[name.strip() for name in os.getenv("MONGO_COMPRESSORS", "").split(",") if name.strip()],
+            warmup=os.getenv("MONGO_POOL_WARMUP", "true").lower() == "true"
+        )
+
+    def client_options(self) -> Dict[str, Any]:
+        """Keyword arguments for AsyncIOMotorClient; unset options keep driver defaults."""
+        options = {
+            "maxPoolSize": self.max_pool_size,
+            "minPoolSize": self.min_pool_size,
+            "maxIdleTimeMS": self.max_idle_time_ms,
+            "waitQueueTimeoutMS": self.wait_queue_timeout_ms,
+            "serverSelectionTimeoutMS": self.server_selection_timeout_ms,
+            "connectTimeoutMS": self.connect_timeout_ms,
+            "socketTimeoutMS": self.socket_timeout_ms,
+            "compressors": ",".join(self.compressors) or None
+        }
+        return {key: value for key, value in options.items() if value is not None}
+
+
+class MongoPoolMetrics(monitoring.ConnectionPoolListener, monitoring.CommandListener):
+    """
+    Pool and command event listener.
+
+    The driver calls listeners from its worker threads, so counters are guarded by a
+    lock. A checkout starts and completes on the same thread, which is how its wait
+    time is measured.
+    """
+
+    def __init__(self, window: int = 1000):
+        """
+        Args:
+            window: Recent checkout waits and command durations kept for percentiles
+        """
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pools: Dict[str, Dict[str, int]] = defaultdict(lambda: {"open": 0, "in_use": 0, "waiting": 0})
+        self._counters = {"created": 0, "closed": 0, "checkouts": 0, "pool_cleared": 0}
+        self._checkout_failures: Dict[str, int] = defaultdict(int)
+        self._checkout_waits: Deque[float] = deque(maxlen=window)
+        self._commands: Dict[str, Dict[str, Any]] = {}
+        self._window = window
+
+    def _pool(self, event) -> Dict[str, int]:
+        return self._pools["%s:%s" % event.address]
+
+    # Connection pool events
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self._counters["pool_cleared"] += 1
+
+    def pool_closed(self, event):
+        with self._lock:
+            self._pools.pop("%s:%s" % event.address, None)
+
+    def connection_created(self, event):
+        with self._lock:
+            self._counters["created"] += 1
+            self._pool(event)["open"] += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self._counters["closed"] += 1
+            self._pool(event)["open"] -= 1
+
+    def connection_check_out_started(self, event):
+        self._local.checkout_started = time.monotonic()
+        with self._lock:
+            self._pool(event)["waiting"] += 1
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self._pool(event)["waiting"] -= 1
+            self._checkout_failures[str(event.reason)] += 1
+
+    def connection_checked_out(self, event):
+        started = getattr(self._local, "checkout_started", None)
+        with self._lock:
+            pool = self._pool(event)
+            pool["waiting"] -= 1
+            pool["in_use"] += 1
+            self._counters["checkouts"] += 1
+            if started is not None:
+                self._checkout_waits.append(time.monotonic() - started)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self._pool(event)["in_use"] -= 1
+
+    # Command events
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record_command(event.command_name, event.duration_micros, failed=False)
+
+    def failed(self, event):
+        self._record_command(event.command_name, event.duration_micros, failed=True)
+
+    def _record_command(self, name: str, duration_micros: int, failed: bool):
+        with self._lock:
+            command = self._commands.get(name)
+            if command is None:
+                command = self._commands[name] = {"count": 0, "failed": 0, "durations": deque(maxlen=self._window)}
+            command["count"] += 1
+            command["failed"] += failed
+            command["durations"].append(duration_micros)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool gauges, checkout wait percentiles and per-command server time."""
+        with self._lock:
+            pools = {address: dict(pool) for address, pool in self._pools.items()}
+            return {
+                **self._counters,
+                "open": sum(pool["open"] for pool in pools.values()),
+                "in_use": sum(pool["in_use"] for pool in pools.values()),
+                "waiting": sum(pool["waiting"] for pool in pools.values()),
+                "pools": pools,
+                "checkout_failures": dict(self._checkout_failures),
+                "checkout_wait_ms": _percentiles(self._checkout_waits, scale=1000),
+                "commands": {
+                    name: {
+                        "count": command["count"],
+                        "failed": command["failed"],
+                        "duration_ms": _percentiles(command["durations"], scale=0.001)
+                    }
+                    for name, command in sorted(self._commands.items())
+                }
+            }
+
+
+async def warm_pool(client, connections: int):
+    """Open `connections` pooled connections by running that many pings concurrently."""
+    if connections <= 0:
+        return
+    started = time.monotonic()
+    results = await asyncio.gather(
+        *(client.admin.command("ping") for _ in range(connections)),
+        return_exceptions=True
+    )
+    errors = [str(result) for result in results if isinstance(result, Exception)]
+    logger.info(
+        "MongoDB pool warmed",
+        connections=connections,
+        failed=len(errors),
+        seconds=round(time.monotonic() - started, 3),
+        **({"error": errors[0]} if errors else {})
+    )
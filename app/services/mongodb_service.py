@@ -1,23 +1,175 @@
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, PyMongoError
+from gridfs.errors import NoFile
 from bson import ObjectId, json_util
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, Optional, List, Any
+from typing import AsyncIterator, BinaryIO, Dict, Optional, List, Any, Tuple, Union
 from uuid import UUID, uuid4
 import asyncio
 import json
+import os
 
-class MongoDBService:
+from app.services.document_paths import project
+from app.services.interview_archive import ARCHIVABLE_STATUSES, archive_record, archived_document
+from app.services.mongodb_indexes import ARCHIVE_INDEXES, TURN_INDEXES, ensure_indexes
+from app.services.mongodb_pool import MongoPoolMetrics, MongoPoolSettings, warm_pool
+from app.services.repository import (
+    ANALYSIS_VIEW_PROJECTION,
+    PDF_REPORT,
+    PROMPT_WINDOW,
+    RESUME_TEXT,
+    STATUS_VIEW_PROJECTION,
+    SUMMARY_EXCLUDE_PROJECTION,
+    InterviewNotActiveError,
+    InterviewRepository,
+    prompt_projection,
+)
+from app.services.session_cache import SessionCache
+from app.services.status_events import status_event_projection, STATUS_EVENT_PROJECTION
+from app.services.structured_logging import get_logger, payload
+from app.services.turn_store import BucketedTurnStore
+
+logger = get_logger(__name__)
+
+# GridFS bucket holding large per-interview artifacts (RESUME_TEXT, PDF_REPORT).
+# The interview document only keeps a reference under `artifacts.<kind>`; kinds are
+# named after the inline fields they replace, which are unset when an artifact is stored.
+ARTIFACT_BUCKET = "interview_artifacts"
+
+# Where new interviews keep their turns: "embedded" in the conversation_history array
+# of the interview document, or "bucketed" in the interview_turns collection (see
+# turn_store). A bucketed interview is recognised by its `turn_count` counter, so
+# interviews created before a switch keep working in the mode they started in.
+TURN_STORAGE = os.getenv("INTERVIEW_TURN_STORAGE", "embedded").lower()
+
+# Attempts at writing a counted turn to its bucket before giving up
+TURN_APPEND_ATTEMPTS = 3
+
+class MongoDBService(InterviewRepository):
     _instance = None
     _initialized = False
     client = None
     db = None
     ai_interviews = None  # We'll use only this collection
+    artifacts = None  # GridFS bucket for large artifacts
+    turns = None  # Turn buckets of interviews in bucketed mode
+    archive = None  # Compressed finished interviews (see interview_archive)
+    index_report = None  # Result of ensure_indexes at startup, per collection
+    pool_settings = None  # Pool sizing, timeouts and compression the client was built with
+    pool_metrics = None  # Pool and command event listener
+    session_cache = SessionCache.from_env()  # Read-through cache of interview views
 
     def __new__(cls, mongo_uri: str = None):
         if cls._instance is None:
             cls._instance = super(MongoDBService, cls).__new__(cls)
         return cls._instance
 
+    @contextmanager
+    def _writing(self, interview_id: str):
+        """Wrap every write to an interview so cached views of it are invalidated"""
+        try:
+            yield
+        finally:
+            # Also after a failed write: it may have been applied before the error
+            self.session_cache.invalidate(str(interview_id))
+
+    @staticmethod
+    def _new_turn_fields() -> Dict[str, Any]:
+        """Turn fields of a new interview document in the configured storage mode"""
+        if TURN_STORAGE == "bucketed":
+            return {"turn_count": 0}
+        return {"conversation_history": []}
+
+    @staticmethod
+    def _turn_modes() -> Tuple[bool, ...]:
+        """Storage modes to try for a write, bucketed=True first if it is the configured one"""
+        return (True, False) if TURN_STORAGE == "bucketed" else (False, True)
+
+    async def _push_turn(self, query: Dict[str, Any], turn: Dict[str, Any], projection: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Append a turn to the interview matching `query`, in the mode that interview uses.
+        
+        Embedded interviews get the turn pushed onto conversation_history. Bucketed ones
+        get a sequence number from their `turn_count` counter, then the turn is written to
+        its bucket. Those are two writes, not one atomic update: the bucket write is
+        idempotent and retried, and readers count turns from the buckets, so a turn
+        counted but not (yet) stored is never read. Callers wrap this in `_writing`.
+        
+        Args:
+            query: Filter on interview_id, optionally with further conditions
+            turn: Turn to append
+            projection: Fields of the updated interview document to return
+            
+        Returns:
+            The updated interview document limited to `projection` (plus turn_count for
+            bucketed interviews), or None if nothing matched the query
+        """
+        for bucketed in self._turn_modes():
+            update = {"$inc": {"turn_count": 1}} if bucketed else {"$push": {"conversation_history": turn}}
+            document = await self.ai_interviews.find_one_and_update(
+                {**query, "turn_count": {"$exists": bucketed}},
+                {**update, "$set": {"metadata.last_updated": datetime.utcnow()}},
+                projection={**projection, "turn_count": 1} if bucketed else projection,
+                return_document=ReturnDocument.AFTER
+            )
+            if document is not None:
+                if bucketed:
+                    await self._append_turn(query["interview_id"], document["turn_count"] - 1, turn)
+                return document
+        return None
+
+    async def _append_turn(self, interview_id: str, seq: int, turn: Dict[str, Any]):
+        """Write counted turn `seq` to its bucket, retrying failed attempts"""
+        for attempt in range(1, TURN_APPEND_ATTEMPTS + 1):
+            try:
+                await self.turns.append(interview_id, seq, turn)
+                return
+            except PyMongoError as e:
+                if attempt == TURN_APPEND_ATTEMPTS:
+                    # turn_count now counts a turn that is not stored; readers skip the gap
+                    logger.error("Failed to store counted turn", interview_id=interview_id, seq=seq, error=str(e))
+                    raise
+                logger.warning("Retrying turn append", interview_id=interview_id, seq=seq, attempt=attempt, error=str(e))
+
+    async def _attach_turns(self, interview_id: str, document: Optional[Dict[str, Any]], last_n: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Fill conversation_history of a bucketed interview from its turn buckets.
+        
+        With `last_n`, question_count (if projected) is replaced by the number of turns
+        stored in the buckets, which may trail `turn_count` while a turn is being written.
+        """
+        if document is None or "turn_count" not in document:
+            return document
+        document.pop("turn_count")
+        if last_n is None:
+            document["conversation_history"] = await self.turns.all(str(interview_id))
+        else:
+            document["conversation_history"], stored = await self.turns.last(str(interview_id), max(1, last_n))
+            if "question_count" in document:
+                document["question_count"] = stored
+        return document
+
+    async def _update_interview(self, interview_id: str, update: Dict[str, Any]):
+        """
+        update_one on an interview, moving it back from the archive first if that is
+        where it is. Used by the analysis and report writes, which reach finished
+        interviews; callers wrap this in `_writing`.
+        """
+        query = {"interview_id": str(interview_id)}
+        result = await self.ai_interviews.update_one(query, update)
+        if result.matched_count == 0 and await self.restore_interview(interview_id):
+            result = await self.ai_interviews.update_one(query, update)
+        return result
+
+    async def _archived_view(self, interview_id: str, projection: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """An archived interview limited to a projection, or None if it is not archived"""
+        record = await self.archive.find_one({"interview_id": str(interview_id)}, {"payload": 1})
+        if record is None:
+            return None
+        return project(archived_document(record), projection)
+
     async def check_connection(self) -> bool:
         """Check if MongoDB connection is alive"""
         try:
@@ -26,9 +178,14 @@ class MongoDBService:
             await self.client.admin.command('ping')
             return True
         except Exception as e:
-            print(f"MongoDB connection check failed: {e}")
+            logger.warning("MongoDB connection check failed", error=str(e))
             return False
 
+    async def close(self):
+        """Close the client"""
+        if self.client:
+            self.client.close()
+
     async def initialize(self, mongo_uri: str):
         """Initialize MongoDB connection"""
         if not self._initialized:
@@ -36,31 +193,51 @@ class MongoDBService:
                 if self.client:
                     self.client.close()
                 
-                self.client = AsyncIOMotorClient(mongo_uri)
+                self.pool_settings = MongoPoolSettings.from_env()
+                self.pool_metrics = MongoPoolMetrics()
+                self.client = AsyncIOMotorClient(
+                    mongo_uri,
+                    event_listeners=[self.pool_metrics],
+                    **self.pool_settings.client_options()
+                )
                 self.db = self.client.test  # Using the 'test' database
                 
                 # Use only ai_interviews collection for all data
                 self.ai_interviews = self.db.ai_interviews
+                self.artifacts = AsyncIOMotorGridFSBucket(self.db, bucket_name=ARTIFACT_BUCKET)
+                self.turns = BucketedTurnStore(self.db.interview_turns)
+                self.archive = self.db.interview_archive
                 
-                # Create index for better query performance
-                await self.ai_interviews.create_index([
-                    ("interview_id", 1),
-                    ("timestamp", -1)
-                ])
+                # Open the minimum pool before the first request has to wait for it
+                if self.pool_settings.warmup:
+                    await warm_pool(self.client, self.pool_settings.min_pool_size)
+                
+                # Create the indexes every query shape relies on
+                self.index_report = {
+                    "ai_interviews": await ensure_indexes(self.ai_interviews),
+                    "interview_turns": await ensure_indexes(self.turns.collection, TURN_INDEXES, obsolete=[]),
+                    "interview_archive": await ensure_indexes(self.archive, ARCHIVE_INDEXES, obsolete=[])
+                }
                 
                 await self.client.admin.command('ping')
-                print("Successfully connected to MongoDB Test Database")
+                logger.info("Connected to MongoDB", database=self.db.name)
                 self._initialized = True
             except Exception as e:
-                print(f"Failed to connect to MongoDB: {e}")
+                logger.error("Failed to connect to MongoDB", error=str(e))
                 self._initialized = False
                 raise
 
+    def pool_stats(self) -> Optional[Dict[str, Any]]:
+        """Pool settings, pool gauges, checkout waits and per-command server time"""
+        if self.pool_metrics is None:
+            return None
+        return {"settings": self.pool_settings.client_options(), **self.pool_metrics.stats()}
+
     async def create_interview(self, interview_data: Dict[str, Any]) -> str:
         """Create a new AI interview session"""
         interview_id = str(uuid4())
         
-        print(f"[DEBUG] Creating new interview with data: {json.dumps(interview_data, default=str)}")
+        logger.debug("Creating new interview", data=payload(interview_data))
         
         # Initialize the interview document
         interview = {
@@ -71,7 +248,7 @@ class MongoDBService:
             "candidate_name": interview_data.get("candidate_name", "Anonymous"),
             "skills": interview_data.get("skills", {}),
             "status": "in_progress",
-            "conversation_history": [],  # Will be populated with first question later
+            **self._new_turn_fields(),  # Will be populated with first question later
             "technical_assessment": {},
             "interview_type": "ai_technical",
             "metadata": {
@@ -81,158 +258,79 @@ class MongoDBService:
         }
         
         try:
-            print(f"[DEBUG] Inserting new interview document")
-            await self.ai_interviews.insert_one(interview)
-            print(f"[DEBUG] Successfully created interview with ID: {interview_id}")
+            with self._writing(interview_id):
+                await self.ai_interviews.insert_one(interview)
+            logger.debug("Created interview", interview_id=interview_id)
             return interview_id
         except Exception as e:
-            print(f"[ERROR] Failed to create interview: {str(e)}")
+            logger.error("Failed to create interview", interview_id=str(interview_id), error=str(e))
             raise ValueError(f"Failed to create interview: {str(e)}")
 
     async def initialize_conversation(self, interview_id: str, first_question: Dict[str, Any]):
         """Initialize conversation history with first question"""
-        print(f"[DEBUG] Initializing conversation history - id: {interview_id}")
-        print(f"[DEBUG] First question data: {json.dumps(first_question, default=str)}")
+        logger.debug("Initializing conversation history", interview_id=interview_id, first_question=payload(first_question))
         
         try:
             # Add first question to conversation history
-            update_data = {
-                "$set": {
-                    "conversation_history": [{
-                        "question": first_question["question"],
-                        "answer": "",
-                        "skill_assessed": first_question.get("skill_assessed", "general"),
-                        "technical_depth": first_question.get("technical_depth", "basic"),
-                        "timestamp": datetime.utcnow()
-                    }],
-                    "metadata.last_updated": datetime.utcnow()
-                }
+            first_turn = {
+                "question": first_question["question"],
+                "answer": "",
+                "skill_assessed": first_question.get("skill_assessed", "general"),
+                "technical_depth": first_question.get("technical_depth", "basic"),
+                "timestamp": datetime.utcnow()
             }
             
-            await self.ai_interviews.update_one(
-                {"interview_id": interview_id},
-                update_data
-            )
-            print(f"[DEBUG] Successfully initialized conversation history")
+            with self._writing(interview_id):
+                await self._replace_turns(interview_id, [first_turn])
         except Exception as e:
-            print(f"[ERROR] Failed to initialize conversation: {str(e)}")
+            logger.error("Failed to initialize conversation", interview_id=str(interview_id), error=str(e))
             raise
 
     async def update_interview(self, interview_id: str, interaction: Dict[str, Any]):
         """Update interview with new interaction"""
-        print(f"[DEBUG] Updating interview - id: {interview_id}")
-        print(f"[DEBUG] Update data: {json.dumps(interaction, default=str)}")
+        logger.debug("Updating interview", interview_id=interview_id, interaction=payload(interaction))
         
-        update_data = {
-            "$push": {
-                "conversation_history": {
-                    "question": interaction["question"],
-                    "answer": interaction.get("answer", ""),
-                    "skill_assessed": interaction.get("skill_assessed", "general"),
-                    "technical_depth": interaction.get("technical_depth", "basic"),
-                    "timestamp": datetime.utcnow()
-                }
-            },
-            "$set": {
-                "metadata.last_updated": datetime.utcnow()
-            }
+        turn = {
+            "question": interaction["question"],
+            "answer": interaction.get("answer", ""),
+            "skill_assessed": interaction.get("skill_assessed", "general"),
+            "technical_depth": interaction.get("technical_depth", "basic"),
+            "timestamp": datetime.utcnow()
         }
         
         try:
-            await self.ai_interviews.update_one(
-                {"interview_id": interview_id},
-                update_data
-            )
-            print(f"[DEBUG] Interview updated successfully")
+            with self._writing(interview_id):
+                await self._push_turn({"interview_id": str(interview_id)}, turn, {"_id": 1})
         except Exception as e:
-            print(f"[ERROR] Failed to update interview in MongoDB: {str(e)}")
+            logger.error("Failed to update interview in MongoDB", interview_id=str(interview_id), error=str(e))
             raise
 
-    async def get_interview_history(self, interview_id: str | UUID) -> Dict[str, Any]:
-        """Get complete interview data"""
-        # Convert UUID to string if needed
-        interview_id_str = str(interview_id)
-        print(f"[DEBUG] Fetching interview history - id: {interview_id_str}")
-        
-        try:
-            interview = await self.ai_interviews.find_one({"interview_id": interview_id_str})
-            if not interview:
-                print(f"[ERROR] Interview not found in MongoDB: {interview_id_str}")
-                return None
-                
-            print(f"[DEBUG] Raw interview data: {json.dumps(interview, default=str)}")
-            
-            # Convert MongoDB ObjectId to string for JSON serialization
-            if "_id" in interview:
-                interview["_id"] = str(interview["_id"])
-                
-            # Convert datetime objects to ISO format strings
-            if "metadata" in interview:
-                if "created_at" in interview["metadata"]:
-                    interview["metadata"]["created_at"] = interview["metadata"]["created_at"].isoformat()
-                if "last_updated" in interview["metadata"]:
-                    interview["metadata"]["last_updated"] = interview["metadata"]["last_updated"].isoformat()
-                    
-            # Convert timestamps in conversation history
-            if "conversation_history" in interview:
-                print(f"[DEBUG] Conversation history entries: {len(interview['conversation_history'])}")
-                for qa in interview["conversation_history"]:
-                    if "timestamp" in qa:
-                        qa["timestamp"] = qa["timestamp"].isoformat()
-                        
-            # Extract resume data if available
-            resume_text = interview.get("resume_text", "")
-            technical_skills = interview.get("technical_skills", [])
-            
-            # Determine role from either direct field or technical skills
-            role = interview.get("role")
-            if not role and technical_skills:
-                # Default to most relevant technical role if not specified
-                if "Machine Learning" in technical_skills:
-                    role = "machine learning engineer"
-                elif "Python" in technical_skills:
-                    role = "python developer"
-                else:
-                    role = "software engineer"
-                print(f"[DEBUG] Inferred role from skills: {role}")
-            
-            formatted_data = {
-                "interview_id": interview["interview_id"],
-                "role": role or "software engineer",  # Fallback role
-                "experience_level": interview.get("experience_level", "junior"),  # Fallback level
-                "candidate_name": interview.get("candidate_name", "Anonymous Candidate"),
-                "status": interview.get("status", "in_progress"),
-                "conversation_history": interview.get("conversation_history", []),
-                "technical_assessment": interview.get("technical_assessment", {}),
-                "metadata": interview.get("metadata", {
-                    "created_at": datetime.utcnow().isoformat(),
-                    "last_updated": datetime.utcnow().isoformat()
-                }),
-                "skills": interview.get("skills", {})
-            }
-            print(f"[DEBUG] Returning formatted interview data: {json.dumps(formatted_data, default=str)}")
-            return formatted_data
-            
-        except Exception as e:
-            print(f"[ERROR] Failed to fetch interview history: {str(e)}")
-            raise
+    async def iter_interview_ids(self, filter: Dict[str, Any], limit: Optional[int] = None) -> AsyncIterator[str]:
+        """Stream the IDs of interviews matching a filter"""
+        cursor = self.ai_interviews.find(filter, {"interview_id": 1, "_id": 0})
+        if limit:
+            cursor = cursor.limit(limit)
+        async for doc in cursor:
+            if doc.get("interview_id"):
+                yield doc["interview_id"]
 
     async def list_interviews(self, limit: int = 10) -> List[Dict]:
-        """List recent AI interviews"""
-        cursor = self.ai_interviews.find({}).sort("metadata.created_at", -1).limit(limit)
+        """List recent AI interviews as status views"""
+        cursor = self.ai_interviews.find({}, STATUS_VIEW_PROJECTION).sort("metadata.created_at", -1).limit(limit)
         return await cursor.to_list(length=limit)
 
     async def update_technical_assessment(self, interview_id: str, assessment: Dict[str, Any]):
         """Update technical assessment for an interview"""
-        await self.ai_interviews.update_one(
-            {"interview_id": interview_id},
-            {
-                "$set": {
-                    "technical_assessment": assessment,
-                    "metadata.last_updated": datetime.utcnow()
+        with self._writing(interview_id):
+            await self._update_interview(
+                interview_id,
+                {
+                    "$set": {
+                        "technical_assessment": assessment,
+                        "metadata.last_updated": datetime.utcnow()
+                    }
                 }
-            }
-        )
+            )
 
     async def store_resume_data(self, interview_id: UUID, data: Dict[str, Any]):
         """Store all interview-related data in ai_interviews collection"""
@@ -245,13 +343,12 @@ class MongoDBService:
             # Create interview document
             interview_data = {
                 "interview_id": str(interview_id),
-                "resume_text": data.get("resume_text", ""),
                 "technical_skills": data.get("technical_skills", []),
                 "candidate_name": candidate_name,  # Store the validated name
                 "timestamp": datetime.utcnow(),
                 "status": "initialized",
                 "skills": {},
-                "conversation_history": [],
+                **self._new_turn_fields(),
                 "technical_assessment": {},
                 "metadata": {
                     "created_at": datetime.utcnow(),
@@ -259,44 +356,61 @@ class MongoDBService:
                 }
             }
             
-            print(f"[DEBUG] Storing resume data for candidate: {candidate_name}")
+            logger.debug("Storing resume data", interview_id=str(interview_id), candidate_name=candidate_name)
             
             # Check if interview already exists and update it
-            existing = await self.ai_interviews.find_one({"interview_id": str(interview_id)})
+            existing = await self.ai_interviews.find_one({"interview_id": str(interview_id)}, {"_id": 1})
             if existing:
-                await self.ai_interviews.update_one(
-                    {"interview_id": str(interview_id)},
-                    {"$set": {
-                        **interview_data,
-                        "metadata.last_updated": datetime.utcnow()
-                    }}
-                )
+                # A new resume restarts the interview, whichever mode its turns were stored in
+                stale_turns = "conversation_history" if "turn_count" in interview_data else "turn_count"
+                with self._writing(interview_id):
+                    await self.ai_interviews.update_one(
+                        {"interview_id": str(interview_id)},
+                        {
+                            "$set": {
+                                **interview_data,
+                                "metadata.last_updated": datetime.utcnow()
+                            },
+                            "$unset": {stale_turns: ""}
+                        }
+                    )
+                    await self.turns.delete(str(interview_id))
             else:
-                await self.ai_interviews.insert_one(interview_data)
+                with self._writing(interview_id):
+                    await self.ai_interviews.insert_one(interview_data)
+            
+            # The resume text is kept out of the interview document every turn reads
+            resume_text = data.get("resume_text", "")
+            if resume_text:
+                await self.store_artifact(
+                    interview_id, RESUME_TEXT, resume_text.encode("utf-8"),
+                    filename=f"resume_{interview_id}.txt", content_type="text/plain; charset=utf-8"
+                )
             
             return str(interview_id)
             
         except Exception as e:
-            print(f"[ERROR] Failed to store resume data: {str(e)}")
+            logger.error("Failed to store resume data", interview_id=str(interview_id), error=str(e))
             raise
 
-    async def update_interview_session_skills(self, interview_id: str, skills: Dict[str, float]):
-        """Update skills ratings in the interview document"""
+    async def update_interview_session_skills(self, interview_id: str, skills: Dict[str, float], status: Optional[str] = None):
+        """Update skills ratings in the interview document, and the status if given"""
         try:
-            print(f"[DEBUG] Updating skills for interview {interview_id}: {skills}")
-            await self.ai_interviews.update_one(
-                {"interview_id": interview_id},
-                {
-                    "$set": {
-                        "skills": skills,
-                        "metadata.last_updated": datetime.utcnow()
-                    }
-                }
-            )
-            print(f"[DEBUG] Skills updated successfully")
+            logger.debug("Updating skills", interview_id=interview_id, skills=skills, status=status)
+            update = {
+                "skills": skills,
+                "metadata.last_updated": datetime.utcnow()
+            }
+            if status:
+                update["status"] = status
+            with self._writing(interview_id):
+                await self.ai_interviews.update_one(
+                    {"interview_id": interview_id},
+                    {"$set": update}
+                )
             return True
         except Exception as e:
-            print(f"[ERROR] Failed to update skills: {str(e)}")
+            logger.error("Failed to update skills", interview_id=str(interview_id), error=str(e))
             raise
 
     async def update_interview_details(self, interview_id: str, data: Dict[str, Any]):
@@ -306,82 +420,330 @@ class MongoDBService:
             status = data.pop("status", "active") if isinstance(data, dict) else "active"
             
             # Ensure candidate name is preserved if it exists
-            existing_doc = await self.ai_interviews.find_one({"interview_id": str(interview_id)})
+            existing_doc = await self.ai_interviews.find_one(
+                {"interview_id": str(interview_id)},
+                {"_id": 0, "candidate_name": 1}
+            )
             if existing_doc and existing_doc.get("candidate_name"):
                 data["candidate_name"] = existing_doc["candidate_name"]
             
-            await self.ai_interviews.update_one(
-                {"interview_id": str(interview_id)},
-                {
-                    "$set": {
-                        **data,
-                        "status": status,  # Use the status from data or default to 'active'
-                        "metadata.last_updated": datetime.utcnow()
+            with self._writing(interview_id):
+                await self.ai_interviews.update_one(
+                    {"interview_id": str(interview_id)},
+                    {
+                        "$set": {
+                            **data,
+                            "status": status,  # Use the status from data or default to 'active'
+                            "metadata.last_updated": datetime.utcnow()
+                        }
                     }
-                }
-            )
-            print(f"Updated interview {interview_id} status to: {status}")  # Debug log
+                )
+            logger.debug("Updated interview status", interview_id=interview_id, status=status)
         except Exception as e:
-            print(f"[ERROR] Failed to update interview details: {str(e)}")
+            logger.error("Failed to update interview details", interview_id=str(interview_id), error=str(e))
             raise
 
     async def store_analysis(self, interview_id: str, analysis_data: Dict[str, Any]):
         """Store analysis in the interview document"""
         try:
-            print(f"[DEBUG] Storing analysis for interview {interview_id}")
-            await self.ai_interviews.update_one(
-                {"interview_id": str(interview_id)},
-                {
-                    "$set": {
-                        "technical_assessment": analysis_data,
-                        "status": "analyzed",
-                        "metadata.last_updated": datetime.utcnow()
+            logger.debug("Storing analysis", interview_id=interview_id)
+            with self._writing(interview_id):
+                await self._update_interview(
+                    interview_id,
+                    {
+                        "$set": {
+                            "technical_assessment": analysis_data,
+                            "status": "analyzed",
+                            "analysis_status": "completed",
+                            "metadata.last_updated": datetime.utcnow()
+                        }
                     }
-                }
-            )
-            print(f"[DEBUG] Successfully stored analysis")
+                )
         except Exception as e:
-            print(f"[ERROR] Failed to store analysis: {str(e)}")
+            logger.error("Failed to store analysis", interview_id=str(interview_id), error=str(e))
             raise
 
-    async def store_pdf_report(self, interview_id: str, pdf_data: bytes):
-        """Store PDF report in the same interview document"""
+    async def store_analysis_report(self, interview_id: str, report: Dict[str, Any]):
+        """Store the analysis, chart paths and candidate info produced by /report/{id}"""
         try:
-            await self.ai_interviews.update_one(
-                {"interview_id": str(interview_id)},
-                {
-                    "$set": {
-                        "pdf_report": pdf_data,
-                        "metadata.last_updated": datetime.utcnow(),
-                        "status": "report_generated"
+            with self._writing(interview_id):
+                # Bring an archived interview back first, or the upsert would shadow it
+                await self.restore_interview(interview_id)
+                await self.ai_interviews.update_one(
+                    {"interview_id": str(interview_id)},
+                    {"$set": {**report, "analysis_status": "completed"}},
+                    upsert=True
+                )
+        except Exception as e:
+            logger.error("Failed to store analysis report", interview_id=str(interview_id), error=str(e))
+            raise
+
+    async def mark_analysis_queued(self, interview_id: str, reason: str):
+        """Record that the analysis was postponed and will run later"""
+        try:
+            with self._writing(interview_id):
+                await self._update_interview(
+                    interview_id,
+                    {
+                        "$set": {
+                            "analysis_status": "queued",
+                            "analysis_queued": {"reason": reason, "queued_at": datetime.utcnow()},
+                            "metadata.last_updated": datetime.utcnow()
+                        }
                     }
-                }
+                )
+        except Exception as e:
+            logger.error("Failed to mark analysis as queued", interview_id=str(interview_id), error=str(e))
+            raise
+
+    async def store_pdf_report(
+        self,
+        interview_id: str,
+        pdf_data: Union[bytes, BinaryIO],
+        filename: Optional[str] = None,
+        analysis_data: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Store a PDF report in GridFS and mark the interview as reported, with the analysis it shows"""
+        try:
+            file_id = await self.store_artifact(
+                interview_id, PDF_REPORT, pdf_data,
+                filename=filename or f"report_{interview_id}.pdf", content_type="application/pdf"
+            )
+            update = {"status": "report_generated"}
+            if analysis_data is not None:
+                update["analysis_data"] = analysis_data
+            with self._writing(interview_id):
+                await self._update_interview(interview_id, {"$set": update})
+            return file_id
+        except Exception as e:
+            logger.error("Failed to store PDF report", interview_id=str(interview_id), error=str(e))
+            raise
+
+    async def store_artifact(
+        self,
+        interview_id: str,
+        kind: str,
+        data: Union[bytes, BinaryIO],
+        filename: str,
+        content_type: str
+    ) -> str:
+        """
+        Store a large artifact in GridFS and reference it from the interview.
+        
+        Any previous artifact of the same kind is deleted, and the inline field of the
+        same name left by older versions is unset.
+        
+        Args:
+            interview_id: Interview the artifact belongs to
+            kind: Artifact kind, e.g. RESUME_TEXT or PDF_REPORT
+            data: Bytes or a binary file object, uploaded in chunks
+            filename: Name reported on download
+            content_type: MIME type reported on download
+            
+        Returns:
+            The GridFS file id as a string
+            
+        Raises:
+            ValueError: If the interview does not exist
+        """
+        try:
+            file_id = await self.artifacts.upload_from_stream(
+                filename,
+                data,
+                metadata={"interview_id": str(interview_id), "kind": kind, "content_type": content_type}
             )
+            def attach():
+                return self.ai_interviews.find_one_and_update(
+                    {"interview_id": str(interview_id)},
+                    {
+                        "$set": {
+                            f"artifacts.{kind}": {
+                                "file_id": file_id,
+                                "filename": filename,
+                                "content_type": content_type,
+                                "created_at": datetime.utcnow()
+                            },
+                            "metadata.last_updated": datetime.utcnow()
+                        },
+                        "$unset": {kind: ""}
+                    },
+                    projection={"_id": 0, f"artifacts.{kind}": 1},
+                    return_document=ReturnDocument.BEFORE
+                )
+
+            with self._writing(interview_id):
+                previous = await attach()
+                if previous is None and await self.restore_interview(interview_id):
+                    previous = await attach()
+            if previous is None:
+                await self._delete_artifact_file(file_id)
+                raise ValueError(f"Interview not found: {interview_id}")
+            
+            old_ref = (previous.get("artifacts") or {}).get(kind)
+            if old_ref:
+                await self._delete_artifact_file(old_ref["file_id"])
+            return str(file_id)
         except Exception as e:
-            print(f"[ERROR] Failed to store PDF report: {str(e)}")
+            logger.error("Failed to store artifact", interview_id=interview_id, kind=kind, error=str(e))
             raise
 
-    async def get_interview_session(self, interview_id: str) -> Dict[str, Any]:
-        """Get interview session data"""
+    async def open_artifact(self, interview_id: str, kind: str):
+        """
+        Open an artifact for streaming reads.
+        
+        Returns:
+            A GridFS download stream (with filename, length and metadata), or None if
+            the interview has no artifact of that kind
+        """
+        try:
+            interview = await self.get_view(interview_id, {"_id": 0, f"artifacts.{kind}": 1})
+            ref = ((interview or {}).get("artifacts") or {}).get(kind)
+            if not ref:
+                return None
+            return await self.artifacts.open_download_stream(ref["file_id"])
+        except NoFile:
+            logger.error("Artifact is missing from GridFS", interview_id=interview_id, kind=kind)
+            return None
+        except Exception as e:
+            logger.error("Failed to open artifact", interview_id=interview_id, kind=kind, error=str(e))
+            raise
+
+    async def get_resume_text(self, interview_id: str) -> str:
+        """Return the resume text, reading documents stored before GridFS inline"""
+        grid_out = await self.open_artifact(interview_id, RESUME_TEXT)
+        if grid_out is not None:
+            return (await grid_out.read()).decode("utf-8")
+        interview = await self.get_view(interview_id, {"_id": 0, RESUME_TEXT: 1})
+        return (interview or {}).get(RESUME_TEXT, "")
+
+    async def _delete_artifact_file(self, file_id):
         try:
-            session = await self.ai_interviews.find_one({"interview_id": str(interview_id)})
+            await self.artifacts.delete(file_id)
+        except NoFile:
+            pass
+
+    async def get_interview_session(self, interview_id: str, projection: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Get interview session data, without the large fields unless a projection asks for them"""
+        try:
+            session = await self._attach_turns(interview_id, await self.get_view(interview_id, projection or SUMMARY_EXCLUDE_PROJECTION))
             if not session:
-                print(f"[DEBUG] Interview session not found: {interview_id}")
+                logger.debug("Interview session not found", interview_id=interview_id)
                 return None
                 
-            print(f"[DEBUG] Found session with candidate: {session.get('candidate_name')}")
+            logger.debug("Found session", interview_id=interview_id, candidate_name=session.get("candidate_name"))
             return session
         except Exception as e:
-            print(f"[ERROR] Failed to get interview session: {str(e)}")
+            logger.error("Failed to get interview session", interview_id=str(interview_id), error=str(e))
             raise
 
+    async def get_view(self, interview_id: str, projection: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Read one interview limited to a projection, through the session cache.
+        
+        Interviews that are not in ai_interviews are looked up in the archive.
+        
+        Args:
+            interview_id: Interview to read
+            projection: MongoDB projection; may compute fields such as QUESTION_COUNT
+            
+        Returns:
+            The projected document (a copy the caller may modify), or None if the
+            interview does not exist
+        """
+        interview_id = str(interview_id)
+        view = json.dumps(projection, sort_keys=True)
+        cached = self.session_cache.get(interview_id, view)
+        if cached is not None:
+            return cached
+        
+        try:
+            # Capture the version first so a write racing this read is never cached
+            version = self.session_cache.version(interview_id)
+            document = await self.ai_interviews.find_one({"interview_id": interview_id}, projection)
+            if document is None:
+                document = await self._archived_view(interview_id, projection)
+            if document is not None:
+                self.session_cache.put(interview_id, view, version, document)
+            return document
+        except Exception as e:
+            logger.error("Failed to read interview view", interview_id=str(interview_id), error=str(e))
+            raise
+
+    async def get_analysis_view(self, interview_id: str) -> Optional[Dict[str, Any]]:
+        """Full conversation history and the fields the analysis and reports use"""
+        return await self._attach_turns(interview_id, await self.get_view(interview_id, ANALYSIS_VIEW_PROJECTION))
+
+    async def get_prompt_view(self, interview_id: str, last_n: int = PROMPT_WINDOW) -> Optional[Dict[str, Any]]:
+        """
+        Fields for the next prompt with only the last `last_n` turns.
+        
+        `question_count` holds the full history length, so callers can tell where the
+        returned window starts (question_count - len(conversation_history)).
+        """
+        return await self._attach_turns(interview_id, await self.get_view(interview_id, prompt_projection(last_n)), last_n)
+
+    async def get_last_turns(self, interview_id: str, last_n: int = PROMPT_WINDOW) -> List[Dict[str, Any]]:
+        """Return the last `last_n` turns in order, or [] if the interview does not exist"""
+        interview = await self._attach_turns(
+            interview_id,
+            await self.get_view(interview_id, {"_id": 0, "conversation_history": {"$slice": -max(1, last_n)}, "turn_count": 1}),
+            last_n
+        )
+        return (interview or {}).get("conversation_history", [])
+
+    async def iter_turns(self, interview_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream every turn of an interview in order.
+        
+        Bucketed interviews are read one bucket at a time, so long interviews are never
+        held in memory whole.
+        """
+        interview_id = str(interview_id)
+        interview = await self.ai_interviews.find_one(
+            {"interview_id": interview_id},
+            {"_id": 0, "turn_count": 1, "conversation_history": 1}
+        )
+        if interview is None:
+            interview = await self._archived_view(interview_id, {"_id": 0, "conversation_history": 1})
+            if interview is None:
+                return
+        if "turn_count" in interview:
+            async for turn in self.turns.iter_all(interview_id):
+                yield turn
+        else:
+            for turn in interview.get("conversation_history", []):
+                yield turn
+
+    async def _replace_turns(self, interview_id: str, turns: List[Dict[str, Any]]):
+        """Replace all turns of an interview in the mode it uses; callers wrap this in `_writing`"""
+        interview = await self.ai_interviews.find_one({"interview_id": str(interview_id)}, {"_id": 0, "turn_count": 1})
+        if interview is not None and "turn_count" in interview:
+            await self.turns.replace(str(interview_id), turns)
+            update = {"turn_count": len(turns)}
+        else:
+            update = {"conversation_history": turns}
+        await self.ai_interviews.update_one(
+            {"interview_id": str(interview_id)},
+            {"$set": {**update, "metadata.last_updated": datetime.utcnow()}}
+        )
+
     async def update_last_answer(self, interview_id: str, answer: str):
         """Update the last answer in the conversation history"""
         try:
             # First get the current conversation history
             interview = await self.ai_interviews.find_one(
-                {"interview_id": interview_id}
+                {"interview_id": interview_id},
+                {"_id": 0, "conversation_history": {"$slice": -1}, "turn_count": 1}
             )
+            if interview and "turn_count" in interview:
+                with self._writing(interview_id):
+                    if not await self.turns.fill_unanswered(interview_id, answer):
+                        raise ValueError("Empty conversation history")
+                    await self.ai_interviews.update_one(
+                        {"interview_id": interview_id},
+                        {"$set": {"metadata.last_updated": datetime.utcnow()}}
+                    )
+                return
             if not interview or "conversation_history" not in interview:
                 raise ValueError("No conversation history found")
 
@@ -391,18 +753,19 @@ class MongoDBService:
                 raise ValueError("Empty conversation history")
 
             # Update the last entry with the answer
-            await self.ai_interviews.update_one(
-                {"interview_id": interview_id},
-                {
-                    "$set": {
-                        "conversation_history.$[last].answer": answer,
-                        "metadata.last_updated": datetime.utcnow()
-                    }
-                },
-                array_filters=[{"last.answer": ""}]
-            )
+            with self._writing(interview_id):
+                await self.ai_interviews.update_one(
+                    {"interview_id": interview_id},
+                    {
+                        "$set": {
+                            "conversation_history.$[last].answer": answer,
+                            "metadata.last_updated": datetime.utcnow()
+                        }
+                    },
+                    array_filters=[{"last.answer": ""}]
+                )
         except Exception as e:
-            print(f"[ERROR] Failed to update last answer: {str(e)}")
+            logger.error("Failed to update last answer", interview_id=str(interview_id), error=str(e))
             raise
 
     async def add_to_history(self, interview_id: str, interaction: Dict[str, Any]):
@@ -417,63 +780,291 @@ class MongoDBService:
                 interaction["timestamp"] = datetime.utcnow()
 
             # Add the new interaction to history
+            with self._writing(interview_id):
+                await self._push_turn({"interview_id": str(interview_id)}, interaction, {"_id": 1})
+        except Exception as e:
+            logger.error("Failed to add to history", interview_id=str(interview_id), error=str(e))
+            raise
+
+    async def submit_turn(
+        self,
+        interview_id: str,
+        interaction: Optional[Dict[str, Any]] = None,
+        active_statuses: Tuple[str, ...] = ("active", "in_progress"),
+        last_n: int = PROMPT_WINDOW
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Record a turn and read back the prompt fields in one round trip.
+        
+        The status check, the push to conversation_history and the read happen atomically
+        in a single find_one_and_update, so a turn can never land on an interview that was
+        completed in the meantime. For bucketed interviews that update allocates the turn's
+        sequence number instead, and the turn and the last `last_n` turns are written to
+        and read from the turn buckets afterwards.
+        
+        Args:
+            interview_id: Interview to update
+            interaction: Question/answer pair to append; the session is only read when None
+            active_statuses: Statuses that accept new turns
+            last_n: Number of most recent turns to return
+            
+        Returns:
+            The prompt view of the updated document (see get_prompt_view), or None if
+            the interview does not exist
+            
+        Raises:
+            InterviewNotActiveError: If the interview exists but is not active
+        """
+        try:
+            query = {"interview_id": str(interview_id), "status": {"$in": list(active_statuses)}}
+            projection = prompt_projection(last_n)
+            if interaction is None:
+                session = await self.ai_interviews.find_one(query, projection)
+            else:
+                if "question" not in interaction:
+                    raise ValueError("Interaction must include a question")
+                interaction.setdefault("timestamp", datetime.utcnow())
+                with self._writing(interview_id):
+                    session = await self._push_turn(query, interaction, projection)
+            if session is not None:
+                return await self._attach_turns(interview_id, session, last_n)
+            
+            # Only the failure path pays for a second read, to tell missing from inactive
+            existing = await self.get_view(str(interview_id), {"_id": 0, "status": 1})
+            if existing is None:
+                return None
+            raise InterviewNotActiveError(str(interview_id), existing.get("status"))
+        except InterviewNotActiveError:
+            raise
+        except Exception as e:
+            logger.error("Failed to submit turn", interview_id=str(interview_id), error=str(e))
+            raise
+
+    async def store_current_question(self, interview_id: str, question: str, skill_assessed: str = "general"):
+        """Store the most recently generated question awaiting an answer"""
+        try:
+            with self._writing(interview_id):
+                await self.ai_interviews.update_one(
+                    {"interview_id": str(interview_id)},
+                    {
+                        "$set": {
+                            "current_question": {
+                                "question": question,
+                                "skill_assessed": skill_assessed,
+                                "timestamp": datetime.utcnow()
+                            },
+                            "metadata.last_updated": datetime.utcnow()
+                        }
+                    }
+                )
+        except Exception as e:
+            logger.error("Failed to store current question", interview_id=str(interview_id), error=str(e))
+            raise
+
+    async def store_pregenerated_intro(self, interview_id: str, intro: Dict[str, Any]):
+        """Store an interview introduction generated ahead of /interview/start"""
+        try:
+            with self._writing(interview_id):
+                await self.ai_interviews.update_one(
+                    {"interview_id": str(interview_id)},
+                    {"$set": {"pregenerated_intro": {**intro, "created_at": datetime.utcnow()}}}
+                )
+        except Exception as e:
+            logger.error("Failed to store pregenerated intro", interview_id=str(interview_id), error=str(e))
+            raise
+
+    async def record_llm_usage(self, interview_id: str, usage: Dict[str, Any]):
+        """
+        Add one LLM call's usage to the interview's running totals.
+        
+        Archived interviews are not moved back for this, so calls made for them are only
+        counted in the /metrics aggregates. The session cache is not invalidated either;
+        the full session view may show totals up to its TTL old.
+        """
+        try:
+            site = f"llm_usage.by_call_site.{usage['call_site']}"
             await self.ai_interviews.update_one(
-                {"interview_id": interview_id},
+                {"interview_id": str(interview_id)},
                 {
-                    "$push": {
-                        "conversation_history": interaction
-                    },
-                    "$set": {
-                        "metadata.last_updated": datetime.utcnow()
+                    "$inc": {
+                        "llm_usage.calls": 1,
+                        "llm_usage.errors": 1 if usage["outcome"] == "error" else 0,
+                        "llm_usage.retries": usage["retries"],
+                        "llm_usage.prompt_tokens": usage["prompt_tokens"],
+                        "llm_usage.completion_tokens": usage["completion_tokens"],
+                        "llm_usage.wall_seconds": usage["wall_seconds"],
+                        "llm_usage.queue_seconds": usage["queue_seconds"],
+                        f"{site}.calls": 1,
+                        f"{site}.prompt_tokens": usage["prompt_tokens"],
+                        f"{site}.completion_tokens": usage["completion_tokens"],
+                        f"{site}.wall_seconds": usage["wall_seconds"]
                     }
                 }
             )
         except Exception as e:
-            print(f"[ERROR] Failed to add to history: {str(e)}")
+            logger.error("Failed to record LLM usage", interview_id=str(interview_id), error=str(e))
+            raise
+
+    async def update_conversation_summary(self, interview_id: str, summary: Dict[str, Any]) -> bool:
+        """Store the rolling conversation summary unless a newer one is already stored"""
+        try:
+            with self._writing(interview_id):
+                result = await self.ai_interviews.update_one(
+                    {
+                        "interview_id": str(interview_id),
+                        "$or": [
+                            {"conversation_summary.turns_summarized": {"$lt": summary["turns_summarized"]}},
+                            {"conversation_summary": {"$exists": False}}
+                        ]
+                    },
+                    {
+                        "$set": {
+                            "conversation_summary": summary,
+                            "metadata.last_updated": datetime.utcnow()
+                        }
+                    }
+                )
+            return result.modified_count > 0
+        except Exception as e:
+            logger.error("Failed to update conversation summary", interview_id=str(interview_id), error=str(e))
             raise
 
     async def update_interview_session(self, interview_id: str, conversation_history: List[Dict[str, Any]] = None) -> bool:
         """Update interview session with new conversation history"""
         try:
-            print(f"Updating interview session {interview_id}")
+            logger.debug("Updating interview session", interview_id=interview_id)
             
             # First verify the document exists
-            session = await self.ai_interviews.find_one({"interview_id": str(interview_id)})
+            session = await self.ai_interviews.find_one({"interview_id": str(interview_id)}, {"_id": 1, "turn_count": 1})
             if not session:
-                print(f"[ERROR] Session not found for ID: {interview_id}")
+                logger.warning("Session not found", interview_id=interview_id)
                 return False
             
             update_data = {
                 "metadata.last_updated": datetime.utcnow()
             }
             
-            if conversation_history is not None:
-                update_data["conversation_history"] = conversation_history
-                print(f"Updating conversation history with {len(conversation_history)} entries")
-            
-            result = await self.ai_interviews.update_one(
-                {"interview_id": str(interview_id)},
-                {
-                    "$set": update_data,
-                    "$setOnInsert": {  # In case document doesn't exist
-                        "status": "active",
-                        "metadata.created_at": datetime.utcnow()
-                    }
-                },
-                upsert=True  # Create if doesn't exist
-            )
+            with self._writing(interview_id):
+                if conversation_history is not None:
+                    if "turn_count" in session:
+                        await self.turns.replace(str(interview_id), conversation_history)
+                        update_data["turn_count"] = len(conversation_history)
+                    else:
+                        update_data["conversation_history"] = conversation_history
+                
+                result = await self.ai_interviews.update_one(
+                    {"interview_id": str(interview_id)},
+                    {
+                        "$set": update_data,
+                        "$setOnInsert": {  # In case document doesn't exist
+                            "status": "active",
+                            "metadata.created_at": datetime.utcnow()
+                        }
+                    },
+                    upsert=True  # Create if doesn't exist
+                )
             
             # Consider both matched and upserted as success
             success = result.matched_count > 0 or result.upserted_id is not None
-            print(f"Update {'successful' if success else 'failed'}")
-            print(f"Matched count: {result.matched_count}, Modified count: {result.modified_count}, Upserted ID: {result.upserted_id}")
+            logger.debug(
+                "Updated interview session",
+                interview_id=interview_id,
+                success=success,
+                turns=len(conversation_history) if conversation_history is not None else None,
+                matched=result.matched_count,
+                modified=result.modified_count,
+                upserted_id=result.upserted_id
+            )
             return success
             
         except Exception as e:
-            print(f"[ERROR] Failed to update interview session: {str(e)}")
+            logger.error("Failed to update interview session", interview_id=str(interview_id), error=str(e))
             return False
 
-    async def validate_candidate_name(self, interview_id: str) -> str:
-        """Always return a default name for report generation"""
-        return "Candidate"  # Simple default name
-  
\ No newline at end of file
+    async def archive_interviews(
+        self,
+        older_than: datetime,
+        statuses: Tuple[str, ...] = ARCHIVABLE_STATUSES,
+        limit: int = 100
+    ) -> Dict[str, int]:
+        """
+        Move finished interviews not updated since `older_than` to interview_archive.
+        
+        Each interview is copied to the archive first and deleted from ai_interviews
+        only if its status and last update are still the ones that were copied, so a
+        write racing the move is never lost: the copy of an interview that changed is
+        removed again and the interview is retried once it is idle again. Bucketed
+        turns are folded into the archived document and their buckets deleted.
+        
+        Args:
+            older_than: Interviews last updated before this are due
+            statuses: Statuses eligible for archival
+            limit: Maximum number of interviews to move
+            
+        Returns:
+            Counts of archived and skipped interviews, and the uncompressed (raw_bytes)
+            and compressed (stored_bytes) size of the archived ones
+        """
+        counts = {"archived": 0, "skipped": 0, "raw_bytes": 0, "stored_bytes": 0}
+        cursor = self.ai_interviews.find(
+            {"status": {"$in": list(statuses)}, "metadata.last_updated": {"$lt": older_than}}
+        ).limit(limit)
+        async for document in cursor:
+            interview_id = document["interview_id"]
+            unchanged = {
+                "interview_id": interview_id,
+                "status": document["status"],
+                "metadata.last_updated": document["metadata"]["last_updated"]
+            }
+            try:
+                record = archive_record(await self._attach_turns(interview_id, document))
+                await self.archive.replace_one({"interview_id": interview_id}, record, upsert=True)
+                with self._writing(interview_id):
+                    result = await self.ai_interviews.delete_one(unchanged)
+                if result.deleted_count:
+                    await self.turns.delete(interview_id)
+                    counts["archived"] += 1
+                    counts["raw_bytes"] += record["raw_bytes"]
+                    counts["stored_bytes"] += len(record["payload"])
+                    continue
+                
+                # Changed while being moved; unless another worker archived it, keep it active
+                if await self.ai_interviews.find_one({"interview_id": interview_id}, {"_id": 1}) is not None:
+                    await self.archive.delete_one({"interview_id": interview_id})
+                counts["skipped"] += 1
+            except Exception as e:
+                logger.error("Failed to archive interview", interview_id=interview_id, error=str(e))
+                raise
+        return counts
+
+    async def restore_interview(self, interview_id: str) -> bool:
+        """Move an archived interview back to ai_interviews; False if it is not archived"""
+        try:
+            record = await self.archive.find_one({"interview_id": str(interview_id)})
+            if record is None:
+                return False
+            with self._writing(interview_id):
+                try:
+                    await self.ai_interviews.insert_one(archived_document(record))
+                except DuplicateKeyError:
+                    pass  # Restored concurrently, or a newer interview took the id
+                await self.archive.delete_one({"interview_id": str(interview_id)})
+            logger.info("Restored archived interview", interview_id=str(interview_id))
+            return True
+        except Exception as e:
+            logger.error("Failed to restore archived interview", interview_id=str(interview_id), error=str(e))
+            raise
+
+    async def iter_status_events(self, interview_ids: List[str]) -> AsyncIterator[Dict[str, Any]]:
+        """Read the status event of every listed interview in one query"""
+        async for event in self.ai_interviews.find({"interview_id": {"$in": list(interview_ids)}}, STATUS_EVENT_PROJECTION):
+            yield event
+
+    def watch_status(self, resume_after: Any = None):
+        """Change stream of status events; needs a replica set"""
+        pipeline = [
+            {"$match": {"operationType": {"$in": ["insert", "update", "replace"]}}},
+            # The resume token (_id) must be kept for the stream to be resumable
+            {"$project": {**status_event_projection("fullDocument."), "_id": 1}}
+        ]
+        return self.ai_interviews.watch(pipeline, full_document="updateLookup", resume_after=resume_after)
@@ -0,0 +1,214 @@
+"""
+Precompiled prompt templates for LLM calls.
+
+Each template is split into a static prefix, compacted once at import time, and a
+per-call dynamic segment rendered after it. Keeping the static text first and
+byte-identical across turns lets the provider reuse its prefix cache, and compacting
+it removes the indentation that triple-quoted strings add to every call.
+"""
+from string import Formatter
+from typing import Dict, List
+import re
+import textwrap
+
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def compact(text: str) -> str:
+    """Dedent, strip trailing whitespace and collapse runs of blank lines."""
+    lines = [line.rstrip() for line in textwrap.dedent(text).strip("\n").splitlines()]
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+class PromptTemplate:
+    """A prompt with a compiled static prefix and a formatted dynamic suffix."""
+
+    def __init__(self, name: str, static: str, dynamic: str = ""):
+        """
+        Args:
+            name: Registry key
+            static: Text sent unchanged on every call; may contain literal braces
+            dynamic: str.format template for the per-call segment
+        """
+        self.name = name
+        self.source_static = static
+        self.source_dynamic = dynamic
+        self.static = compact(static)
+        self.dynamic = compact(dynamic)
+        self.fields = sorted({field for _, field, _, _ in Formatter().parse(self.dynamic) if field})
+
+    def render(self, **values) -> str:
+        """Render the prompt; the static prefix is reused as-is."""
+        if not self.dynamic:
+            return self.static
+        missing = [field for field in self.fields if field not in values]
+        if missing:
+            raise KeyError(f"Missing values for prompt '{self.name}': {missing}")
+        return f"{self.static}\n\n{self.dynamic.format(**values)}"
+
+
+class PromptRegistry:
+    """Holds the application's prompt templates by name."""
+
+    def __init__(self):
+        self._templates: Dict[str, PromptTemplate] = {}
+
+    def register(self, template: PromptTemplate) -> PromptTemplate:
+        """Add a template, rejecting duplicate names."""
+        if template.name in self._templates:
+            raise ValueError(f"Prompt template already registered: {template.name}")
+        self._templates[template.name] = template
+        return template
+
+    def get(self, name: str) -> PromptTemplate:
+        """Look up a template by name."""
+        return self._templates[name]
+
+    def render(self, name: str, **values) -> str:
+        """Render a registered template."""
+        return self._templates[name].render(**values)
+
+    def names(self) -> List[str]:
+        """Registered template names."""
+        return sorted(self._templates)
+
+
+PROMPTS = PromptRegistry()
+
+PROMPTS.register(PromptTemplate(
+    "interview_intro_system",
+    static="""
+        You are an AI technical interviewer. Keep the introduction brief and professional.
+        NO pleasantries or excessive politeness. Be direct and clear.
+        The introduction should ONLY:
+        1. State candidate's name
+        2. State the role
+        3. Ask them about themselves and interest in the role
+        Keep it concise and straightforward.
+    """
+))
+
+PROMPTS.register(PromptTemplate(
+    "interview_intro_user",
+    static="Create a brief introduction for:",
+    dynamic="""
+        Candidate Name: {candidate_name}
+        Role: {role}
+        Experience Level: {experience_level}
+    """
+))
+
+PROMPTS.register(PromptTemplate(
+    "interview_question_system",
+    static="""
+        You are an AI technical interviewer. Based on the conversation history and candidate's skills,
+        generate the next relevant technical question. Questions should:
+        1. Be clear and specific
+        2. Focus on practical applications
+        3. Allow candidates to demonstrate their knowledge
+        4. Follow a logical progression from previous questions
+        Keep the tone professional but conversational.
+    """
+))
+
+# Per-interview fields come before the conversation so consecutive turns share the longest prefix
+PROMPTS.register(PromptTemplate(
+    "interview_question_user",
+    static="Generate the next interview question based on:",
+    dynamic="""
+        Role: {role}
+        Experience Level: {experience_level}
+        Skills: {skills}
+        Conversation History:
+        {conversation}
+    """
+))
+
+PROMPTS.register(PromptTemplate(
+    "interview_system",
+    static="""
+        You are an experienced engineer having an in-depth technical discussion with a peer about their experience in the role given under INTERVIEW FOCUS.
+
+        INTERVIEW DYNAMICS:
+        1. Question Strategy
+          - Start broad to identify areas of strength
+          - Follow interesting technical threads naturally
+          - Avoid repeating similar questions about the same concept
+          - Let their answers guide the technical depth
+
+        2. Response Analysis
+          - Listen for unique insights or approaches
+          - Note when they bring up interesting trade-offs
+          - Pick up on technical details they emphasize
+          - Follow their technical reasoning
+
+        3. Natural Transitions
+          When switching topics:
+          - Reference something from their previous answers
+          - Connect it to the new topic naturally
+          - Acknowledge their request to switch smoothly
+          Example flow: "You mentioned [previous point] earlier. That's interesting because it relates to [new topic]..."
+
+        4. Technical Deep Dives
+          - When they show expertise:
+            * Explore their decision-making process
+            * Discuss trade-offs they considered
+            * Challenge their assumptions professionally
+          - When they struggle:
+            * Note it and move on naturally
+            * Switch to their areas of strength
+            * Don't repeat similar questions
+
+        5. Conversation Balance
+          - Mix technical depth with natural flow
+          - Show interest in their unique approaches
+          - Challenge them while keeping it collaborative
+          - Let them expand on interesting points they raise
+
+        Remember:
+        - Each question should feel like a natural progression
+        - Don't get stuck in repetitive patterns or phrases
+        - Follow interesting technical threads
+        - Keep it challenging but conversational
+        - Let their expertise guide the discussion
+        - do not repeat the same structure of responses
+        - Be direct but professional when answers lack depth
+        - Don't praise superficial or vague responses
+        - Match follow-up difficulty to their claimed expertise level
+        - Show appropriate concern when core skills are weak
+
+        You must respond with a valid JSON object containing:
+        {
+          "acknowledgment": "Your brief acknowledgment of their previous response",
+          "question": "Your next interview question here",
+          "current_skill": "One of the candidate's listed skills being assessed",
+          "thought_process": {
+            "response_analysis": "Honest assessment of answer quality",
+            "knowledge_assessment": "Clear evaluation of demonstrated expertise",
+            "topic_decision": "Why continue or switch topics based on answer quality",
+            "approach": "How to address any concerns while maintaining professionalism"
+          },
+          "skill_coverage": {
+            "current_skill": "Skill being assessed",
+            "covered_skills": ["List of skills covered so far"],
+            "weak_areas": ["Skills where candidate showed weakness"],
+            "next_priorities": ["Skills to prioritize next"]
+          },
+          "difficulty": "basic|intermediate|advanced (matching their level)",
+          "context": "Optional context for the question",
+          "follow_ups": ["Potential follow-up points within their skills"]
+        }
+    """,
+    dynamic="""
+        SKILL CONTEXT:
+        {skills_summary}
+
+        INTERVIEW FOCUS:
+        - Role: {role}
+        - Experience Level: {experience_level}
+        - Skills covered so far: {covered_skills}
+        - Current focus area: {current_skill}
+        - Questions asked: {question_count}
+        - Interview phase: {phase}
+    """
+))
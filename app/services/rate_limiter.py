@@ -0,0 +1,229 @@
+"""
+Process-wide rate limiting for Groq API traffic.
+"""
+from enum import IntEnum
+from typing import Any, Dict, Mapping, Optional
+import asyncio
+import heapq
+import itertools
+import os
+import random
+import re
+import time
+
+
+class Priority(IntEnum):
+    """Scheduling classes for Groq calls; lower values are served first."""
+    INTERVIEW = 0
+    RESUME = 1
+    REPORT = 2
+
+
+class RateLimitedError(Exception):
+    """Raised when Groq answers 429; carries the Retry-After delay if one was sent."""
+
+    def __init__(self, retry_after: Optional[float] = None):
+        super().__init__(f"Rate limited by Groq (retry after {retry_after}s)" if retry_after else "Rate limited by Groq")
+        self.retry_after = retry_after
+
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a rate-limit reset value into seconds.
+
+    Accepts plain seconds ("7", "0.5") and Groq's compound form ("2m59.56s", "120ms").
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    multipliers = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+    return sum(float(amount) * multipliers[unit] for amount, unit in parts)
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Read the Retry-After header in seconds, if present."""
+    return parse_duration(headers.get("retry-after"))
+
+
+def jittered_backoff(attempt: int, base_delay: float = 0.5, max_delay: float = 30.0, retry_after: Optional[float] = None) -> float:
+    """
+    Full-jitter exponential backoff delay for a retry attempt.
+
+    The delay is never shorter than a server-provided Retry-After.
+    """
+    delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+class GroqRateLimiter:
+    """
+    Token bucket shared by every Groq call in the process.
+
+    Callers wait in a priority queue, so live interview turns are granted before resume
+    parsing, which is granted before report analysis. Lower priority classes also leave
+    `interactive_reserve` tokens in the bucket so that an interview turn arriving during
+    a batch burst does not have to wait for a refill. Rate-limit headers from Groq
+    adjust the bucket and pause all traffic until the provider's reset time.
+    """
+
+    def __init__(self, requests_per_minute: float = 30, burst: int = 10, interactive_reserve: float = 1.0):
+        """
+        Args:
+            requests_per_minute: Sustained request rate
+            burst: Bucket capacity, i.e. how many calls may start back to back
+            interactive_reserve: Tokens that only interview calls may use
+        """
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(burst)
+        self.interactive_reserve = interactive_reserve
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._waiters = []  # heap of (priority, sequence, future)
+        self._sequence = itertools.count()
+        self._changed: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._stats = {
+            "granted": {p.name.lower(): 0 for p in Priority},
+            "wait_seconds": {p.name.lower(): 0.0 for p in Priority},
+            "pauses": 0
+        }
+
+    @classmethod
+    def from_env(cls) -> "GroqRateLimiter":
+        """Build a limiter configured from GROQ_RATE_LIMIT_* environment variables."""
+        return cls(
+            requests_per_minute=float(os.getenv("GROQ_RATE_LIMIT_RPM", "30")),
+            burst=int(os.getenv("GROQ_RATE_LIMIT_BURST", "10")),
+            interactive_reserve=float(os.getenv("GROQ_RATE_LIMIT_INTERACTIVE_RESERVE", "1"))
+        )
+
+    async def acquire(self, priority: Priority = Priority.INTERVIEW):
+        """Wait until a request of the given priority may be sent."""
+        self._refill()
+        if not self._waiters and self._can_grant(priority):
+            self._grant(priority)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._sequence), future))
+        started = time.monotonic()
+        self._notify()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted but never used; hand the token back
+                self._tokens = min(self.capacity, self._tokens + 1)
+            raise
+
+        self._stats["wait_seconds"][Priority(priority).name.lower()] += time.monotonic() - started
+
+    def pause(self, seconds: float):
+        """Stop granting requests for the given number of seconds."""
+        if seconds is None or seconds <= 0:
+            return
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._stats["pauses"] += 1
+        self._notify()
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """Adapt to Groq's x-ratelimit-* and Retry-After response headers."""
+        retry_after = parse_retry_after(headers)
+        if retry_after:
+            self.pause(retry_after)
+
+        for kind in ("requests", "tokens"):
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+            reset = parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+            if remaining is None:
+                continue
+            try:
+                remaining = float(remaining)
+            except ValueError:
+                continue
+
+            if remaining <= 0 and reset:
+                self.pause(reset)
+            elif kind == "requests":
+                self._refill()
+                self._tokens = min(self._tokens, remaining)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return grant counts, cumulative wait time and current bucket state."""
+        self._refill()
+        return {
+            "granted": dict(self._stats["granted"]),
+            "wait_seconds": {name: round(total, 3) for name, total in self._stats["wait_seconds"].items()},
+            "pauses": self._stats["pauses"],
+            "tokens": round(self._tokens, 2),
+            "queued": sum(1 for _, _, future in self._waiters if not future.done()),
+            "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 2)
+        }
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def _required(self, priority: Priority) -> float:
+        return 1.0 if priority == Priority.INTERVIEW else 1.0 + self.interactive_reserve
+
+    def _can_grant(self, priority: Priority) -> bool:
+        return time.monotonic() >= self._paused_until and self._tokens >= self._required(priority)
+
+    def _grant(self, priority: Priority):
+        self._tokens -= 1
+        self._stats["granted"][Priority(priority).name.lower()] += 1
+
+    def _notify(self):
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        self._changed.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+
+    async def _dispatch(self):
+        """Grant queued requests in priority order as tokens become available."""
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)  # cancelled waiter
+                continue
+
+            self._refill()
+            now = time.monotonic()
+            if now < self._paused_until:
+                await self._wait(self._paused_until - now)
+                continue
+
+            required = self._required(priority)
+            if self._tokens >= required:
+                heapq.heappop(self._waiters)
+                self._grant(priority)
+                future.set_result(None)
+                continue
+
+            await self._wait((required - self._tokens) / self.rate if self.rate > 0 else 1.0)
+
+    async def _wait(self, delay: float):
+        """Sleep until the delay passes or the queue changes."""
+        self._changed.clear()
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,465 @@
+"""
+Storage interface for interviews.
+
+Routers and services use `shared_state.repository`, an InterviewRepository. Two
+implementations exist: MongoDBService (mongodb_service) and InMemoryInterviewRepository
+(memory_repository), which keeps everything in process so the full request path can be
+run and benchmarked without a database. STORAGE_BACKEND selects one at startup.
+
+The projections below describe the views of an interview document; both
+implementations evaluate them with MongoDB semantics. Reads also find interviews that
+were moved to the archive (see interview_archive).
+"""
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, AsyncIterator, BinaryIO, Dict, List, Optional, Tuple, Union
+from uuid import UUID
+import os
+
+from app.services.interview_archive import ARCHIVABLE_STATUSES
+from app.services.structured_logging import get_logger, payload
+
+logger = get_logger(__name__)
+
+# Large per-interview artifacts, named after the inline fields they replace
+RESUME_TEXT = "resume_text"
+PDF_REPORT = "pdf_report"
+
+# Number of turns computed by the server, so the history itself need not be fetched
+QUESTION_COUNT = {"$ifNull": ["$turn_count", {"$size": {"$ifNull": ["$conversation_history", []]}}]}
+
+# Turns returned by the prompt view; must cover the context manager's recent window
+# plus turns not yet folded into the conversation summary
+PROMPT_WINDOW = int(os.getenv("INTERVIEW_PROMPT_WINDOW", "12"))
+
+# Fields needed to build the prompt for the next interview turn
+TURN_PROMPT_PROJECTION = {
+    "_id": 0,
+    "status": 1,
+    "skills": 1,
+    "conversation_history": 1,
+    "conversation_summary": 1
+}
+
+# Views of the interview document. Each read fetches only the fields its caller uses,
+# so resume_text, the conversation history, analysis blobs and the PDF report are not
+# transferred on every request.
+STATUS_VIEW_PROJECTION = {
+    "_id": 0,
+    "interview_id": 1,
+    "role": 1,
+    "candidate_name": 1,
+    "technical_skills": 1,
+    "status": 1,
+    "metadata": 1,
+    "question_count": QUESTION_COUNT
+}
+
+START_VIEW_PROJECTION = {
+    "_id": 0,
+    "candidate_name": 1,
+    "technical_skills": 1,
+    "skills": 1,
+    "pregenerated_intro": 1
+}
+
+SKILLS_VIEW_PROJECTION = {
+    "_id": 0,
+    "candidate_name": 1,
+    "technical_skills": 1,
+    "skills": 1,
+    "status": 1
+}
+
+ANALYSIS_VIEW_PROJECTION = {
+    "_id": 0,
+    "interview_id": 1,
+    "candidate_name": 1,
+    "role": 1,
+    "experience_level": 1,
+    "start_time": 1,
+    "skills": 1,
+    "conversation_history": 1,
+    "turn_count": 1,
+    "technical_assessment": 1
+}
+
+# Everything except the large fields, for callers that need the general shape
+SUMMARY_EXCLUDE_PROJECTION = {
+    "resume_text": 0,
+    "pdf_report": 0,
+    "analysis_data": 0,
+    "pregenerated_intro": 0
+}
+
+def prompt_projection(last_n: int = PROMPT_WINDOW) -> Dict[str, Any]:
+    """TURN_PROMPT_PROJECTION limited to the last `last_n` turns, plus question_count"""
+    return {
+        **TURN_PROMPT_PROJECTION,
+        "conversation_history": {"$slice": -max(1, last_n)},
+        "turn_count": 1,
+        "question_count": QUESTION_COUNT
+    }
+
+async def iter_artifact_chunks(grid_out) -> AsyncIterator[bytes]:
+    """Yield an artifact chunk by chunk, for streaming responses"""
+    while True:
+        chunk = await grid_out.readchunk()
+        if not chunk:
+            break
+        yield chunk
+
+class InterviewNotActiveError(ValueError):
+    """Raised when a turn is submitted to an interview that is not running"""
+
+    def __init__(self, interview_id: str, status: Optional[str]):
+        super().__init__(f"Interview is not active (current status: {status})")
+        self.interview_id = interview_id
+        self.status = status
+
+def infer_role(technical_skills: List[str]) -> str:
+    """Default to the most relevant technical role when none was specified"""
+    if "Machine Learning" in technical_skills:
+        return "machine learning engineer"
+    if "Python" in technical_skills:
+        return "python developer"
+    return "software engineer"
+
+class InterviewRepository(ABC):
+    """Every storage operation the application performs on interviews"""
+
+    session_cache = None  # Read-through cache of interview views, if the backend has one
+    index_report = None  # Result of applying the index registry, if the backend has indexes
+
+    # Lifecycle
+
+    @abstractmethod
+    async def initialize(self, mongo_uri: Optional[str]):
+        """Connect to the backend"""
+
+    @abstractmethod
+    async def check_connection(self) -> bool:
+        """Check if the backend is reachable"""
+
+    @abstractmethod
+    async def close(self):
+        """Release connections"""
+
+    def pool_stats(self) -> Optional[Dict[str, Any]]:
+        """Connection pool metrics, if the backend has a pool"""
+        return None
+
+    # Interview documents
+
+    @abstractmethod
+    async def create_interview(self, interview_data: Dict[str, Any]) -> str:
+        """Create a new AI interview session and return its ID"""
+
+    @abstractmethod
+    async def store_resume_data(self, interview_id: UUID, data: Dict[str, Any]):
+        """Create or reset an interview from parsed resume data"""
+
+    @abstractmethod
+    async def update_interview_details(self, interview_id: str, data: Dict[str, Any]):
+        """Set interview fields and the status (default 'active'), keeping the candidate name"""
+
+    @abstractmethod
+    async def update_interview_session_skills(self, interview_id: str, skills: Dict[str, float], status: Optional[str] = None):
+        """Update skills ratings, and the status if given"""
+
+    @abstractmethod
+    async def update_technical_assessment(self, interview_id: str, assessment: Dict[str, Any]):
+        """Update technical assessment for an interview"""
+
+    @abstractmethod
+    async def store_analysis(self, interview_id: str, analysis_data: Dict[str, Any]):
+        """Store the analysis as the technical assessment and mark the interview analyzed"""
+
+    @abstractmethod
+    async def store_analysis_report(self, interview_id: str, report: Dict[str, Any]):
+        """Store the analysis, chart paths and candidate info produced by /report/{id}"""
+
+    @abstractmethod
+    async def mark_analysis_queued(self, interview_id: str, reason: str):
+        """Record that the analysis was postponed and will run later"""
+
+    @abstractmethod
+    async def store_current_question(self, interview_id: str, question: str, skill_assessed: str = "general"):
+        """Store the most recently generated question awaiting an answer"""
+
+    @abstractmethod
+    async def store_pregenerated_intro(self, interview_id: str, intro: Dict[str, Any]):
+        """Store an interview introduction generated ahead of /interview/start"""
+
+    @abstractmethod
+    async def record_llm_usage(self, interview_id: str, usage: Dict[str, Any]):
+        """Add one LLM call's usage to the interview's running totals"""
+
+    @abstractmethod
+    async def update_conversation_summary(self, interview_id: str, summary: Dict[str, Any]) -> bool:
+        """Store the rolling conversation summary unless a newer one is already stored"""
+
+    # Reads
+
+    @abstractmethod
+    async def get_view(self, interview_id: str, projection: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Read one interview limited to a projection.
+
+        Args:
+            interview_id: Interview to read
+            projection: MongoDB projection; may compute fields such as QUESTION_COUNT
+
+        Returns:
+            The projected document (a copy the caller may modify), or None if the
+            interview does not exist
+        """
+
+    @abstractmethod
+    async def get_interview_session(self, interview_id: str, projection: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Get interview session data, without the large fields unless a projection asks for them"""
+
+    @abstractmethod
+    async def get_analysis_view(self, interview_id: str) -> Optional[Dict[str, Any]]:
+        """Full conversation history and the fields the analysis and reports use"""
+
+    @abstractmethod
+    async def get_prompt_view(self, interview_id: str, last_n: int = PROMPT_WINDOW) -> Optional[Dict[str, Any]]:
+        """
+        Fields for the next prompt with only the last `last_n` turns.
+
+        `question_count` holds the full history length, so callers can tell where the
+        returned window starts (question_count - len(conversation_history)).
+        """
+
+    @abstractmethod
+    def iter_interview_ids(self, filter: Dict[str, Any], limit: Optional[int] = None) -> AsyncIterator[str]:
+        """Stream the IDs of interviews matching a MongoDB filter"""
+
+    @abstractmethod
+    async def list_interviews(self, limit: int = 10) -> List[Dict]:
+        """List recent AI interviews as status views, newest first"""
+
+    async def get_status_view(self, interview_id: str) -> Optional[Dict[str, Any]]:
+        """Status, candidate and timing fields with a server-side question_count"""
+        return await self.get_view(interview_id, STATUS_VIEW_PROJECTION)
+
+    async def get_start_view(self, interview_id: str) -> Optional[Dict[str, Any]]:
+        """Fields needed to start an interview, including any pre-generated introduction"""
+        return await self.get_view(interview_id, START_VIEW_PROJECTION)
+
+    async def get_skills_view(self, interview_id: str) -> Optional[Dict[str, Any]]:
+        """Extracted technical skills and the candidate's ratings"""
+        return await self.get_view(interview_id, SKILLS_VIEW_PROJECTION)
+
+    async def get_interview_history(self, interview_id: str | UUID) -> Dict[str, Any]:
+        """Get complete interview data"""
+        # Convert UUID to string if needed
+        interview_id_str = str(interview_id)
+        logger.debug("Fetching interview history", interview_id=interview_id_str)
+
+        try:
+            interview = await self.get_interview_session(interview_id_str)
+            if not interview:
+                logger.warning("Interview not found", interview_id=interview_id_str)
+                return None
+
+            logger.debug("Raw interview data", interview_id=interview_id_str, interview=payload(interview))
+
+            # Convert MongoDB ObjectId to string for JSON serialization
+            if "_id" in interview:
+                interview["_id"] = str(interview["_id"])
+
+            # Convert datetime objects to ISO format strings
+            if "metadata" in interview:
+                if "created_at" in interview["metadata"]:
+                    interview["metadata"]["created_at"] = interview["metadata"]["created_at"].isoformat()
+                if "last_updated" in interview["metadata"]:
+                    interview["metadata"]["last_updated"] = interview["metadata"]["last_updated"].isoformat()
+
+            # Convert timestamps in conversation history
+            if "conversation_history" in interview:
+                logger.debug("Conversation history entries", interview_id=interview_id_str, turns=len(interview["conversation_history"]))
+                for qa in interview["conversation_history"]:
+                    if "timestamp" in qa:
+                        qa["timestamp"] = qa["timestamp"].isoformat()
+
+            # Extract resume data if available
+            technical_skills = interview.get("technical_skills", [])
+
+            # Determine role from either direct field or technical skills
+            role = interview.get("role")
+            if not role and technical_skills:
+                role = infer_role(technical_skills)
+                logger.debug("Inferred role from skills", interview_id=interview_id_str, role=role)
+
+            formatted_data = {
+                "interview_id": interview["interview_id"],
+                "role": role or "software engineer",  # Fallback role
+                "experience_level": interview.get("experience_level", "junior"),  # Fallback level
+                "candidate_name": interview.get("candidate_name", "Anonymous Candidate"),
+                "status": interview.get("status", "in_progress"),
+                "conversation_history": interview.get("conversation_history", []),
+                "technical_assessment": interview.get("technical_assessment", {}),
+                "metadata": interview.get("metadata", {
+                    "created_at": datetime.utcnow().isoformat(),
+                    "last_updated": datetime.utcnow().isoformat()
+                }),
+                "skills": interview.get("skills", {})
+            }
+            logger.debug("Returning formatted interview data", interview_id=interview_id_str, data=payload(formatted_data))
+            return formatted_data
+
+        except Exception as e:
+            logger.error("Failed to fetch interview history", interview_id=str(interview_id), error=str(e))
+            raise
+
+    async def validate_candidate_name(self, interview_id: str) -> str:
+        """Always return a default name for report generation"""
+        return "Candidate"  # Simple default name
+
+    # Conversation turns
+
+    @abstractmethod
+    async def submit_turn(
+        self,
+        interview_id: str,
+        interaction: Optional[Dict[str, Any]] = None,
+        active_statuses: Tuple[str, ...] = ("active", "in_progress"),
+        last_n: int = PROMPT_WINDOW
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Atomically check the interview is active, record a turn and read back the prompt view.
+
+        Args:
+            interview_id: Interview to update
+            interaction: Question/answer pair to append; the session is only read when None
+            active_statuses: Statuses that accept new turns
+            last_n: Number of most recent turns to return
+
+        Returns:
+            The prompt view of the updated document (see get_prompt_view), or None if
+            the interview does not exist
+
+        Raises:
+            InterviewNotActiveError: If the interview exists but is not active
+        """
+
+    @abstractmethod
+    async def initialize_conversation(self, interview_id: str, first_question: Dict[str, Any]):
+        """Initialize conversation history with first question"""
+
+    @abstractmethod
+    async def update_interview(self, interview_id: str, interaction: Dict[str, Any]):
+        """Append a question/answer pair to the conversation history"""
+
+    @abstractmethod
+    async def add_to_history(self, interview_id: str, interaction: Dict[str, Any]):
+        """Add a new interaction to the conversation history"""
+
+    @abstractmethod
+    async def update_last_answer(self, interview_id: str, answer: str):
+        """Fill in every unanswered turn with `answer` (the array_filters update of MongoDB)"""
+
+    @abstractmethod
+    async def update_interview_session(self, interview_id: str, conversation_history: List[Dict[str, Any]] = None) -> bool:
+        """Replace the conversation history; returns False if the interview does not exist"""
+
+    @abstractmethod
+    async def get_last_turns(self, interview_id: str, last_n: int = PROMPT_WINDOW) -> List[Dict[str, Any]]:
+        """Return the last `last_n` turns in order, or [] if the interview does not exist"""
+
+    @abstractmethod
+    def iter_turns(self, interview_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Stream every turn of an interview in order"""
+
+    # Artifacts
+
+    @abstractmethod
+    async def store_artifact(
+        self,
+        interview_id: str,
+        kind: str,
+        data: Union[bytes, BinaryIO],
+        filename: str,
+        content_type: str
+    ) -> str:
+        """
+        Store a large artifact and reference it from the interview, replacing any
+        previous artifact of the same kind.
+
+        Returns:
+            The artifact's file id as a string
+
+        Raises:
+            ValueError: If the interview does not exist
+        """
+
+    @abstractmethod
+    async def open_artifact(self, interview_id: str, kind: str):
+        """
+        Open an artifact for streaming reads.
+
+        Returns:
+            A download stream with filename, length, metadata, read() and readchunk(),
+            or None if the interview has no artifact of that kind
+        """
+
+    @abstractmethod
+    async def get_resume_text(self, interview_id: str) -> str:
+        """Return the resume text, reading documents stored before artifacts inline"""
+
+    @abstractmethod
+    async def store_pdf_report(
+        self,
+        interview_id: str,
+        pdf_data: Union[bytes, BinaryIO],
+        filename: Optional[str] = None,
+        analysis_data: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Store a PDF report and mark the interview as reported, with the analysis it shows"""
+
+    # Archive
+
+    @abstractmethod
+    async def archive_interviews(
+        self,
+        older_than: datetime,
+        statuses: Tuple[str, ...] = ARCHIVABLE_STATUSES,
+        limit: int = 100
+    ) -> Dict[str, int]:
+        """
+        Move up to `limit` interviews in one of `statuses`, not updated since
+        `older_than`, to the archive.
+
+        An interview that changes while it is being moved stays in the active
+        collection and is skipped.
+
+        Returns:
+            Counts of archived and skipped interviews, and the uncompressed (raw_bytes)
+            and compressed (stored_bytes) size of the archived ones
+        """
+
+    @abstractmethod
+    async def restore_interview(self, interview_id: str) -> bool:
+        """Move an archived interview back to the active collection; False if it is not archived"""
+
+    # Status events
+
+    @abstractmethod
+    def iter_status_events(self, interview_ids: List[str]) -> AsyncIterator[Dict[str, Any]]:
+        """Stream the current status event (see status_events) of each listed interview"""
+
+    def watch_status(self, resume_after: Any = None):
+        """
+        Open a stream of status events for changed interviews.
+
+        Returns:
+            An async context manager yielding an async iterator of events with a
+            `resume_token` attribute
+
+        Raises:
+            NotImplementedError: If the backend cannot push changes; StatusHub polls
+                iter_status_events instead
+        """
+        raise NotImplementedError("This storage backend does not push changes")
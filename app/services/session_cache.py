@@ -0,0 +1,126 @@
+"""
+Versioned read-through cache of interview documents.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import itertools
+import os
+import time
+
+import bson
+
+
+class SessionCache:
+    """
+    In-process LRU of interview reads, keyed on interview_id and the projection used.
+
+    Every interview has a version stamp drawn from a process-wide counter. MongoDBService
+    bumps it after each write, which invalidates all cached views of that interview.
+    A reader captures the version before querying MongoDB and the result is only stored
+    if no write happened in between, so a read that raced a write can never be served
+    later. Entries are kept BSON-encoded: the size bound is exact and every hit decodes
+    a fresh copy that callers are free to mutate.
+
+    Writes made by other processes are not seen; `ttl_seconds` bounds how long such a
+    write can go unnoticed.
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 32 * 1024 * 1024, ttl_seconds: float = 60.0, enabled: bool = True):
+        """
+        Args:
+            max_entries: Maximum number of cached views
+            max_bytes: Maximum total size of cached views (BSON bytes)
+            ttl_seconds: Lifetime of a cached view
+            enabled: When False every lookup misses
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[int, float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._clock = itertools.count(1)
+        self._versions: "OrderedDict[str, int]" = OrderedDict()
+        self._max_versions = max_entries * 4
+        self._min_version = 0  # Version assumed for interviews whose stamp was trimmed
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "invalidations": 0, "evictions": 0, "rejected": 0}
+
+    @classmethod
+    def from_env(cls) -> "SessionCache":
+        """Build a cache configured from SESSION_CACHE_* environment variables."""
+        return cls(
+            max_entries=int(os.getenv("SESSION_CACHE_MAX_ENTRIES", "512")),
+            max_bytes=int(os.getenv("SESSION_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+            ttl_seconds=float(os.getenv("SESSION_CACHE_TTL_SECONDS", "60")),
+            enabled=os.getenv("SESSION_CACHE_ENABLED", "true").lower() == "true"
+        )
+
+    def version(self, interview_id: str) -> int:
+        """Current version stamp of an interview; capture it before reading MongoDB."""
+        return self._versions.get(interview_id, self._min_version)
+
+    def get(self, interview_id: str, view: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of a cached view, or None if missing, expired or outdated."""
+        if not self.enabled:
+            return None
+
+        key = (interview_id, view)
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+
+        version, expires_at, data = entry
+        if version != self.version(interview_id) or expires_at <= time.monotonic():
+            self._remove(key)
+            self._stats["stale"] += 1
+            self._stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        return bson.decode(data)
+
+    def put(self, interview_id: str, view: str, version: int, document: Dict[str, Any]):
+        """Store a view read at `version`, unless the interview was written since."""
+        if not self.enabled or version != self.version(interview_id):
+            return
+
+        data = bson.encode(document)
+        if len(data) > self.max_bytes:
+            self._stats["rejected"] += 1
+            return
+
+        key = (interview_id, view)
+        self._remove(key)
+        self._entries[key] = (version, time.monotonic() + self.ttl_seconds, data)
+        self._bytes += len(data)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self._stats["evictions"] += 1
+
+    def invalidate(self, interview_id: str):
+        """Give an interview a new version stamp after a write."""
+        self._versions[interview_id] = next(self._clock)
+        self._versions.move_to_end(interview_id)
+        while len(self._versions) > self._max_versions:
+            self._versions.popitem(last=False)
+            # Trimmed interviews fall back to a version newer than any read in flight
+            self._min_version = next(self._clock)
+        self._stats["invalidations"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters, hit rate and current size."""
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "enabled": self.enabled,
+            "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else None,
+            "entries": len(self._entries),
+            "bytes": self._bytes
+        }
+
+    def _remove(self, key: Tuple[str, str]):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[2])
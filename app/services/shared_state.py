@@ -1,60 +1,148 @@
 """
 Shared state module for managing global services.
 """
+from app.services.memory_repository import InMemoryInterviewRepository
 from app.services.mongodb_service import MongoDBService
+from app.services.repository import InterviewRepository
 from app.services.groq_service import GroqService
+from app.services.http_client import create_http_session
+from app.services.interview_archive import InterviewArchiver
+from app.services.llm_cache import LLMCache
+from app.services.rate_limiter import GroqRateLimiter
+from app.services.llm_metrics import LLMMetricsRegistry
+from app.services.status_events import StatusHub
+from app.services.structured_logging import get_logger
 import asyncio
+import aiohttp
+import os
+
+logger = get_logger(__name__)
 
 # Global service instances
-mongodb: MongoDBService = None
+repository: InterviewRepository = None
 groq_service: GroqService = None
+http_session: aiohttp.ClientSession = None
+llm_cache: LLMCache = None
+rate_limiter: GroqRateLimiter = None
+llm_metrics: LLMMetricsRegistry = None
+status_hub: StatusHub = None
+archiver: InterviewArchiver = None
+
+def storage_backend() -> str:
+    """Configured storage backend: `mongodb` (default) or `memory`."""
+    return os.getenv("STORAGE_BACKEND", "mongodb").lower()
 
 async def init_services(mongo_uri: str):
     """Initialize global services."""
-    global mongodb, groq_service
+    global repository, groq_service, http_session, llm_cache, rate_limiter, llm_metrics, status_hub, archiver
     
     try:
-        # Initialize MongoDB
-        if mongodb is None:
-            mongodb = MongoDBService()
-        await mongodb.initialize(mongo_uri)
+        # Initialize storage; the in-memory backend needs no database
+        if repository is None:
+            repository = InMemoryInterviewRepository() if storage_backend() == "memory" else MongoDBService()
+        await repository.initialize(mongo_uri)
+        
+        # Initialize pooled HTTP client shared by all LLM calls
+        if http_session is None or http_session.closed:
+            http_session = create_http_session()
+        
+        # Initialize LLM response cache (MongoDB tier is opt-in)
+        if llm_cache is None:
+            llm_cache = LLMCache.from_env(
+                collection=repository.db.llm_cache if isinstance(repository, MongoDBService) else None
+            )
+            await llm_cache.initialize()
+        
+        # Initialize the rate limiter shared by all Groq traffic
+        if rate_limiter is None:
+            rate_limiter = GroqRateLimiter.from_env()
+        
+        # Initialize LLM call metrics; per-interview totals are stored on the interview document
+        if llm_metrics is None:
+            llm_metrics = LLMMetricsRegistry.from_env(
+                persist=lambda call: repository.record_llm_usage(call.interview_id, call.to_dict())
+            )
+        
+        # Initialize the status event hub; its watcher starts with the first subscriber
+        if status_hub is None:
+            status_hub = StatusHub.from_env(repository)
+        
+        # Start moving finished interviews to the archive collection in the background
+        if archiver is None:
+            archiver = InterviewArchiver.from_env(repository)
+        archiver.start()
         
         # Initialize Groq service
         if groq_service is None:
-            groq_service = GroqService()
+            groq_service = GroqService(
+                http_session=http_session,
+                cache=llm_cache,
+                rate_limiter=rate_limiter,
+                metrics=llm_metrics
+            )
+        else:
+            groq_service.http_session = http_session
+            groq_service.cache = llm_cache
+            groq_service.rate_limiter = rate_limiter
+            groq_service.metrics = llm_metrics
         
-        print("Services initialized successfully")
-        return mongodb, groq_service
+        logger.info("Services initialized")
+        return repository, groq_service
         
     except Exception as e:
-        print(f"Error initializing services: {e}")
+        logger.error("Error initializing services", error=str(e))
         # Clean up on error
-        if mongodb and mongodb.client:
-            mongodb.client.close()
+        if repository:
+            await repository.close()
+        if http_session and not http_session.closed:
+            await http_session.close()
         raise
 
-def cleanup_services():
+async def cleanup_services():
     """Cleanup service connections."""
-    global mongodb, groq_service
+    global repository, groq_service, http_session, llm_cache, rate_limiter, llm_metrics, status_hub, archiver
+    
+    if status_hub is not None:
+        await status_hub.stop()
+    status_hub = None
+    
+    if archiver is not None:
+        await archiver.stop()
+    archiver = None
+    
+    if http_session and not http_session.closed:
+        await http_session.close()
+    http_session = None
     
-    if mongodb and mongodb.client:
-        mongodb.client.close()
-        mongodb = None
+    if repository:
+        await repository.close()
+        repository = None
     
     groq_service = None
+    llm_cache = None
+    rate_limiter = None
+    llm_metrics = None
 
-# Register cleanup on module unload
-import atexit
-atexit.register(cleanup_services)
-
-def get_mongodb() -> MongoDBService:
-    """Get MongoDB service instance."""
-    if mongodb is None:
-        raise RuntimeError("MongoDB service not initialized")
-    return mongodb
+def get_repository() -> InterviewRepository:
+    """Get the interview storage instance."""
+    if repository is None:
+        raise RuntimeError("Interview storage not initialized")
+    return repository
 
 def get_groq_service() -> GroqService:
     """Get Groq service instance."""
     if groq_service is None:
         raise RuntimeError("Groq service not initialized")
-    return groq_service
\ No newline at end of file
+    return groq_service
+
+def get_llm_cache() -> LLMCache:
+    """Get LLM response cache instance."""
+    if llm_cache is None:
+        raise RuntimeError("LLM cache not initialized")
+    return llm_cache
+
+def get_llm_metrics() -> LLMMetricsRegistry:
+    """Get LLM call metrics registry."""
+    if llm_metrics is None:
+        raise RuntimeError("LLM metrics not initialized")
+    return llm_metrics
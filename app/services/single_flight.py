@@ -0,0 +1,49 @@
+"""
+Coalescing of identical concurrent work.
+"""
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+import asyncio
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Runs at most one instance of a keyed coroutine at a time.
+
+    Callers that arrive while work for the same key is in flight await the same task
+    and receive its result or exception. The task is shielded, so a caller that
+    disconnects does not cancel the work for everyone else. Completed results are not
+    kept; the next call after completion starts fresh work.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+        self._stats = {"started": 0, "coalesced": 0}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn() for key, or join the run already in flight."""
+        task = self._calls.get(key)
+        if task is not None:
+            self._stats["coalesced"] += 1
+        else:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            self._stats["started"] += 1
+            task.add_done_callback(lambda finished: self._forget(key, finished))
+
+        return await asyncio.shield(task)
+
+    def in_flight(self, key: str) -> bool:
+        """Return True if work for key is currently running."""
+        return key in self._calls
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counts of started and coalesced calls."""
+        return {**self._stats, "in_flight": len(self._calls)}
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved when every caller has gone away
@@ -0,0 +1,202 @@
+"""
+Push of interview status changes to subscribed clients.
+
+One StatusHub per process watches the interview repository and fans each change out to
+the subscribers of that interview, so N open status pages cost one change stream
+instead of N pollers each reading the interview. Change streams need a replica set; on
+a standalone mongod, or a backend without change streams, the hub falls back to a
+single poller per process that reads the status of every subscribed interview at once.
+"""
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+import asyncio
+import os
+
+from pymongo.errors import OperationFailure
+
+from app.services.structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Server error code for change streams on a standalone mongod
+CHANGE_STREAM_UNSUPPORTED = 40573
+
+# Comment lines sent on idle subscriptions so proxies keep them open and disconnects surface
+KEEPALIVE_SECONDS = float(os.getenv("STATUS_EVENTS_KEEPALIVE_SECONDS", "15"))
+
+# Fields of a status event, compared to suppress changes subscribers do not see
+EVENT_FIELDS = ("status", "question_count", "analysis_status", "report_ready")
+
+
+def status_event_projection(prefix: str = "") -> Dict[str, Any]:
+    """
+    Projection computing a status event from an interview document.
+
+    Args:
+        prefix: "fullDocument." to compute the event from a change stream event
+    """
+    def field(name: str) -> str:
+        return f"${prefix}{name}"
+
+    return {
+        "_id": 0,
+        "interview_id": field("interview_id"),
+        "status": field("status"),
+        "analysis_status": field("analysis_status"),
+        "question_count": {"$ifNull": [field("turn_count"), {"$size": {"$ifNull": [field("conversation_history"), []]}}]},
+        "report_ready": {"$ne": [{"$type": field("artifacts.pdf_report")}, "missing"]},
+        "last_activity": field("metadata.last_updated")
+    }
+
+
+STATUS_EVENT_PROJECTION = status_event_projection()
+
+
+class StatusHub:
+    """In-process fan-out of interview status events."""
+
+    def __init__(self, repository, use_change_stream: bool = True, poll_interval: float = 2.0, queue_size: int = 16):
+        """
+        Args:
+            repository: InterviewRepository providing watch_status and iter_status_events
+            use_change_stream: Watch a change stream; when False, or unsupported, poll
+            poll_interval: Seconds between polls in polling mode
+            queue_size: Events buffered per subscriber; the oldest is dropped when full
+        """
+        self.repository = repository
+        self.mode = "change_stream" if use_change_stream else "poll"
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._last: Dict[str, tuple] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._resume_token = None
+        self._stats = {"received": 0, "published": 0, "dropped": 0, "restarts": 0}
+
+    @classmethod
+    def from_env(cls, repository) -> "StatusHub":
+        """Build a hub configured from STATUS_EVENTS_* environment variables."""
+        return cls(
+            repository,
+            use_change_stream=os.getenv("STATUS_EVENTS_MODE", "change_stream").lower() != "poll",
+            poll_interval=float(os.getenv("STATUS_EVENTS_POLL_SECONDS", "2"))
+        )
+
+    def subscribe(self, interview_id: str, current: Optional[Dict[str, Any]] = None) -> asyncio.Queue:
+        """
+        Register for events of an interview. Pair every call with `unsubscribe`.
+
+        Args:
+            interview_id: Interview to follow
+            current: Status event the subscriber already has, so it is not sent again
+
+        Returns:
+            Queue receiving status events
+        """
+        interview_id = str(interview_id)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[interview_id].add(queue)
+        if current is not None:
+            self._last.setdefault(interview_id, self._key(current))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return queue
+
+    def unsubscribe(self, interview_id: str, queue: asyncio.Queue):
+        """Stop delivering events to a queue; the watcher stops with the last subscriber."""
+        interview_id = str(interview_id)
+        queues = self._subscribers.get(interview_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[interview_id]
+                self._last.pop(interview_id, None)
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def publish(self, event: Dict[str, Any]):
+        """Deliver a status event to the interview's subscribers if it changed anything."""
+        self._stats["received"] += 1
+        interview_id = event.get("interview_id")
+        queues = self._subscribers.get(interview_id)
+        if not queues:
+            return
+        key = self._key(event)
+        if self._last.get(interview_id) == key:
+            return
+        self._last[interview_id] = key
+
+        for queue in queues:
+            if queue.full():
+                # Events are snapshots; a slow subscriber only needs the latest ones
+                queue.get_nowait()
+                self._stats["dropped"] += 1
+            queue.put_nowait(event)
+        self._stats["published"] += 1
+
+    async def stop(self):
+        """Stop the watcher; subscribers stop receiving events."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "mode": self.mode,
+            "running": self._task is not None and not self._task.done(),
+            "interviews": len(self._subscribers),
+            "subscribers": sum(len(queues) for queues in self._subscribers.values())
+        }
+
+    @staticmethod
+    def _key(event: Dict[str, Any]) -> tuple:
+        return tuple(event.get(field) for field in EVENT_FIELDS)
+
+    async def _run(self):
+        # Changes made while nobody was subscribed are of no interest
+        self._resume_token = None
+        while self._subscribers:
+            try:
+                if self.mode == "change_stream":
+                    await self._watch()
+                else:
+                    await self._poll()
+            except asyncio.CancelledError:
+                raise
+            except NotImplementedError:
+                logger.info("Storage backend has no change streams, polling interview status instead")
+                self.mode = "poll"
+            except OperationFailure as e:
+                if e.code == CHANGE_STREAM_UNSUPPORTED:
+                    logger.warning("Change streams unavailable, polling interview status instead", error=str(e))
+                    self.mode = "poll"
+                    continue
+                logger.error("Status watcher failed", mode=self.mode, error=str(e))
+                self._stats["restarts"] += 1
+                await asyncio.sleep(self.poll_interval)
+            except Exception as e:
+                logger.error("Status watcher failed", mode=self.mode, error=str(e))
+                self._stats["restarts"] += 1
+                await asyncio.sleep(self.poll_interval)
+
+    async def _watch(self):
+        """Follow the change stream, resuming after the last change seen if restarted."""
+        async with self.repository.watch_status(self._resume_token) as stream:
+            async for change in stream:
+                self._resume_token = stream.resume_token
+                change.pop("_id", None)
+                self.publish(change)
+                if not self._subscribers:
+                    break
+
+    async def _poll(self):
+        while self._subscribers:
+            async for event in self.repository.iter_status_events(list(self._subscribers)):
+                self.publish(event)
+            await asyncio.sleep(self.poll_interval)
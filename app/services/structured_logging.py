@@ -0,0 +1,165 @@
+"""
+Structured, non-blocking logging.
+
+Loggers returned by `get_logger` take a message plus keyword fields:
+
+    logger.debug("Interview updated", interview_id=interview_id, turns=len(history))
+
+Level gating happens before anything is formatted, so a disabled debug call costs one
+`isEnabledFor` check. Records are put on an in-memory queue by the request path and
+formatted and written by a listener thread; when the queue is full records are dropped
+and counted instead of blocking the event loop. Large values (documents, raw LLM
+responses) are wrapped with `payload()`: they are rendered lazily, only for a sampled
+fraction of records, and truncated.
+"""
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+import json
+import logging
+import os
+import queue
+import random
+import sys
+
+ROOT_LOGGER = "interviewer"
+
+# Keyword arguments that belong to logging itself rather than to the record's fields
+_LOGGING_KWARGS = {"exc_info", "stack_info", "stacklevel", "extra"}
+
+_listener: Optional[QueueListener] = None
+_stats = {"dropped": 0, "payloads_sampled": 0, "payloads_skipped": 0}
+_payload_sample_rate = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0.01"))
+_payload_max_chars = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "2000"))
+
+
+class Payload:
+    """A large value rendered only when its record is written and it was sampled."""
+
+    __slots__ = ("value", "sampled", "max_chars")
+
+    def __init__(self, value: Any, sampled: bool, max_chars: int):
+        self.value = value
+        self.sampled = sampled
+        self.max_chars = max_chars
+
+    def __str__(self) -> str:
+        if not self.sampled:
+            size = f" len={len(self.value)}" if hasattr(self.value, "__len__") else ""
+            return f"<{type(self.value).__name__}{size} not sampled>"
+        try:
+            text = self.value if isinstance(self.value, str) else json.dumps(self.value, default=str)
+        except Exception as e:
+            # The value may have been mutated by the request while being serialized
+            return f"<unrenderable {type(self.value).__name__}: {type(e).__name__}>"
+        if len(text) > self.max_chars:
+            return text[:self.max_chars] + f"...<{len(text) - self.max_chars} more chars>"
+        return text
+
+
+def payload(value: Any, sample_rate: Optional[float] = None, max_chars: Optional[int] = None) -> Payload:
+    """
+    Wrap a large value for logging.
+
+    Args:
+        value: Document, list or text to log
+        sample_rate: Fraction of records that include the value, LOG_PAYLOAD_SAMPLE_RATE by default
+        max_chars: Rendered values are truncated to this length, LOG_PAYLOAD_MAX_CHARS by default
+    """
+    rate = _payload_sample_rate if sample_rate is None else sample_rate
+    sampled = rate >= 1 or random.random() < rate
+    _stats["payloads_sampled" if sampled else "payloads_skipped"] += 1
+    return Payload(value, sampled, _payload_max_chars if max_chars is None else max_chars)
+
+
+class StructuredLogger(logging.LoggerAdapter):
+    """Logger adapter that collects keyword arguments into the record's fields."""
+
+    def process(self, msg, kwargs):
+        fields = {key: kwargs.pop(key) for key in list(kwargs) if key not in _LOGGING_KWARGS}
+        kwargs["extra"] = {**(kwargs.get("extra") or {}), "fields": fields}
+        return msg, kwargs
+
+
+class StructuredFormatter(logging.Formatter):
+    """Render records as `key=value` text or as one JSON object per line."""
+
+    def __init__(self, json_lines: bool = False):
+        super().__init__()
+        self.json_lines = json_lines
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields: Dict[str, Any] = getattr(record, "fields", None) or {}
+        if self.json_lines:
+            entry = {
+                "ts": self.formatTime(record),
+                "level": record.levelname,
+                "logger": record.name,
+                "message": record.getMessage(),
+                **{key: str(value) if isinstance(value, Payload) else value for key, value in fields.items()}
+            }
+            if record.exc_info:
+                entry["exc_info"] = self.formatException(record.exc_info)
+            return json.dumps(entry, default=str)
+
+        line = f"{self.formatTime(record)} {record.levelname} {record.name}: {record.getMessage()}"
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """Queue handler that never blocks and leaves formatting to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue is in-process, so the record need not be made picklable here
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _stats["dropped"] += 1
+
+
+def get_logger(name: str) -> StructuredLogger:
+    """Return the structured logger for a module, e.g. get_logger(__name__)."""
+    return StructuredLogger(logging.getLogger(f"{ROOT_LOGGER}.{name}"), {})
+
+
+def setup_logging():
+    """
+    Route application logs through the queue and start the writer thread.
+
+    Configured by LOG_LEVEL (default INFO), LOG_FORMAT (`text` or `json`) and
+    LOG_QUEUE_SIZE. Calling it again has no effect.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(StructuredFormatter(json_lines=os.getenv("LOG_FORMAT", "text").lower() == "json"))
+    log_queue = queue.Queue(maxsize=int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    root.handlers = [_DroppingQueueHandler(log_queue)]
+    root.propagate = False
+
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def logging_stats() -> Dict[str, int]:
+    """Return counts of dropped records and sampled payloads."""
+    return dict(_stats)
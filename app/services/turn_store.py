@@ -0,0 +1,138 @@
+"""
+Interview turns stored in fixed-size bucket documents.
+
+Each document in the `interview_turns` collection holds up to `bucket_size` turns of
+one interview: {"interview_id", "bucket", "turns": [{..., "seq"}], "count",
+"last_updated"}. Turn `seq` goes to bucket `seq // bucket_size`, so appending a turn
+touches one small bucket instead of rewriting an ever-growing array inside the
+interview document. Sequence numbers are allocated by MongoDBService from the
+interview's `turn_count` counter.
+
+Allocating the number and writing the turn are two separate writes, not one atomic
+operation: a turn can be counted before its bucket write lands, or not land at all if
+that write fails. Appends are therefore idempotent so they can be retried, and readers
+take both the turns and their count from the buckets, never from `turn_count`.
+"""
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Tuple
+import os
+
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import DuplicateKeyError
+
+DEFAULT_BUCKET_SIZE = int(os.getenv("INTERVIEW_TURN_BUCKET_SIZE", "50"))
+
+
+def _strip_seq(turn: Dict[str, Any]) -> Dict[str, Any]:
+    turn.pop("seq", None)
+    return turn
+
+
+class BucketedTurnStore:
+    """Append, tail and full reads of interview turns kept in bucket documents."""
+
+    def __init__(self, collection, bucket_size: int = DEFAULT_BUCKET_SIZE):
+        """
+        Args:
+            collection: Motor collection holding the buckets
+            bucket_size: Maximum turns per bucket document
+        """
+        self.collection = collection
+        self.bucket_size = max(1, bucket_size)
+
+    def bucket_of(self, seq: int) -> int:
+        return seq // self.bucket_size
+
+    async def append(self, interview_id: str, seq: int, turn: Dict[str, Any]):
+        """
+        Store turn number `seq`, creating its bucket if needed.
+
+        Storing a `seq` that is already stored changes nothing, so a failed append can
+        be retried.
+        """
+        query = {"interview_id": interview_id, "bucket": self.bucket_of(seq), "turns.seq": {"$ne": seq}}
+        update = {
+            # Concurrent appends may arrive out of order; keep each bucket sorted
+            "$push": {"turns": {"$each": [{**turn, "seq": seq}], "$sort": {"seq": 1}}},
+            "$inc": {"count": 1},
+            "$set": {"last_updated": datetime.utcnow()}
+        }
+        try:
+            await self.collection.update_one(query, update, upsert=True)
+        except DuplicateKeyError:
+            # The bucket exists: it already holds seq, or a concurrent append created it
+            await self.collection.update_one(query, update)
+
+    async def last(self, interview_id: str, n: int) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Return the last `n` stored turns in order, and the number of stored turns.
+
+        Each bucket contributes at most its last `n` turns, so one query returns the
+        window however the turns are spread over buckets.
+
+        Args:
+            interview_id: Interview to read
+            n: Number of turns wanted
+        """
+        cursor = self.collection.find(
+            {"interview_id": interview_id},
+            {"_id": 0, "count": 1, "turns": {"$slice": -max(1, n)}}
+        ).sort("bucket", DESCENDING)
+
+        total = 0
+        window: List[Dict[str, Any]] = []
+        async for bucket in cursor:
+            total += bucket.get("count", 0)
+            if len(window) < n:
+                window = bucket.get("turns", []) + window
+        return [_strip_seq(turn) for turn in window[-n:]] if n > 0 else [], total
+
+    async def iter_all(self, interview_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Stream every turn in order, one bucket in memory at a time."""
+        cursor = self.collection.find(
+            {"interview_id": interview_id},
+            {"_id": 0, "turns": 1}
+        ).sort("bucket", ASCENDING)
+        async for bucket in cursor:
+            for turn in bucket.get("turns", []):
+                yield _strip_seq(turn)
+
+    async def all(self, interview_id: str) -> List[Dict[str, Any]]:
+        """Return every turn in order."""
+        return [turn async for turn in self.iter_all(interview_id)]
+
+    async def fill_unanswered(self, interview_id: str, answer: str) -> bool:
+        """
+        Fill in every stored turn whose answer is empty, like the array_filters update
+        of embedded interviews.
+
+        Returns:
+            False if the interview has no stored turns
+        """
+        result = await self.collection.update_many(
+            {"interview_id": interview_id, "turns.answer": ""},
+            {
+                "$set": {"turns.$[turn].answer": answer, "last_updated": datetime.utcnow()}
+            },
+            array_filters=[{"turn.answer": ""}]
+        )
+        if result.matched_count:
+            return True
+        return await self.collection.find_one({"interview_id": interview_id}, {"_id": 1}) is not None
+
+    async def replace(self, interview_id: str, turns: List[Dict[str, Any]]):
+        """Replace all turns of an interview."""
+        await self.delete(interview_id)
+        buckets: Dict[int, List[Dict[str, Any]]] = {}
+        for seq, turn in enumerate(turns):
+            buckets.setdefault(self.bucket_of(seq), []).append({**turn, "seq": seq})
+        if buckets:
+            now = datetime.utcnow()
+            await self.collection.insert_many([
+                {"interview_id": interview_id, "bucket": bucket, "turns": items, "count": len(items), "last_updated": now}
+                for bucket, items in buckets.items()
+            ])
+
+    async def delete(self, interview_id: str):
+        """Remove all turns of an interview."""
+        await self.collection.delete_many({"interview_id": interview_id})
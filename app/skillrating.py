@@ -1,7 +1,8 @@
-from fastapi import FastAPI, HTTPException, APIRouter
+from fastapi import FastAPI, HTTPException, APIRouter, BackgroundTasks
 from pydantic import BaseModel, Field
-from typing import Dict
+from typing import Dict, Optional
 from app.services import shared_state
+from app.services.intro_pregeneration import pregenerate_intro
 
 router = APIRouter(
     tags=["Skills"],
@@ -11,15 +12,18 @@ router = APIRouter(
 class SkillRatingRequest(BaseModel):
     interview_id: str
     skills: Dict[str, float] = Field(..., description="Dictionary of skill ratings (0-10)")
+    role: Optional[str] = Field(None, description="Job role, used to prepare the interview introduction")
+    experience_level: Optional[str] = Field(None, description="Experience level, used to prepare the interview introduction")
 
 @router.post("/")
-async def rate_skills(request: SkillRatingRequest):
-    """Rate technical skills for an interview session."""
+async def rate_skills(request: SkillRatingRequest, background_tasks: BackgroundTasks):
+    """Rate technical skills for an interview session.
+    
+    The interview introduction is generated in the background once the ratings are stored.
+    """
     try:
         # First verify the interview exists and has technical skills
-        interview = await shared_state.mongodb.ai_interviews.find_one(
-            {"interview_id": request.interview_id}
-        )
+        interview = await shared_state.repository.get_skills_view(request.interview_id)
         
         if not interview:
             raise HTTPException(status_code=404, detail="Interview not found")
@@ -44,16 +48,18 @@ async def rate_skills(request: SkillRatingRequest):
                     detail=f"Rating for '{skill}' must be between 0 and 10"
                 )
         
-        # Update skill ratings in MongoDB
-        await shared_state.mongodb.update_interview_session_skills(
+        # Update skill ratings and interview status in MongoDB
+        await shared_state.repository.update_interview_session_skills(
             interview_id=request.interview_id,
-            skills=request.skills
+            skills=request.skills,
+            status="skills_rated"
         )
         
-        # Update interview status
-        await shared_state.mongodb.ai_interviews.update_one(
-            {"interview_id": request.interview_id},
-            {"$set": {"status": "skills_rated"}}
+        background_tasks.add_task(
+            pregenerate_intro,
+            request.interview_id,
+            request.role,
+            request.experience_level
         )
         
         return {
@@ -0,0 +1,94 @@
+"""
+Explain-plan check for every query shape MongoDBService issues.
+
+Applies the index registries to scratch collections on a local mongod, loads sample
+interviews, turn buckets and archive records so the planner has something to choose between, runs explain() for each
+entry in QUERY_SHAPES and exits non-zero if any winning plan contains a COLLSCAN.
+The scratch database is dropped afterwards.
+
+Usage:
+    python -m benchmarks.explain_plans --uri mongodb://localhost:27017
+"""
+from datetime import datetime, timedelta
+import argparse
+import asyncio
+import sys
+import uuid
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.services.interview_archive import archive_record
+from app.services.mongodb_indexes import ARCHIVE_INDEXES, QUERY_SHAPES, TURN_INDEXES, ensure_indexes, has_collection_scan
+
+STATUSES = ["initialized", "active", "completed", "analyzed", "report_generated"]
+
+
+def sample_interviews(count: int):
+    now = datetime.utcnow()
+    for index in range(count):
+        created = now - timedelta(minutes=index)
+        yield {
+            "interview_id": str(uuid.uuid4()),
+            "candidate_name": f"Candidate {index}",
+            "status": STATUSES[index % len(STATUSES)],
+            "conversation_history": [],
+            "metadata": {"created_at": created, "last_updated": created}
+        }
+
+
+def sample_buckets(interview_ids, buckets: int = 3):
+    for interview_id in interview_ids:
+        for bucket in range(buckets):
+            yield {"interview_id": interview_id, "bucket": bucket, "turns": [], "count": 0}
+
+
+def winning_stages(plan) -> str:
+    """Compact stage chain of a winning plan, e.g. LIMIT > FETCH > IXSCAN."""
+    stages = []
+    while isinstance(plan, dict):
+        plan = plan.get("queryPlan", plan)
+        stages.append(plan.get("stage", "?"))
+        plan = plan.get("inputStage") or (plan.get("inputStages") or [None])[0]
+    return " > ".join(stages)
+
+
+async def main(uri: str, database: str, documents: int) -> int:
+    client = AsyncIOMotorClient(uri)
+    db = client[database]
+    failures = 0
+    try:
+        interviews = list(sample_interviews(documents))
+        await db.ai_interviews.insert_many(interviews)
+        await db.interview_turns.insert_many(list(sample_buckets(doc["interview_id"] for doc in interviews)))
+        await db.interview_archive.insert_many([archive_record(doc) for doc in sample_interviews(documents)])
+        for collection, specs in ((db.ai_interviews, None), (db.interview_turns, TURN_INDEXES), (db.interview_archive, ARCHIVE_INDEXES)):
+            report = await ensure_indexes(collection, specs, obsolete=[])
+            if report["errors"] or report["conflicts"]:
+                print(f"Index registry did not apply cleanly to {collection.name}: {report}")
+                return 1
+
+        for shape in QUERY_SHAPES:
+            cursor = db[shape.get("collection", "ai_interviews")].find(shape["filter"])
+            if shape.get("sort"):
+                cursor = cursor.sort(shape["sort"])
+            if shape.get("limit"):
+                cursor = cursor.limit(shape["limit"])
+            plan = (await cursor.explain())["queryPlanner"]["winningPlan"]
+            scanned = has_collection_scan(plan)
+            failures += scanned
+            print(f"{'FAIL' if scanned else 'ok  '}  {shape['name']:<20} {winning_stages(plan)}")
+    finally:
+        await client.drop_database(database)
+        client.close()
+
+    print(f"\n{len(QUERY_SHAPES) - failures}/{len(QUERY_SHAPES)} query shapes use an index")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--uri", default="mongodb://localhost:27017")
+    parser.add_argument("--database", default="explain_plans_scratch")
+    parser.add_argument("--documents", type=int, default=500)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.uri, args.database, args.documents)))
@@ -0,0 +1,270 @@
+"""
+Local stand-in for the Groq chat completions API.
+
+Serves OpenAI-compatible `/openai/v1/chat/completions` responses with canned, schema-valid
+content for every call site in the app (interview turns, resume skill extraction,
+report analysis, conversation summaries), so the whole FastAPI app can be exercised and
+benchmarked without network access.
+
+Latency, rate limiting and failures are configurable at startup and at runtime through
+`POST /_config`; `GET /_stats` returns request counters.
+
+Usage:
+    python -m benchmarks.fake_groq_server --port 8001 --latency-median-ms 800 --rate-limit-ratio 0.05
+    GROQ_BASE_URL=http://localhost:8001 GROQ_API_KEY=fake uvicorn app.main:app
+"""
+from typing import Any, Dict, List, Optional
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+app = FastAPI(title="Fake Groq API")
+
+
+class FakeConfig(BaseModel):
+    latency_distribution: str = "lognormal"  # constant | uniform | lognormal
+    latency_median_ms: float = 500.0
+    latency_sigma: float = 0.5  # lognormal shape; uniform spreads +/- median * sigma
+    token_delay_ms: float = 15.0  # delay between streamed chunks
+    rate_limit_ratio: float = 0.0  # fraction of requests answered with 429
+    retry_after_seconds: float = 1.0
+    error_ratio: float = 0.0  # fraction of requests answered with 500
+    seed: Optional[int] = None
+
+
+config = FakeConfig()
+stats = {"requests": 0, "streamed": 0, "rate_limited": 0, "errors": 0}
+_random = random.Random()
+
+ANALYSIS_RESPONSE = {
+    "personal_details": {
+        "candidate_name": "Candidate",
+        "position_applied": "Software Engineer",
+        "interview_date": "2024-01-01",
+        "interviewer_name": "AI Interviewer"
+    },
+    "skill_categories": {
+        category: {
+            "rating": 7.5,
+            "evidence": "Consistent, specific answers",
+            "subcategories": {
+                sub: {"rating": 7.5, "evidence": "Specific example from interview"}
+                for sub in subcategories
+            }
+        }
+        for category, subcategories in {
+            "Technical Proficiency": ["Core Knowledge", "Tools and Software", "Domain-Specific Knowledge"],
+            "Problem Solving": ["Algorithmic Thinking", "Analytical Skills", "Innovation"],
+            "Behavioral Skills": ["Team Collaboration", "Communication", "Leadership"]
+        }.items()
+    },
+    "overall_performance": "Solid fundamentals with room to deepen system design knowledge",
+    "overall_rating": 7.5,
+    "result": "Pass",
+    "evidence": [
+        "Clear explanations of core concepts",
+        "Good practical examples",
+        "Limited depth on scaling trade-offs",
+        "Could quantify impact more"
+    ]
+}
+
+INTERVIEW_TURN_RESPONSE = {
+    "acknowledgment": "Thanks, that's a clear explanation.",
+    "question": "How would you profile and reduce the latency of a slow API endpoint?",
+    "current_skill": "Python",
+    "thought_process": {
+        "response_analysis": "Answer covered the basics",
+        "knowledge_assessment": "Solid intermediate knowledge",
+        "topic_decision": "Go one level deeper on performance",
+        "approach": "Ask for a concrete workflow"
+    },
+    "skill_coverage": {
+        "current_skill": "Python",
+        "covered_skills": ["Python"],
+        "weak_areas": [],
+        "next_priorities": ["MongoDB"]
+    },
+    "difficulty": "intermediate",
+    "context": "",
+    "follow_ups": ["Which profiler would you use?", "How would you verify the fix?"]
+}
+
+
+def canned_content(messages: List[Dict[str, Any]]) -> str:
+    """Pick a response that matches what the calling code expects to parse."""
+    system = " ".join(m.get("content", "") for m in messages if m.get("role") == "system")
+    if "Extract technical skills" in system:
+        return json.dumps({"technical_skills": ["Python", "FastAPI", "MongoDB", "Docker", "PyTorch"]})
+    if "evaluating candidates" in system:
+        return json.dumps(ANALYSIS_RESPONSE)
+    if "running notes" in system:
+        return "Covered Python fundamentals (solid) and async IO (intermediate). Weak on indexing strategy."
+    if "valid JSON object" in system:
+        return json.dumps(INTERVIEW_TURN_RESPONSE)
+    if "introduction" in system:
+        return "Hi, welcome to your interview for this role. Could you tell me about yourself and why this role interests you?"
+    return "Can you walk me through a recent project where you had to make a significant technical trade-off?"
+
+
+def sample_latency() -> float:
+    """Draw a response latency in seconds from the configured distribution."""
+    median = config.latency_median_ms / 1000.0
+    if config.latency_distribution == "constant":
+        return median
+    if config.latency_distribution == "uniform":
+        spread = median * config.latency_sigma
+        return max(0.0, _random.uniform(median - spread, median + spread))
+    return _random.lognormvariate(math.log(max(median, 1e-6)), config.latency_sigma)
+
+
+def rate_limit_headers(remaining_tokens: int = 17500, reset_tokens: str = "1.66s") -> Dict[str, str]:
+    return {
+        "x-ratelimit-limit-requests": "14400",
+        "x-ratelimit-remaining-requests": "14000",
+        "x-ratelimit-reset-requests": "2m59.56s",
+        "x-ratelimit-limit-tokens": "18000",
+        "x-ratelimit-remaining-tokens": str(remaining_tokens),
+        "x-ratelimit-reset-tokens": reset_tokens
+    }
+
+
+def usage_for(messages: List[Dict[str, Any]], content: str) -> Dict[str, int]:
+    prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 4 + 1
+    completion_tokens = len(content) // 4 + 1
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens
+    }
+
+
+@app.post("/openai/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    stats["requests"] += 1
+    messages = body.get("messages", [])
+    model = body.get("model", "fake-model")
+
+    if _random.random() < config.rate_limit_ratio:
+        stats["rate_limited"] += 1
+        headers = {
+            **rate_limit_headers(remaining_tokens=0, reset_tokens=f"{config.retry_after_seconds}s"),
+            "retry-after": str(config.retry_after_seconds)
+        }
+        return JSONResponse(
+            status_code=429,
+            headers=headers,
+            content={"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}}
+        )
+
+    if _random.random() < config.error_ratio:
+        stats["errors"] += 1
+        return JSONResponse(status_code=500, content={"error": {"message": "Injected failure", "type": "server_error"}})
+
+    content = canned_content(messages)
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+    created = int(time.time())
+
+    if body.get("stream"):
+        stats["streamed"] += 1
+        return StreamingResponse(
+            stream_chunks(completion_id, created, model, messages, content),
+            media_type="text/event-stream",
+            headers=rate_limit_headers()
+        )
+
+    await asyncio.sleep(sample_latency())
+    return JSONResponse(
+        headers=rate_limit_headers(),
+        content={
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": usage_for(messages, content)
+        }
+    )
+
+
+async def stream_chunks(completion_id: str, created: int, model: str, messages: List[Dict[str, Any]], content: str):
+    """Emit the canned content word by word as OpenAI-style SSE chunks."""
+    await asyncio.sleep(sample_latency())  # time to first token
+    words = content.split(" ")
+    for index, word in enumerate(words):
+        token = word if index == 0 else f" {word}"
+        chunk = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]
+        }
+        yield f"data: {json.dumps(chunk)}\n\n"
+        await asyncio.sleep(config.token_delay_ms / 1000.0)
+
+    final = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": created,
+        "model": model,
+        "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+        "x_groq": {"usage": usage_for(messages, content)}
+    }
+    yield f"data: {json.dumps(final)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/_config")
+async def update_config(update: Dict[str, Any]):
+    """Change latency and failure injection while the server is running."""
+    global config
+    config = config.model_copy(update=update)
+    if "seed" in update:
+        _random.seed(config.seed)
+    return config.model_dump()
+
+
+@app.get("/_stats")
+async def get_stats():
+    return {**stats, "config": config.model_dump()}
+
+
+def main():
+    global config
+    parser = argparse.ArgumentParser(description="Run a local fake Groq API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency-distribution", choices=["constant", "uniform", "lognormal"], default=config.latency_distribution)
+    parser.add_argument("--latency-median-ms", type=float, default=config.latency_median_ms)
+    parser.add_argument("--latency-sigma", type=float, default=config.latency_sigma)
+    parser.add_argument("--token-delay-ms", type=float, default=config.token_delay_ms)
+    parser.add_argument("--rate-limit-ratio", type=float, default=config.rate_limit_ratio)
+    parser.add_argument("--retry-after-seconds", type=float, default=config.retry_after_seconds)
+    parser.add_argument("--error-ratio", type=float, default=config.error_ratio)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = FakeConfig(**{key: value for key, value in vars(args).items() if key not in ("host", "port")})
+    if config.seed is not None:
+        _random.seed(config.seed)
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
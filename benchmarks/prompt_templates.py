@@ -0,0 +1,79 @@
+"""
+Token savings of the precompiled prompt templates.
+
+Compares each registered template as written in source (indented triple-quoted text,
+as the prompts used to be sent) with the compiled form sent today, and reports how
+much of each rendered prompt is the static, prefix-cacheable part.
+
+Usage:
+    python -m benchmarks.prompt_templates
+"""
+import time
+
+from app.services.prompt_templates import PROMPTS
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+
+    def count_tokens(text: str) -> int:
+        return len(_ENCODING.encode(text))
+
+    TOKENIZER = "cl100k_base"
+except ImportError:
+    def count_tokens(text: str) -> int:
+        return len(text) // 4 + 1
+
+    TOKENIZER = "estimate (4 chars/token)"
+
+SAMPLE_VALUES = {
+    "candidate_name": "Jane Doe",
+    "role": "machine learning engineer",
+    "experience_level": "mid",
+    "skills": {"Python": 8, "PyTorch": 7, "MongoDB": 5},
+    "conversation": "Recent turns:\nQ: How do you handle class imbalance?\nA: Resampling and weighted losses.",
+    "skills_summary": "- Python: Rating 8/10 (Focus: Advanced) - Covered\n- PyTorch: Rating 7/10 (Focus: Intermediate) - Not yet covered",
+    "covered_skills": "Python",
+    "current_skill": "Python",
+    "question_count": 3,
+    "phase": "In progress"
+}
+
+
+def render_source(template) -> str:
+    """Render a template from its uncompiled source text."""
+    values = {field: SAMPLE_VALUES[field] for field in template.fields}
+    dynamic = template.source_dynamic.format(**values) if template.source_dynamic else ""
+    return template.source_static + dynamic
+
+
+def main(iterations: int = 10000):
+    print(f"Tokenizer: {TOKENIZER}")
+    print(f"{'template':<28}{'source':>8}{'compiled':>10}{'saved':>8}{'static %':>10}{'render us':>11}")
+
+    total_source = total_compiled = 0
+    for name in PROMPTS.names():
+        template = PROMPTS.get(name)
+        values = {field: SAMPLE_VALUES[field] for field in template.fields}
+
+        source_tokens = count_tokens(render_source(template))
+        rendered = template.render(**values)
+        compiled_tokens = count_tokens(rendered)
+        static_share = count_tokens(template.static) / compiled_tokens * 100
+
+        started = time.perf_counter()
+        for _ in range(iterations):
+            template.render(**values)
+        render_us = (time.perf_counter() - started) / iterations * 1e6
+
+        saved = source_tokens - compiled_tokens
+        total_source += source_tokens
+        total_compiled += compiled_tokens
+        print(f"{name:<28}{source_tokens:>8}{compiled_tokens:>10}{saved:>8}{static_share:>9.1f}%{render_us:>11.2f}")
+
+    saved_pct = (total_source - total_compiled) / total_source * 100 if total_source else 0.0
+    print(f"{'total':<28}{total_source:>8}{total_compiled:>10}{total_source - total_compiled:>8}  ({saved_pct:.1f}% saved)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Throughput of the full request path with in-memory storage.
+
+Runs the FastAPI app in process (httpx ASGI transport) with STORAGE_BACKEND=memory and
+drives interviews through skill rating, /interview/start and several
+/interview/continue turns with bounded concurrency, then reports requests per second
+and latency percentiles per endpoint. LLM calls go to the fake Groq server; with its
+constant latency and a fixed seed, and no database process, runs are repeatable.
+
+Usage:
+    python -m benchmarks.fake_groq_server --port 8001 --latency-distribution constant --latency-median-ms 50 --seed 1
+    GROQ_BASE_URL=http://localhost:8001 GROQ_API_KEY=fake python -m benchmarks.request_path --interviews 50 --turns 5
+"""
+from collections import defaultdict
+from typing import Dict, List
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+os.environ["STORAGE_BACKEND"] = "memory"
+
+import httpx
+
+from app.main import app
+from app.services import shared_state
+
+SKILLS = {"Python": 8, "MongoDB": 6, "FastAPI": 7}
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))]
+
+
+async def run_interview(client: httpx.AsyncClient, turns: int, latencies: Dict[str, List[float]], failures: Dict[str, int]):
+    interview_id = str(uuid.uuid4())
+    await shared_state.repository.store_resume_data(interview_id, {
+        "candidate_name": "Benchmark Candidate",
+        "technical_skills": list(SKILLS)
+    })
+
+    async def call(endpoint: str, path: str, body: Dict) -> Dict:
+        started = time.perf_counter()
+        response = await client.post(path, json=body)
+        latencies[endpoint].append(time.perf_counter() - started)
+        if response.status_code != 200:
+            failures[endpoint] += 1
+            return {}
+        return response.json()
+
+    await call("skills", "/skills/", {"interview_id": interview_id, "skills": SKILLS})
+    request = {"interview_id": interview_id, "role": "python developer", "experience_level": "mid"}
+    reply = await call("start", "/interview/start", {**request, "candidate_name": "Benchmark Candidate"})
+
+    history = []
+    for turn in range(turns):
+        question = reply.get("question") or "Tell me about your experience."
+        history.append({"question": question, "answer": f"Answer {turn} with a concrete example."})
+        reply = await call("continue", "/interview/continue", {**request, "conversation_history": history})
+
+
+async def main(interviews: int, turns: int, concurrency: int) -> int:
+    await app.router.startup()
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    failures: Dict[str, int] = defaultdict(int)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(client):
+        async with semaphore:
+            await run_interview(client, turns, latencies, failures)
+
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=120) as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(bounded(client) for _ in range(interviews)))
+            elapsed = time.perf_counter() - started
+    finally:
+        await app.router.shutdown()
+
+    requests = sum(len(values) for values in latencies.values())
+    print(f"{interviews} interviews x {turns} turns, concurrency {concurrency}: "
+          f"{requests} requests in {elapsed:.2f}s ({requests / elapsed:.1f} req/s)\n")
+    print(f"{'endpoint':<10} {'requests':>8} {'failed':>6} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for endpoint, values in latencies.items():
+        print(f"{endpoint:<10} {len(values):>8} {failures[endpoint]:>6} "
+              f"{percentile(values, 50) * 1000:>8.1f} {percentile(values, 95) * 1000:>8.1f} {max(values) * 1000:>8.1f}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--interviews", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.interviews, args.turns, args.concurrency)))
@@ -12,8 +12,10 @@ from app.parserapifinal import router as resume_router
 from app.skillrating import router as skills_router
 from app.interview_api import router as interview_router
 from app.pdf_report_generator import generate_pdf_report, get_pdf_report
+from app.report_api import CohortAnalysisRequest, analyze_cohort_endpoint
 
 from app.services import shared_state
+from app.services.structured_logging import get_logger, setup_logging, shutdown_logging
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -47,31 +49,50 @@ async def get_report(interview_id: str):
     """Get the generated PDF report."""
     return await get_pdf_report(interview_id)
 
+@app.get("/report/{interview_id}/pdf")
+async def download_report(interview_id: str):
+    """Download the generated PDF report, streamed from GridFS."""
+    return await get_pdf_report(interview_id)
+
+@app.post("/report/cohort/analyze")
+async def analyze_cohort(request: CohortAnalysisRequest):
+    """Analyze a cohort of interviews, streaming per-interview progress as NDJSON."""
+    return await analyze_cohort_endpoint(request)
+
 # Load environment variables at startup
 load_dotenv()
 
+logger = get_logger(__name__)
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup"""
+    setup_logging()
     try:
         # Verify environment variables
-        required_vars = ["MONGO_URI", "GROQ_API_KEY"]
+        required_vars = ["GROQ_API_KEY"] if shared_state.storage_backend() == "memory" else ["MONGO_URI", "GROQ_API_KEY"]
         missing_vars = [var for var in required_vars if not os.getenv(var)]
         if missing_vars:
             raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
             
         await shared_state.init_services(os.getenv("MONGO_URI"))
-        print("Services initialized successfully")
+        logger.info("Services initialized successfully")
     except Exception as e:
-        print(f"Failed to initialize services: {e}")
+        logger.error("Failed to initialize services", error=str(e))
         raise
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close pooled connections on shutdown"""
+    await shared_state.cleanup_services()
+    shutdown_logging()
+
 @app.get("/health")
 async def health_check():
     """API health check endpoint."""
     try:
         # Check MongoDB connection
-        db_status = "active" if await shared_state.mongodb.check_connection() else "error"
+        db_status = "active" if await shared_state.repository.check_connection() else "error"
         
         return {
             "status": "healthy" if db_status == "active" else "unhealthy",
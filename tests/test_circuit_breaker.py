@@ -0,0 +1,94 @@
+"""State transitions of CircuitBreaker: closed -> open -> half-open probe."""
+import pytest
+
+from app.services import circuit_breaker
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(circuit_breaker, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(failure_ratio=0.5, min_calls=4, window=4, slow_call_seconds=1.0, open_seconds=30.0)
+
+
+def trip(breaker):
+    for _ in range(4):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def test_opens_once_the_failure_ratio_is_reached(breaker):
+    breaker.before_call()
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_success(0.1)
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED  # below min_calls
+
+    breaker.before_call()
+    breaker.record_success(0.1)
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.before_call()
+    assert error.value.retry_after == pytest.approx(30.0)
+
+
+def test_slow_successes_count_against_the_provider(breaker):
+    for _ in range(4):
+        breaker.before_call()
+        breaker.record_success(5.0)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_successful_probe_closes_the_circuit(breaker, clock):
+    trip(breaker)
+    clock.now += 30.0
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # only one probe at a time
+    breaker.record_success(0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_call()
+
+
+def test_failed_probe_opens_the_circuit_again(breaker, clock):
+    trip(breaker)
+    clock.now += 30.0
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.stats()["opened"] == 2
+
+
+def test_ignored_outcome_releases_the_probe(breaker, clock):
+    trip(breaker)
+    clock.now += 30.0
+    breaker.before_call()
+    breaker.record_ignored()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.before_call()
+
+
+def test_disabled_breaker_admits_everything(clock):
+    breaker = CircuitBreaker(min_calls=1, enabled=False)
+    for _ in range(10):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,30 @@
+"""Explain-plan check of benchmarks.explain_plans, run when a local mongod is reachable."""
+import asyncio
+import os
+
+import pytest
+
+pytest.importorskip("motor")
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+from benchmarks import explain_plans
+
+MONGO_URI = os.getenv("EXPLAIN_PLANS_URI", "mongodb://localhost:27017")
+
+
+@pytest.fixture(scope="module")
+def mongod():
+    client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=1000)
+    try:
+        client.admin.command("ping")
+    except PyMongoError:
+        pytest.skip(f"no mongod reachable at {MONGO_URI}")
+    finally:
+        client.close()
+    return MONGO_URI
+
+
+def test_every_query_shape_uses_an_index(mongod, capsys):
+    result = asyncio.run(explain_plans.main(mongod, "explain_plans_test", 200))
+    assert result == 0, capsys.readouterr().out
@@ -0,0 +1,65 @@
+"""Recovery of JSON objects from fenced, sloppy and truncated LLM output."""
+import json
+
+import pytest
+
+pytest.importorskip("pydantic")
+from pydantic import BaseModel
+
+from app.services.json_parser import LLMJSONError, parse_json_object, repair_json, strip_fences
+
+
+class Rating(BaseModel):
+    skill: str
+    score: int
+
+
+def test_plain_object_is_parsed():
+    assert parse_json_object('{"skill": "Python", "score": 8}') == {"skill": "Python", "score": 8}
+
+
+def test_fenced_output_with_prose():
+    text = 'Here is the rating:\n```json\n{"skill": "Python", "score": 8}\n```\nLet me know!'
+    assert strip_fences(text) == '{"skill": "Python", "score": 8}'
+    assert parse_json_object(text) == {"skill": "Python", "score": 8}
+
+
+def test_unclosed_fence():
+    assert parse_json_object('```json\n{"skill": "Go", "score": 5}') == {"skill": "Go", "score": 5}
+
+
+def test_trailing_commas():
+    assert json.loads(repair_json('{"skills": ["a", "b",], "score": 3,}')) == {"skills": ["a", "b"], "score": 3}
+
+
+def test_python_literals_and_comments():
+    repaired = repair_json('{"passed": True, // model note\n "notes": None}')
+    assert json.loads(repaired) == {"passed": True, "notes": None}
+
+
+def test_truncated_output_is_closed():
+    assert json.loads(repair_json('{"strengths": ["clear", "conci')) == {"strengths": ["clear", "conci"]}
+    assert json.loads(repair_json('{"a": {"b": [1, 2,')) == {"a": {"b": [1, 2]}}
+
+
+def test_raw_newline_inside_string():
+    assert json.loads(repair_json('{"feedback": "line one\nline two"}')) == {"feedback": "line one\nline two"}
+
+
+def test_braces_inside_strings_are_not_structure():
+    assert parse_json_object('Result: {"note": "use {} for sets", "score": 1} done') == {"note": "use {} for sets", "score": 1}
+
+
+def test_model_validation_coerces_types():
+    assert parse_json_object('{"skill": "SQL", "score": "7"}', Rating) == {"skill": "SQL", "score": 7}
+
+
+def test_model_mismatch_raises():
+    with pytest.raises(LLMJSONError) as error:
+        parse_json_object('{"skill": "SQL"}', Rating)
+    assert error.value.raw == '{"skill": "SQL"}'
+
+
+def test_no_object_raises():
+    with pytest.raises(LLMJSONError):
+        parse_json_object("I cannot rate this answer.")
@@ -0,0 +1,66 @@
+"""Priority scheduling and the interactive reserve of GroqRateLimiter."""
+import asyncio
+
+from app.services.rate_limiter import GroqRateLimiter, Priority, jittered_backoff, parse_duration
+
+
+def test_queued_calls_are_granted_in_priority_order():
+    async def scenario():
+        limiter = GroqRateLimiter(requests_per_minute=1200, burst=3, interactive_reserve=1)
+        for _ in range(3):
+            await limiter.acquire(Priority.INTERVIEW)
+
+        granted = []
+
+        async def call(priority):
+            await limiter.acquire(priority)
+            granted.append(priority)
+
+        # Queued lowest priority first; the bucket is empty so all of them wait
+        await asyncio.gather(call(Priority.REPORT), call(Priority.RESUME), call(Priority.INTERVIEW))
+        return granted
+
+    assert asyncio.run(scenario()) == [Priority.INTERVIEW, Priority.RESUME, Priority.REPORT]
+
+
+def test_interactive_reserve_is_kept_for_interview_calls():
+    async def scenario():
+        # Practically no refill: only the initial burst is available
+        limiter = GroqRateLimiter(requests_per_minute=0.001, burst=2, interactive_reserve=1)
+        await limiter.acquire(Priority.REPORT)
+
+        report = asyncio.create_task(limiter.acquire(Priority.REPORT))
+        await asyncio.wait_for(limiter.acquire(Priority.INTERVIEW), timeout=1)
+        await asyncio.sleep(0.05)
+        blocked = not report.done()
+        report.cancel()
+        return blocked, limiter.stats()
+
+    blocked, stats = asyncio.run(scenario())
+    assert blocked
+    assert stats["granted"] == {"interview": 1, "resume": 0, "report": 1}
+
+
+def test_pause_holds_every_priority():
+    async def scenario():
+        limiter = GroqRateLimiter(requests_per_minute=6000, burst=5)
+        limiter.pause(0.2)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await limiter.acquire(Priority.INTERVIEW)
+        return loop.time() - started
+
+    assert asyncio.run(scenario()) >= 0.15
+
+
+def test_parse_duration():
+    assert parse_duration("7") == 7.0
+    assert parse_duration("2m59.5s") == 179.5
+    assert parse_duration("120ms") == 0.12
+    assert parse_duration("soon") is None
+    assert parse_duration(None) is None
+
+
+def test_backoff_respects_retry_after():
+    assert jittered_backoff(0, base_delay=0.5, retry_after=3.0) >= 3.0
+    assert all(jittered_backoff(10, base_delay=0.5, max_delay=2.0) <= 2.0 for _ in range(50))
@@ -0,0 +1,73 @@
+"""Versioning of SessionCache: nothing written before an invalidate is served after it."""
+import pytest
+
+pytest.importorskip("bson")
+
+from app.services.session_cache import SessionCache
+
+
+@pytest.fixture
+def cache():
+    return SessionCache(max_entries=8, max_bytes=1024 * 1024, ttl_seconds=60)
+
+
+def test_hit_returns_a_fresh_copy(cache):
+    cache.put("i1", "status", cache.version("i1"), {"status": "active"})
+    first = cache.get("i1", "status")
+    first["status"] = "mutated"
+    assert cache.get("i1", "status") == {"status": "active"}
+
+
+def test_invalidate_drops_every_view(cache):
+    version = cache.version("i1")
+    cache.put("i1", "status", version, {"status": "active"})
+    cache.put("i1", "prompt", version, {"question_count": 3})
+    cache.invalidate("i1")
+    assert cache.get("i1", "status") is None
+    assert cache.get("i1", "prompt") is None
+
+
+def test_read_that_raced_a_write_is_not_stored(cache):
+    version = cache.version("i1")  # captured before reading the database
+    cache.invalidate("i1")         # a write lands while the read is in flight
+    cache.put("i1", "status", version, {"status": "active"})
+    assert cache.get("i1", "status") is None
+
+    cache.put("i1", "status", cache.version("i1"), {"status": "completed"})
+    assert cache.get("i1", "status") == {"status": "completed"}
+
+
+def test_other_interviews_are_unaffected(cache):
+    cache.put("i1", "status", cache.version("i1"), {"status": "active"})
+    cache.invalidate("i2")
+    assert cache.get("i1", "status") == {"status": "active"}
+
+
+def test_trimmed_version_stamps_stay_conservative():
+    cache = SessionCache(max_entries=1, ttl_seconds=60)
+    version = cache.version("i1")
+    for n in range(10):
+        cache.invalidate(f"other-{n}")  # pushes out stamps beyond max_entries * 4
+    cache.invalidate("i1")
+    for n in range(10, 20):
+        cache.invalidate(f"other-{n}")
+    cache.put("i1", "status", version, {"status": "active"})
+    assert cache.get("i1", "status") is None
+
+
+def test_expired_entries_miss(cache, monkeypatch):
+    from app.services import session_cache
+
+    cache.put("i1", "status", cache.version("i1"), {"status": "active"})
+    now = session_cache.time.monotonic() + 61
+    monkeypatch.setattr(session_cache.time, "monotonic", lambda: now)
+    assert cache.get("i1", "status") is None
+
+
+def test_lru_eviction():
+    cache = SessionCache(max_entries=2, ttl_seconds=60)
+    for interview_id in ("a", "b", "c"):
+        cache.put(interview_id, "status", cache.version(interview_id), {"id": interview_id})
+    assert cache.get("a", "status") is None
+    assert cache.get("c", "status") == {"id": "c"}
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,192 @@
+"""Bucketed turn storage against an in-process stand-in for the bucket collection."""
+import asyncio
+import copy
+
+import pytest
+
+pytest.importorskip("pymongo")
+from pymongo.errors import DuplicateKeyError
+
+from app.services.turn_store import BucketedTurnStore
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, field, direction):
+        self.documents.sort(key=lambda document: document[field], reverse=direction < 0)
+        return self
+
+    def __aiter__(self):
+        async def iterate():
+            for document in self.documents:
+                yield document
+        return iterate()
+
+
+class FakeBuckets:
+    """The queries and updates BucketedTurnStore issues, with a unique (interview_id, bucket)."""
+
+    def __init__(self):
+        self.documents = []
+
+    def _matches(self, document, query):
+        for field, condition in query.items():
+            if field == "turns.seq":
+                if any(turn["seq"] == condition["$ne"] for turn in document["turns"]):
+                    return False
+            elif field == "turns.answer":
+                if not any(turn["answer"] == condition for turn in document["turns"]):
+                    return False
+            elif document.get(field) != condition:
+                return False
+        return True
+
+    @staticmethod
+    def _project(document, projection):
+        document = copy.deepcopy(document)
+        limit = projection.get("turns")
+        if isinstance(limit, dict):
+            document["turns"] = document["turns"][limit["$slice"]:]
+        return document
+
+    def find(self, query, projection):
+        return FakeCursor([self._project(d, projection) for d in self.documents if self._matches(d, query)])
+
+    async def find_one(self, query, projection):
+        async for document in self.find(query, projection):
+            return document
+        return None
+
+    async def update_one(self, query, update, upsert=False, array_filters=None):
+        document = next((d for d in self.documents if self._matches(d, query)), None)
+        if document is None:
+            if not upsert:
+                return
+            key = (query["interview_id"], query["bucket"])
+            if any((d["interview_id"], d["bucket"]) == key for d in self.documents):
+                raise DuplicateKeyError("duplicate bucket")
+            document = {"interview_id": key[0], "bucket": key[1], "turns": [], "count": 0}
+            self.documents.append(document)
+        if "$push" in update:
+            document["turns"] = sorted(document["turns"] + update["$push"]["turns"]["$each"], key=lambda turn: turn["seq"])
+        for field, amount in update.get("$inc", {}).items():
+            document[field] += amount
+        for field, value in update.get("$set", {}).items():
+            if field == "turns.$[turn].answer":
+                for turn in document["turns"]:
+                    if turn["answer"] == array_filters[0]["turn.answer"]:
+                        turn["answer"] = value
+            else:
+                document[field] = value
+
+    async def update_many(self, query, update, array_filters=None):
+        matched = [d for d in self.documents if self._matches(d, query)]
+        for document in matched:
+            await self.update_one({"interview_id": document["interview_id"], "bucket": document["bucket"]}, update, array_filters=array_filters)
+        return type("UpdateResult", (), {"matched_count": len(matched)})()
+
+    async def insert_many(self, documents):
+        self.documents.extend(copy.deepcopy(documents))
+
+    async def delete_many(self, query):
+        self.documents = [d for d in self.documents if not self._matches(d, query)]
+
+
+def turn(seq):
+    return {"question": f"Question {seq}", "answer": f"Answer {seq}"}
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+@pytest.fixture
+def store():
+    return BucketedTurnStore(FakeBuckets(), bucket_size=4)
+
+
+def test_last_turns_span_bucket_boundaries(store):
+    async def scenario():
+        for seq in range(10):
+            await store.append("i1", seq, turn(seq))
+        return await store.last("i1", 6)
+
+    window, stored = run(scenario())
+    assert [t["question"] for t in window] == [f"Question {seq}" for seq in range(4, 10)]
+    assert stored == 10
+    assert len(store.collection.documents) == 3
+
+
+def test_last_turns_returns_everything_when_history_is_short(store):
+    async def scenario():
+        for seq in range(3):
+            await store.append("i1", seq, turn(seq))
+        return await store.last("i1", 12)
+
+    window, stored = run(scenario())
+    assert [t["question"] for t in window] == ["Question 0", "Question 1", "Question 2"]
+    assert stored == 3
+
+
+def test_append_of_a_stored_turn_is_a_no_op(store):
+    async def scenario():
+        for seq in range(5):
+            await store.append("i1", seq, turn(seq))
+        await store.append("i1", 4, turn(4))
+        await store.append("i1", 1, turn(1))
+        return await store.last("i1", 10), await store.all("i1")
+
+    (window, stored), every = run(scenario())
+    assert stored == 5
+    assert [t["question"] for t in every] == [f"Question {seq}" for seq in range(5)]
+
+
+def test_out_of_order_appends_are_read_in_order(store):
+    async def scenario():
+        for seq in (1, 0, 5, 3, 2, 4):
+            await store.append("i1", seq, turn(seq))
+        return await store.all("i1")
+
+    assert [t["question"] for t in run(scenario())] == [f"Question {seq}" for seq in range(6)]
+
+
+def test_counted_turn_that_was_never_stored_is_skipped(store):
+    async def scenario():
+        for seq in (0, 1, 2, 3, 5):  # seq 4 was counted but its bucket write failed
+            await store.append("i1", seq, turn(seq))
+        return await store.last("i1", 3)
+
+    window, stored = run(scenario())
+    assert [t["question"] for t in window] == ["Question 2", "Question 3", "Question 5"]
+    assert stored == 5
+
+
+def test_fill_unanswered_fills_every_empty_answer(store):
+    async def scenario():
+        for seq in range(6):
+            await store.append("i1", seq, {"question": f"Question {seq}", "answer": "" if seq in (1, 4, 5) else "given"})
+        assert await store.fill_unanswered("i1", "filled")
+        assert await store.fill_unanswered("i1", "again")  # nothing left to fill
+        return await store.all("i1")
+
+    answers = [t["answer"] for t in run(scenario())]
+    assert answers == ["given", "filled", "given", "given", "filled", "filled"]
+
+
+def test_fill_unanswered_without_turns(store):
+    assert run(store.fill_unanswered("missing", "answer")) is False
+
+
+def test_replace_and_delete(store):
+    async def scenario():
+        await store.replace("i1", [turn(seq) for seq in range(6)])
+        window, stored = await store.last("i1", 2)
+        await store.delete("i1")
+        return window, stored, await store.all("i1")
+
+    window, stored, remaining = run(scenario())
+    assert [t["question"] for t in window] == ["Question 4", "Question 5"]
+    assert stored == 6
+    assert remaining == []